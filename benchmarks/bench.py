@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+"""
+Performance Benchmarks
+Startup, command and hot-path latency checked against budgets
+
+Runs offline: commands talk to a fake i2pd (i2p_manager.fake_i2pd), and HOME
+points at a temporary directory so config and profiles are throwaway.
+
+Usage:
+    python benchmarks/bench.py              # run and check budgets
+    python benchmarks/bench.py --update     # record a new baseline
+    python benchmarks/bench.py --only status --json results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+sys.path.insert(0, str(REPO_ROOT))
+
+from i2p_manager.fake_i2pd import (
+    FakeI2pd,
+    RouterModel,
+    render_status_page,
+)  # noqa: E402
+
+# New budgets leave this much headroom over the measured baseline, and at
+# least the floor, so sub-millisecond timings don't fail on jitter
+BUDGET_FACTOR = {"wall_ms": 2.0, "import_ms": 2.0, "rss_mb": 1.5, "alloc_kb": 1.5}
+BUDGET_FLOOR = {"wall_ms": 0.5}
+
+# CLI invocations: name -> arguments
+COMMANDS = {
+    "cli_version": ["--version"],
+    "cli_help": ["--help"],
+    "cli_status_json": ["status", "--json"],
+    "cli_status": ["status"],
+}
+
+
+@contextmanager
+def isolated_home(console_port: int):
+    """Point HOME at a temporary directory with a config for the fake console"""
+    home = Path(tempfile.mkdtemp(prefix="i2p-manager-bench-"))
+    saved = {key: os.environ.get(key) for key in ("HOME", "USERPROFILE")}
+    os.environ["HOME"] = os.environ["USERPROFILE"] = str(home)
+
+    try:
+        from i2p_manager.config import ConfigManager
+
+        config = ConfigManager()
+        config.init()
+        config.set("i2pd.console_port", console_port)
+        yield home
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(home, ignore_errors=True)
+
+
+def run_child(cmd, env):
+    """Run a command, returns (wall seconds, peak RSS in MB or None)"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = (
+            os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+        )
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        rss = usage.ru_maxrss / scale
+    else:
+        proc.wait()
+        rss = None
+
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} exited with {proc.returncode}")
+    return wall, rss
+
+
+def import_breakdown(args, env, top: int = 8):
+    """Total import time and the slowest top-level imports, in ms"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "i2p_manager", *args],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    total = 0
+    roots = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        total += int(self_us)
+        if len(indent) == 1:
+            roots[name] = roots.get(name, 0) + int(cumulative_us)
+
+    slowest = sorted(roots.items(), key=lambda item: item[1], reverse=True)[:top]
+    return total / 1000, {name: round(us / 1000, 1) for name, us in slowest}
+
+
+def bench_command(args, env, repeats: int):
+    """Wall time, peak RSS and import time of a CLI invocation"""
+    cmd = [sys.executable, "-m", "i2p_manager", *args]
+    run_child(cmd, env)  # warm the page cache and __pycache__
+
+    walls, peaks = [], []
+    for _ in range(repeats):
+        wall, rss = run_child(cmd, env)
+        walls.append(wall * 1000)
+        peaks.append(rss)
+
+    import_ms, imports = import_breakdown(args, env)
+    result = {
+        "wall_ms": round(statistics.median(walls), 1),
+        "min_ms": round(min(walls), 1),
+        "import_ms": round(import_ms, 1),
+        "imports": imports,
+    }
+    if None not in peaks:
+        result["rss_mb"] = round(max(peaks), 1)
+    return result
+
+
+def bench_function(func, setup=None, repeats: int = 50):
+    """Median wall time and peak Python allocations of a function call"""
+    times = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "wall_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "alloc_kb": round(peak / 1024, 1),
+    }
+
+
+class StubSession:
+    """Returns the status page without a network round trip"""
+
+    class Response:
+        status_code = 200
+        text = render_status_page(RouterModel(seed=0).metrics())
+
+    def get(self, url, timeout=None):
+        return self.Response()
+
+
+def function_benchmarks(console_port: int):
+    """Hot functions: name -> (func, setup, repeats)"""
+    from i2p_manager.config import ConfigManager
+    from i2p_manager.firefox import FirefoxManager
+    from i2p_manager.i2pd import I2PdManager
+
+    config = ConfigManager()
+    i2pd = I2PdManager(config)
+    parser = I2PdManager(config)
+    parser._local.session = StubSession()
+    firefox = FirefoxManager(config)
+
+    def fresh_profile():
+        firefox.delete_profile("bench")
+
+    def cold_profile():
+        firefox.delete_profile("bench")
+        shutil.rmtree(firefox.get_template_dir(), ignore_errors=True)
+
+    return {
+        "config_load": (lambda: ConfigManager().load(), None, 200),
+        "get_status": (lambda: i2pd.get_status(console_port), None, 100),
+        "get_status_parse": (lambda: parser.get_status(console_port), None, 200),
+        "create_profile": (lambda: firefox.create_profile("bench"), fresh_profile, 20),
+        "create_profile_cold": (
+            lambda: firefox.create_profile("bench"),
+            cold_profile,
+            10,
+        ),
+    }
+
+
+def run_benchmarks(only=None, repeats: int = 5):
+    """Run all benchmarks, returns name -> metrics"""
+    results = {}
+
+    with FakeI2pd(seed=0) as router, isolated_home(router.console_port):
+        port = router.console_port
+        env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+
+        for name, args in COMMANDS.items():
+            if only and not any(word in name for word in only):
+                continue
+            results[name] = bench_command(args, env, repeats)
+            print_result(name, results[name])
+
+        for name, (func, setup, count) in function_benchmarks(port).items():
+            if only and not any(word in name for word in only):
+                continue
+            results[name] = bench_function(func, setup, count)
+            print_result(name, results[name])
+
+    return results
+
+
+def print_result(name, metrics):
+    """Print one benchmark's metrics"""
+    values = "  ".join(
+        f"{key}={value}" for key, value in metrics.items() if key != "imports"
+    )
+    print(f"{name:<22} {values}")
+    if metrics.get("imports"):
+        slowest = ", ".join(f"{mod} {ms}" for mod, ms in metrics["imports"].items())
+        print(f"{'':<22} imports (ms): {slowest}")
+
+
+def check_budgets(results, baseline) -> list:
+    """Get a description of every exceeded budget"""
+    failures = []
+    for name, metrics in results.items():
+        budgets = baseline.get("benchmarks", {}).get(name, {}).get("budget", {})
+        for key, limit in budgets.items():
+            value = metrics.get(key)
+            if value is not None and value > limit:
+                failures.append(f"{name}: {key} {value} > budget {limit}")
+    return failures
+
+
+def update_baseline(results, baseline) -> dict:
+    """Record results as the new baseline, keeping existing budgets"""
+    entries = baseline.setdefault("benchmarks", {})
+    for name, metrics in results.items():
+        entry = entries.setdefault(name, {})
+        budget = entry.setdefault("budget", {})
+        for key, factor in BUDGET_FACTOR.items():
+            if key in metrics and key not in budget:
+                value = metrics[key]
+                limit = max(value * factor, value + BUDGET_FLOOR.get(key, 0))
+                budget[key] = round(limit, 3)
+        entry["baseline"] = {k: v for k, v in metrics.items() if k != "imports"}
+
+    baseline["recorded_on"] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%d"),
+    }
+    return baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--update", action="store_true", help="Record a new baseline")
+    parser.add_argument("--only", nargs="+", help="Only run benchmarks matching")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per command")
+    parser.add_argument("--json", type=Path, help="Write raw results to a file")
+    args = parser.parse_args()
+
+    baseline = {}
+    if BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text())
+
+    results = run_benchmarks(only=args.only, repeats=args.repeats)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    if args.update:
+        BASELINE_PATH.write_text(
+            json.dumps(update_baseline(results, baseline), indent=2) + "\n"
+        )
+        print(f"\nBaseline written to {BASELINE_PATH}")
+        return 0
+
+    failures = check_budgets(results, baseline)
+    if failures:
+        print("\nBudget exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+
+    print("\nAll benchmarks within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,9 +7,11 @@ __version__ = "0.1.0"
 __author__ = "tundra-node"
 __license__ = "GPL-3.0-or-later"
 
-from .config import ConfigManager
-from .firefox import FirefoxManager
-from .i2pd import I2PdManager
+_LAZY_EXPORTS = {
+    "ConfigManager": ".config",
+    "FirefoxManager": ".firefox",
+    "I2PdManager": ".i2pd",
+}
 
 __all__ = [
     "ConfigManager",
@@ -17,3 +19,14 @@ __all__ = [
     "I2PdManager",
     "__version__",
 ]
+
+
+def __getattr__(name):
+    """Import managers on first access, keeping `import i2p_manager` cheap"""
+    if name in _LAZY_EXPORTS:
+        from importlib import import_module
+
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,367 @@
+"""
+Proxy Balancer
+Local HTTP and SOCKS5 proxy spreading connections across several routers
+
+One listening port accepts both protocols (SOCKS5 clients are told apart
+by their first byte). Each new connection goes to the healthy backend
+router with the fewest open connections, except that a .i2p destination
+keeps using the router it used before, whose tunnels to it are warm.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Longest request head accepted from HTTP clients
+MAX_HEAD = 64 * 1024
+
+# Destinations remembered for sticky routing
+STICKY_SIZE = 4096
+
+PIPE_CHUNK = 64 * 1024
+
+
+class Backend:
+    """A router's HTTP and SOCKS proxy, and its load"""
+
+    def __init__(
+        self,
+        name: str,
+        host: str,
+        http_port: int,
+        socks_port: int,
+        i2pd=None,
+        console_port: Optional[int] = None,
+    ):
+        self.name = name
+        self.host = host
+        self.http_port = http_port
+        self.socks_port = socks_port
+        self.i2pd = i2pd
+        self.console_port = console_port
+
+        self.healthy = True  # console answers, or no health checks yet
+        self.ready = True  # has client tunnels, so can reach destinations
+        self.outstanding = 0
+        self.total = 0
+        self.failures = 0
+
+    def stats(self) -> Dict:
+        """Load and health summary"""
+        return {
+            "healthy": self.healthy,
+            "ready": self.ready,
+            "outstanding": self.outstanding,
+            "total": self.total,
+            "failures": self.failures,
+        }
+
+
+class Balancer:
+    """Chooses a backend for each new connection
+
+    Least outstanding connections wins, ties going to the backend that
+    served fewer in total. Backends without client tunnels are only used
+    when no backend has any.
+    """
+
+    def __init__(self, backends: List[Backend], sticky_size: int = STICKY_SIZE):
+        self.backends = backends
+        self.sticky_size = sticky_size
+        self._sticky: "OrderedDict[str, Backend]" = OrderedDict()
+
+    def pick(self, destination: Optional[str] = None, exclude=()) -> Optional[Backend]:
+        """Choose a backend for a connection to destination"""
+        candidates = [b for b in self.backends if b.healthy and b not in exclude]
+        if not candidates:
+            return None
+
+        key = (destination or "").lower()
+        if not key.endswith(".i2p"):
+            key = None
+
+        if key:
+            backend = self._sticky.get(key)
+            if backend in candidates:
+                self._sticky.move_to_end(key)
+                return backend
+
+        pool = [b for b in candidates if b.ready] or candidates
+        backend = min(pool, key=lambda b: (b.outstanding, b.total))
+
+        if key:
+            self._sticky[key] = backend
+            self._sticky.move_to_end(key)
+            if len(self._sticky) > self.sticky_size:
+                self._sticky.popitem(last=False)
+        return backend
+
+    def mark_failed(self, backend: Backend):
+        """Take a backend out of rotation until its next health check"""
+        backend.failures += 1
+        backend.healthy = False
+
+    async def check_health(self):
+        """Refresh every backend's health from its router console"""
+        loop = asyncio.get_running_loop()
+
+        async def check(backend):
+            if backend.i2pd is None:
+                return
+            try:
+                status = await loop.run_in_executor(
+                    None, backend.i2pd.get_status, backend.console_port
+                )
+            except Exception:
+                status = {}
+            backend.healthy = bool(status.get("running"))
+            backend.ready = status.get("tunnels", 0) > 0
+
+        await asyncio.gather(*(check(b) for b in self.backends))
+
+
+class ProxyFront:
+    """Listens for HTTP and SOCKS5 clients and relays them to backends"""
+
+    def __init__(
+        self,
+        balancer: Balancer,
+        host: str = "127.0.0.1",
+        port: int = 4440,
+        health_interval: float = 10,
+        connect_timeout: float = 10,
+    ):
+        self.balancer = balancer
+        self.host = host
+        self.port = port
+        self.health_interval = health_interval
+        self.connect_timeout = connect_timeout
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._health_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start listening and health checking"""
+        await self.balancer.check_health()
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, limit=MAX_HEAD
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._health_task = asyncio.ensure_future(self._health_loop())
+
+    async def stop(self):
+        """Stop listening (open connections are dropped)"""
+        if self._health_task is not None:
+            self._health_task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _health_loop(self):
+        """Re-check backend health periodically"""
+        while True:
+            await asyncio.sleep(self.health_interval)
+            await self.balancer.check_health()
+
+    # --- Connections ---
+
+    async def _handle(self, reader, writer):
+        """Serve one client connection"""
+        try:
+            first = await reader.readexactly(1)
+            if first == b"\x05":
+                await self._handle_socks(reader, writer)
+            else:
+                await self._handle_http(first, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+    async def _connect(self, destination: str, port_attr: str):
+        """Open a connection to a backend, trying another one if it fails
+
+        Returns (backend, reader, writer), or None if no backend is left.
+        """
+        tried = []
+        while True:
+            backend = self.balancer.pick(destination, exclude=tried)
+            if backend is None:
+                return None
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(backend.host, getattr(backend, port_attr)),
+                    self.connect_timeout,
+                )
+                return backend, reader, writer
+            except (OSError, asyncio.TimeoutError):
+                self.balancer.mark_failed(backend)
+                tried.append(backend)
+
+    async def _relay(self, backend: Backend, client, upstream):
+        """Copy data both ways until either side closes"""
+        backend.outstanding += 1
+        backend.total += 1
+        try:
+            await asyncio.gather(
+                pipe(client[0], upstream[1]),
+                pipe(upstream[0], client[1]),
+            )
+        finally:
+            backend.outstanding -= 1
+            upstream[1].close()
+
+    async def _handle_http(self, first: bytes, reader, writer):
+        """Relay an HTTP proxy request (CONNECT or absolute URI)"""
+        try:
+            head = first + await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            writer.write(http_error(431, "Request Header Fields Too Large"))
+            return
+
+        destination = _http_destination(head)
+        if destination is None:
+            writer.write(http_error(400, "Bad Request"))
+            return
+
+        connection = await self._connect(destination, "http_port")
+        if connection is None:
+            writer.write(http_error(503, "No I2P router available"))
+            return
+
+        backend, up_reader, up_writer = connection
+        up_writer.write(head)
+        await self._relay(backend, (reader, writer), (up_reader, up_writer))
+
+    async def _handle_socks(self, reader, writer):
+        """Relay a SOCKS5 CONNECT, replaying the handshake to the backend"""
+        count = (await reader.readexactly(1))[0]
+        await reader.readexactly(count)
+        writer.write(b"\x05\x00")  # no authentication
+
+        request, destination = await _read_socks_request(reader)
+        if request[1] != 1:
+            writer.write(_socks_reply(7))  # command not supported
+            return
+
+        connection = await self._connect(destination, "socks_port")
+        if connection is None:
+            writer.write(_socks_reply(1))  # general failure
+            return
+
+        backend, up_reader, up_writer = connection
+        try:
+            up_writer.write(b"\x05\x01\x00")
+            if await up_reader.readexactly(2) != b"\x05\x00":
+                writer.write(_socks_reply(1))
+                up_writer.close()
+                return
+            up_writer.write(request)
+            reply, _ = await _read_socks_request(up_reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.balancer.mark_failed(backend)
+            writer.write(_socks_reply(1))
+            up_writer.close()
+            return
+
+        writer.write(reply)
+        if reply[1] != 0:
+            up_writer.close()
+            return
+        await self._relay(backend, (reader, writer), (up_reader, up_writer))
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-backend load and health"""
+        return {b.name: b.stats() for b in self.balancer.backends}
+
+
+# === Protocol helpers ===
+
+
+async def pipe(reader, writer):
+    """Copy from reader to writer until EOF"""
+    try:
+        while True:
+            data = await reader.read(PIPE_CHUNK)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+        if writer.can_write_eof():
+            writer.write_eof()
+    except (ConnectionError, OSError):
+        writer.close()
+
+
+def _http_destination(head: bytes) -> Optional[str]:
+    """Get the host an HTTP proxy request is for"""
+    try:
+        request_line, *headers = head.decode("latin-1").split("\r\n")
+        method, target, _ = request_line.split(" ", 2)
+    except ValueError:
+        return None
+
+    if method.upper() == "CONNECT":
+        return target.rsplit(":", 1)[0].strip("[]")
+
+    host = urlsplit(target).hostname
+    if host:
+        return host
+    for header in headers:
+        name, _, value = header.partition(":")
+        if name.strip().lower() == "host":
+            return value.strip().rsplit(":", 1)[0]
+    return None
+
+
+def http_error(code: int, reason: str) -> bytes:
+    """A complete HTTP error response"""
+    body = f"{code} {reason}\n".encode()
+    return (
+        f"HTTP/1.1 {code} {reason}\r\nContent-Type: text/plain\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+    ).encode() + body
+
+
+async def _read_socks_request(reader) -> Tuple[bytes, str]:
+    """Read a SOCKS5 request or reply, returns its bytes and address"""
+    header = await reader.readexactly(4)
+    address_type = header[3]
+    if address_type == 3:
+        length = await reader.readexactly(1)
+        name = await reader.readexactly(length[0])
+        address, raw = name.decode("latin-1"), length + name
+    elif address_type == 4:
+        raw = await reader.readexactly(16)
+        address = raw.hex()
+    else:
+        raw = await reader.readexactly(4)
+        address = ".".join(str(b) for b in raw)
+    port = await reader.readexactly(2)
+    return header + raw + port, address
+
+
+def _socks_reply(code: int) -> bytes:
+    """A SOCKS5 reply with an empty bound address"""
+    return b"\x05" + bytes([code]) + b"\x00\x01" + bytes(6)
+
+
+def fleet_backends(config) -> List[Backend]:
+    """Backends for every configured router"""
+    from .fleet import instance_managers
+
+    backends = []
+    for name, managers in instance_managers(config).items():
+        cfg = managers["config"].load()["i2pd"]
+        backends.append(
+            Backend(
+                name,
+                cfg["host"],
+                cfg["http_port"],
+                cfg["socks_port"],
+                i2pd=managers["i2pd"],
+                console_port=cfg["console_port"],
+            )
+        )
+    return backends
@@ -0,0 +1,265 @@
+"""
+Proxy Benchmark
+Drives concurrent load through the router's HTTP and SOCKS5 proxies
+
+Three modes:
+    http     GET http://TARGET/ through the HTTP proxy, one request per
+             connection
+    connect  HTTP CONNECT tunnels to TARGET, echoing messages through them
+    socks    SOCKS5 tunnels to TARGET, echoing messages through them
+
+Setting up a connection (TCP to the proxy, plus the CONNECT or SOCKS
+handshake for tunnels) is timed separately from the requests on it, so
+tunnel build cost and per-message latency can be compared on their own.
+The tunnel modes need an echo service at TARGET.
+"""
+
+import asyncio
+import os
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from .probe import percentile
+
+MODES = ("http", "connect", "socks")
+
+# Latency histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+# Pause after a failed connection, so a dead proxy isn't hammered
+ERROR_PAUSE = 0.05
+
+
+class BenchResult:
+    """Counters and latency samples for one benchmark run"""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.requests = 0
+        self.connections = 0
+        self.bytes = 0
+        self.elapsed = 0.0
+        self.connect_times: List[float] = []
+        self.latencies: List[float] = []
+        self.errors: Counter = Counter()
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict:
+        """Summary for JSON output"""
+
+        def spread(values):
+            return {f"p{q}": percentile(values, q) for q in (50, 90, 99)}
+
+        return {
+            "mode": self.mode,
+            "requests": self.requests,
+            "connections": self.connections,
+            "errors": dict(self.errors),
+            "bytes": self.bytes,
+            "elapsed": round(self.elapsed, 3),
+            "requests_per_second": round(self.requests_per_second, 1),
+            "bytes_per_second": round(self.bytes_per_second, 1),
+            "connect": spread(self.connect_times),
+            "latency": spread(self.latencies),
+            "histogram": histogram(self.latencies),
+        }
+
+
+def histogram(values: List[float], bounds_ms=BUCKETS_MS) -> Dict[str, int]:
+    """Count latencies (seconds) into buckets labelled by upper bound"""
+    counts = {f"<={bound}ms": 0 for bound in bounds_ms}
+    counts[f">{bounds_ms[-1]}ms"] = 0
+    labels = list(counts)
+    for value in values:
+        ms = value * 1000
+        index = next((i for i, b in enumerate(bounds_ms) if ms <= b), len(bounds_ms))
+        counts[labels[index]] += 1
+    return counts
+
+
+def split_target(target: str, default_port: int = 80) -> Tuple[str, int]:
+    """Split HOST[:PORT]"""
+    host, _, port = target.rpartition(":")
+    if host and port.isdigit():
+        return host, int(port)
+    return target, default_port
+
+
+def _reason(error: BaseException) -> str:
+    """Short error label for counting"""
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(error, asyncio.IncompleteReadError):
+        return "closed early"
+    if isinstance(error, ConnectionRefusedError):
+        return "proxy refused connection"
+    return str(error) or type(error).__name__
+
+
+# === Connections ===
+
+
+async def _http_get(proxy, target, timeout, result):
+    """One GET through the HTTP proxy, timing connect and response"""
+    started = time.perf_counter()
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(*proxy), timeout)
+    connected = time.perf_counter()
+    result.connect_times.append(connected - started)
+    result.connections += 1
+    try:
+        writer.write(
+            f"GET http://{target}/ HTTP/1.1\r\nHost: {target}\r\n"
+            "Connection: close\r\n\r\n".encode()
+        )
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+        status = int(head.split(b" ", 2)[1])
+        size = 0
+        while True:
+            chunk = await asyncio.wait_for(reader.read(65536), timeout)
+            if not chunk:
+                break
+            size += len(chunk)
+    finally:
+        writer.close()
+
+    if status >= 400:
+        raise ConnectionError(f"HTTP {status}")
+    result.latencies.append(time.perf_counter() - connected)
+    result.requests += 1
+    result.bytes += size
+
+
+async def _open_tunnel(mode, proxy, target, timeout):
+    """Open a CONNECT or SOCKS5 tunnel to target"""
+    host, port = split_target(target)
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(*proxy), timeout)
+    try:
+        if mode == "connect":
+            writer.write(
+                f"CONNECT {host}:{port} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode()
+            )
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+            status = int(head.split(b" ", 2)[1])
+            if status != 200:
+                raise ConnectionError(f"HTTP {status}")
+        else:
+            writer.write(b"\x05\x01\x00")
+            if await asyncio.wait_for(reader.readexactly(2), timeout) != b"\x05\x00":
+                raise ConnectionError("SOCKS handshake refused")
+            name = host.encode()
+            writer.write(
+                b"\x05\x01\x00\x03"
+                + bytes([len(name)])
+                + name
+                + port.to_bytes(2, "big")
+            )
+            reply = await asyncio.wait_for(reader.readexactly(4), timeout)
+            if reply[1] != 0:
+                raise ConnectionError(f"SOCKS error {reply[1]}")
+            # Skip the bound address
+            skip = {1: 4, 4: 16}.get(reply[3])
+            if skip is None:
+                skip = (await reader.readexactly(1))[0]
+            await reader.readexactly(skip + 2)
+    except BaseException:
+        writer.close()
+        raise
+    return reader, writer
+
+
+async def _tunnel_session(mode, proxy, target, timeout, size, messages, result):
+    """Open a tunnel and echo messages through it"""
+    started = time.perf_counter()
+    reader, writer = await _open_tunnel(mode, proxy, target, timeout)
+    result.connect_times.append(time.perf_counter() - started)
+    result.connections += 1
+
+    payload = os.urandom(size)
+    try:
+        for _ in range(messages):
+            sent = time.perf_counter()
+            writer.write(payload)
+            echoed = await asyncio.wait_for(reader.readexactly(size), timeout)
+            if echoed != payload:
+                raise ConnectionError("echo mismatch")
+            result.latencies.append(time.perf_counter() - sent)
+            result.requests += 1
+            result.bytes += size
+    finally:
+        writer.close()
+
+
+# === Runner ===
+
+
+async def run_bench(
+    mode: str,
+    proxy: Tuple[str, int],
+    target: str,
+    concurrency: int = 8,
+    duration: Optional[float] = 10,
+    requests: Optional[int] = None,
+    size: int = 1024,
+    messages: int = 10,
+    timeout: float = 30,
+) -> BenchResult:
+    """Drive load until the duration passes or enough requests are made
+
+    For tunnel modes each connection carries `messages` echo round trips
+    of `size` bytes; for http each connection is one GET.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode: {mode} (expected one of {', '.join(MODES)})")
+
+    result = BenchResult(mode)
+    started = time.perf_counter()
+    stop_at = started + duration if duration else None
+    issued = 0
+
+    def more():
+        if stop_at is not None and time.perf_counter() >= stop_at:
+            return False
+        return requests is None or issued < requests
+
+    async def worker():
+        nonlocal issued
+        while more():
+            if mode == "http":
+                issued += 1
+                session = _http_get(proxy, target, timeout, result)
+            else:
+                count = messages
+                if requests is not None:
+                    count = min(messages, requests - issued)
+                issued += count
+                session = _tunnel_session(
+                    mode, proxy, target, timeout, size, count, result
+                )
+            try:
+                await session
+            except (
+                OSError,
+                ValueError,
+                IndexError,
+                asyncio.TimeoutError,
+                asyncio.IncompleteReadError,
+            ) as e:
+                result.errors[_reason(e)] += 1
+                await asyncio.sleep(ERROR_PAUSE)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def bench(mode: str, proxy: Tuple[str, int], target: str, **options) -> BenchResult:
+    """Run one benchmark (blocking)"""
+    return asyncio.run(run_bench(mode, proxy, target, **options))
@@ -5,48 +5,123 @@ Command-line interface for I2P Easy Manager
 
 import sys
 import click
-from rich.console import Console
 
 from . import __version__
-from .config import ConfigManager
-from .firefox import FirefoxManager
-from .i2pd import I2PdManager
-from .dashboard import launch_dashboard
-from .commands import (
-    cmd_init,
-    cmd_start,
-    cmd_stop,
-    cmd_status,
-    cmd_restart,
-    cmd_browser,
-    cmd_config,
-    cmd_logs,
-    cmd_reset,
-)
+from .utils import get_console
+
+# Commands, managers and rich are imported when a command runs, so short
+# invocations like --version or --help only load click.
+
+
+class Managers(dict):
+    """Manager instances, each created (and its module imported) on first use"""
+
+    def __missing__(self, name):
+        if name == "config":
+            from .config import ConfigManager
+
+            manager = ConfigManager()
+        elif name == "firefox":
+            from .firefox import FirefoxManager
+
+            manager = FirefoxManager(self["config"])
+        elif name == "i2pd":
+            from .i2pd import I2PdManager
+
+            manager = I2PdManager(self["config"])
+        elif name == "daemon":
+            from .daemon import connect, socket_path
+
+            # None when no daemon is running: commands then work in-process
+            manager = connect(socket_path(self["config"]))
+        else:
+            raise KeyError(name)
 
-console = Console()
+        self[name] = manager
+        return manager
 
 
 def get_managers():
     """Create and return manager instances"""
-    config = ConfigManager()
-    return {
-        "config": config,
-        "firefox": FirefoxManager(config),
-        "i2pd": I2PdManager(config),
-    }
+    return Managers()
+
+
+def start_profiling(ctx, stats_path=None):
+    """Trace this invocation and report timings when it finishes"""
+    import time
+    from . import tracing
+
+    tracing.enable()
+    started = time.perf_counter()
+
+    profiler = None
+    if stats_path:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def report():
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(stats_path)
+
+        total_ms = (time.perf_counter() - started) * 1000
+        spans = tracing.roots()
+        command = ctx.invoked_subcommand or "dashboard"
+
+        from rich.console import Console
+        from .config import ConfigManager
+
+        # stderr, so --json output stays machine-readable
+        err = Console(stderr=True, highlight=False)
+        err.print(f"\n[blue]Timings for {command}[/blue] ({total_ms:.1f} ms)")
+        if tracing.dropped():
+            err.print(f"[dim]({tracing.dropped()} earlier spans not kept)[/dim]")
+        for line in tracing.format_tree(spans):
+            err.print(line, markup=False)
+        if profiler is not None:
+            err.print(f"[dim]cProfile stats written to {stats_path}[/dim]")
+
+        timings_path = ConfigManager().get_config_dir() / "timings.jsonl"
+        tracing.append_timings(timings_path, command, total_ms, spans)
+
+    ctx.call_on_close(report)
+
+
+def fail(error: Exception):
+    """Print an error and exit"""
+    get_console().print(f"[red]✗ Error:[/red] {error}")
+    sys.exit(1)
 
 
 @click.group(invoke_without_command=True)
 @click.version_option(version=__version__, prog_name="i2p-manager")
+@click.option(
+    "--trace",
+    is_flag=True,
+    help="Print a timing tree and log timings to timings.jsonl",
+)
+@click.option(
+    "--trace-stats",
+    "profile_stats",
+    type=click.Path(dir_okay=False),
+    help="Also write cProfile stats to this file (implies --trace)",
+)
 @click.pass_context
-def main(ctx):
+def main(ctx, trace, profile_stats):
     """
     I2P Easy Manager - Simplified I2P network access
 
     Run without arguments to launch the interactive dashboard.
     """
+    if trace or profile_stats:
+        start_profiling(ctx, profile_stats)
+
     if ctx.invoked_subcommand is None:
+        from .dashboard import launch_dashboard
+
+        console = get_console()
         try:
             managers = get_managers()
             launch_dashboard(managers)
@@ -62,80 +137,126 @@ def main(ctx):
 @click.option("--force", "-f", is_flag=True, help="Force reinitialize")
 def initialize(force):
     """Initialize I2P Firefox profile and configuration"""
+    from .commands import cmd_init
+
     try:
         managers = get_managers()
         cmd_init.run(managers, force=force)
     except Exception as e:
-        console.print(f"[red]✗ Error:[/red] {e}")
-        sys.exit(1)
+        fail(e)
 
 
 @main.command("start")
 @click.option("--no-browser", is_flag=True, help="Don't launch Firefox")
-def start(no_browser):
+@click.option(
+    "--all", "all_instances", is_flag=True, help="Start every configured router"
+)
+def start(no_browser, all_instances):
     """Start I2Pd and launch Firefox"""
+    from .commands import cmd_start
+
     try:
         managers = get_managers()
-        cmd_start.run(managers, browser=not no_browser)
+        if all_instances:
+            cmd_start.run_all(managers)
+        else:
+            cmd_start.run(managers, browser=not no_browser)
     except Exception as e:
-        console.print(f"[red]✗ Error:[/red] {e}")
-        sys.exit(1)
+        fail(e)
 
 
 @main.command("stop")
-def stop():
+@click.option(
+    "--all", "all_instances", is_flag=True, help="Stop every configured router"
+)
+def stop(all_instances):
     """Stop I2Pd daemon"""
+    from .commands import cmd_stop
+
     try:
         managers = get_managers()
-        cmd_stop.run(managers)
+        if all_instances:
+            cmd_stop.run_all(managers)
+        else:
+            cmd_stop.run(managers)
     except Exception as e:
-        console.print(f"[red]✗ Error:[/red] {e}")
-        sys.exit(1)
+        fail(e)
 
 
 @main.command("status")
 @click.option("--verbose", "-v", is_flag=True, help="Show detailed info")
-def status(verbose):
+@click.option("--watch", "-w", is_flag=True, help="Keep printing status until Ctrl+C")
+@click.option(
+    "--interval",
+    "-n",
+    type=click.FloatRange(min=0.1),
+    help="Seconds between snapshots in watch mode (default: adaptive)",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print JSON, one object per line")
+@click.option(
+    "--on-change", is_flag=True, help="In watch mode, print only when status changes"
+)
+@click.option(
+    "--all", "all_instances", is_flag=True, help="Show every configured router"
+)
+def status(verbose, watch, interval, as_json, on_change, all_instances):
     """Check I2P connection status"""
+    from .commands import cmd_status
+
+    if all_instances and watch:
+        raise click.UsageError("--all can't be combined with --watch")
+
     try:
         managers = get_managers()
-        cmd_status.run(managers, verbose=verbose)
+        if all_instances:
+            cmd_status.run_all(managers, as_json=as_json)
+            return
+        cmd_status.run(
+            managers,
+            verbose=verbose,
+            watch=watch,
+            interval=interval,
+            as_json=as_json,
+            on_change=on_change,
+        )
     except Exception as e:
-        console.print(f"[red]✗ Error:[/red] {e}")
-        sys.exit(1)
+        fail(e)
 
 
 @main.command("restart")
 def restart():
     """Restart I2Pd daemon"""
+    from .commands import cmd_restart
+
     try:
         managers = get_managers()
         cmd_restart.run(managers)
     except Exception as e:
-        console.print(f"[red]✗ Error:[/red] {e}")
-        sys.exit(1)
+        fail(e)
 
 
 @main.command("browser")
 def browser():
     """Launch Firefox with I2P profile"""
+    from .commands import cmd_browser
+
     try:
         managers = get_managers()
         cmd_browser.run(managers)
     except Exception as e:
-        console.print(f"[red]✗ Error:[/red] {e}")
-        sys.exit(1)
+        fail(e)
 
 
 @main.command("config")
 def config_edit():
     """Edit configuration file"""
+    from .commands import cmd_config
+
     try:
         managers = get_managers()
         cmd_config.run(managers)
     except Exception as e:
-        console.print(f"[red]✗ Error:[/red] {e}")
-        sys.exit(1)
+        fail(e)
 
 
 @main.command("logs")
@@ -143,12 +264,13 @@ def config_edit():
 @click.option("--lines", "-n", default=50, help="Number of lines", type=int)
 def logs(follow, lines):
     """Show I2Pd logs"""
+    from .commands import cmd_logs
+
     try:
         managers = get_managers()
         cmd_logs.run(managers, follow=follow, lines=lines)
     except Exception as e:
-        console.print(f"[red]✗ Error:[/red] {e}")
-        sys.exit(1)
+        fail(e)
 
 
 @main.command("reset")
@@ -156,13 +278,289 @@ def logs(follow, lines):
 @click.confirmation_option(prompt="Reset everything?")
 def reset(keep_i2pd_data):
     """Remove I2P profile and configuration"""
+    from .commands import cmd_reset
+
     try:
         managers = get_managers()
         cmd_reset.run(managers, keep_i2pd_data=keep_i2pd_data)
     except Exception as e:
-        console.print(f"[red]✗ Error:[/red] {e}")
+        fail(e)
+
+
+@main.command("supervise")
+@click.option(
+    "--interval",
+    "-n",
+    type=click.FloatRange(min=1),
+    help="Seconds between health checks (default: supervisor.check_interval)",
+)
+@click.option("--history", is_flag=True, help="Show past restarts and exit")
+def supervise(interval, history):
+    """Keep I2Pd running, restarting it when it dies or hangs"""
+    from .commands import cmd_supervise
+
+    try:
+        managers = get_managers()
+        cmd_supervise.run(managers, interval=interval, show_history=history)
+    except Exception as e:
+        fail(e)
+
+
+@main.group("instance")
+def instance():
+    """Manage named i2pd instances (several routers on one host)"""
+
+
+@instance.command("add")
+@click.argument("name")
+def instance_add(name):
+    """Add an instance with its own data directory and free ports"""
+    from .commands import cmd_instance
+
+    try:
+        managers = get_managers()
+        cmd_instance.run(managers, action="add", name=name)
+    except Exception as e:
+        fail(e)
+
+
+@instance.command("remove")
+@click.argument("name")
+def instance_remove(name):
+    """Remove an instance from the config (keeps its data)"""
+    from .commands import cmd_instance
+
+    try:
+        managers = get_managers()
+        cmd_instance.run(managers, action="remove", name=name)
+    except Exception as e:
+        fail(e)
+
+
+@instance.command("list")
+def instance_list():
+    """List all routers and their ports"""
+    from .commands import cmd_instance
+
+    try:
+        managers = get_managers()
+        cmd_instance.run(managers, action="list")
+    except Exception as e:
+        fail(e)
+
+
+@main.command("balance")
+@click.option("--host", help="Address to listen on (default: balancer.host)")
+@click.option(
+    "--port",
+    "-p",
+    type=click.IntRange(0, 65535),
+    help="Port to listen on (default: balancer.port)",
+)
+def balance(host, port):
+    """Run one local proxy that spreads connections across all routers"""
+    from .commands import cmd_balance
+
+    try:
+        managers = get_managers()
+        cmd_balance.run(managers, host=host, port=port)
+    except Exception as e:
+        fail(e)
+
+
+@main.command("probe")
+@click.argument("targets", nargs=-1)
+@click.option(
+    "--file",
+    "-f",
+    "target_file",
+    type=click.File("r"),
+    help="Read targets from a file, one per line (- for stdin)",
+)
+@click.option(
+    "--concurrency", "-c", default=8, type=click.IntRange(min=1), show_default=True
+)
+@click.option(
+    "--deadline",
+    default=60.0,
+    type=click.FloatRange(min=1),
+    show_default=True,
+    help="Seconds allowed per target, including retries",
+)
+@click.option("--retries", default=2, type=click.IntRange(min=0), show_default=True)
+@click.option("--json", "as_json", is_flag=True, help="Print results as JSON")
+def probe(targets, target_file, concurrency, deadline, retries, as_json):
+    """Check that eepsites (URLs, .i2p hosts or b32 addresses) answer"""
+    from .commands import cmd_probe
+    from .probe import read_targets
+
+    targets = list(targets)
+    if target_file is not None:
+        targets += read_targets(target_file.readlines())
+    if not targets:
+        raise click.UsageError("Give at least one target or --file")
+
+    try:
+        managers = get_managers()
+        reachable = cmd_probe.run(
+            managers,
+            targets,
+            concurrency=concurrency,
+            deadline=deadline,
+            retries=retries,
+            as_json=as_json,
+        )
+    except Exception as e:
+        fail(e)
+    if not reachable:
         sys.exit(1)
 
 
+@main.group("bench")
+def bench():
+    """Measure proxy throughput and latency"""
+
+
+@bench.command("proxy")
+@click.option(
+    "--mode",
+    "-m",
+    "modes",
+    multiple=True,
+    type=click.Choice(["http", "connect", "socks"]),
+    help="Proxy protocol to load, repeatable (default: http and socks)",
+)
+@click.option(
+    "--target",
+    "-t",
+    default="bench.i2p",
+    show_default=True,
+    help="HOST[:PORT] to reach (tunnel modes need an echo service there)",
+)
+@click.option(
+    "--concurrency", "-c", default=8, type=click.IntRange(min=1), show_default=True
+)
+@click.option(
+    "--duration",
+    "-d",
+    default=10.0,
+    type=click.FloatRange(min=0.1),
+    show_default=True,
+    help="Seconds per mode",
+)
+@click.option(
+    "--requests", "-n", type=click.IntRange(min=1), help="Stop after this many"
+)
+@click.option(
+    "--size",
+    default=1024,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Bytes per echoed message (tunnel modes)",
+)
+@click.option(
+    "--messages",
+    default=10,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Messages per tunnel before reconnecting (tunnel modes)",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print results as JSON")
+def bench_proxy(
+    modes, target, concurrency, duration, requests, size, messages, as_json
+):
+    """Drive load through the HTTP and SOCKS proxies"""
+    from .commands import cmd_bench
+
+    try:
+        managers = get_managers()
+        cmd_bench.run(
+            managers,
+            modes=modes or ("http", "socks"),
+            target=target,
+            as_json=as_json,
+            concurrency=concurrency,
+            duration=None if requests else duration,
+            requests=requests,
+            size=size,
+            messages=messages,
+        )
+    except Exception as e:
+        fail(e)
+
+
+@main.group("cache")
+def cache():
+    """Cache eepsite responses locally (an HTTP proxy in front of I2P)"""
+
+
+@cache.command("run")
+@click.option("--host", help="Address to listen on (default: cache.host)")
+@click.option(
+    "--port",
+    "-p",
+    type=click.IntRange(0, 65535),
+    help="Port to listen on (default: cache.port)",
+)
+def cache_run(host, port):
+    """Run the caching proxy until interrupted"""
+    from .commands import cmd_cache
+
+    try:
+        managers = get_managers()
+        cmd_cache.run(managers, action="run", host=host, port=port)
+    except Exception as e:
+        fail(e)
+
+
+@cache.command("stats")
+def cache_stats():
+    """Show cache size and hit ratio"""
+    from .commands import cmd_cache
+
+    try:
+        managers = get_managers()
+        cmd_cache.run(managers, action="stats")
+    except Exception as e:
+        fail(e)
+
+
+@cache.command("clear")
+def cache_clear():
+    """Remove every cached response"""
+    from .commands import cmd_cache
+
+    try:
+        managers = get_managers()
+        cmd_cache.run(managers, action="clear")
+    except Exception as e:
+        fail(e)
+
+
+@main.group("profile")
+def profile():
+    """Manage the Firefox I2P profile"""
+
+
+@profile.command("optimize")
+@click.option(
+    "--max-cache-age", default=7.0, type=float, help="Max cache entry age in days"
+)
+@click.option(
+    "--max-cache-size", default=256.0, type=float, help="Max cache size in MB"
+)
+def profile_optimize(max_cache_age, max_cache_size):
+    """Vacuum profile databases and prune the disk cache"""
+    from .commands import cmd_optimize
+
+    try:
+        managers = get_managers()
+        cmd_optimize.run(
+            managers, max_cache_age=max_cache_age, max_cache_size=max_cache_size
+        )
+    except Exception as e:
+        fail(e)
+
+
 if __name__ == "__main__":
     main()
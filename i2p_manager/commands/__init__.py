@@ -1,16 +1,7 @@
-"""Commands package"""
+"""Commands package
 
-from . import (
-    cmd_init,
-    cmd_start,
-    cmd_stop,
-    cmd_status,
-    cmd_restart,
-    cmd_browser,
-    cmd_config,
-    cmd_logs,
-    cmd_reset,
-)
+Each command module is imported by the CLI only when it runs.
+"""
 
 __all__ = [
     "cmd_init",
@@ -22,4 +13,11 @@ __all__ = [
     "cmd_config",
     "cmd_logs",
     "cmd_reset",
+    "cmd_optimize",
+    "cmd_supervise",
+    "cmd_instance",
+    "cmd_balance",
+    "cmd_cache",
+    "cmd_probe",
+    "cmd_bench",
 ]
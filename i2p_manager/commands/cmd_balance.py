@@ -0,0 +1,81 @@
+"""
+Spread browser connections across all routers through one local proxy
+"""
+
+import asyncio
+
+from ..balancer import Balancer, ProxyFront, fleet_backends
+from ..tracing import traced
+from ..utils import console
+
+
+@traced("cmd.balance")
+def run(managers, host=None, port=None):
+    """Run the balancing proxy until interrupted"""
+    config = managers["config"]
+    settings = config.load()["balancer"]
+
+    front = ProxyFront(
+        Balancer(fleet_backends(config)),
+        host=host or settings["host"],
+        port=port if port is not None else settings["port"],
+        health_interval=settings["health_interval"],
+    )
+
+    if settings["enabled"]:
+        # Keep the browser profile pointed at this proxy
+        firefox = managers["firefox"]
+        profile_name = config.load()["firefox"]["profile_name"]
+        if firefox.profile_exists(profile_name) and firefox.configure_proxy(
+            str(firefox.get_profile_path(profile_name))
+        ):
+            console.print("[green]✓[/green] Firefox profile now uses the balancer")
+
+    try:
+        asyncio.run(serve(front))
+    except KeyboardInterrupt:
+        pass
+
+    print_stats(front)
+
+
+async def serve(front: ProxyFront):
+    """Start the front and wait forever"""
+    await front.start()
+
+    names = ", ".join(b.name for b in front.balancer.backends)
+    console.print("\n[blue bold]⚖  Balancing I2P proxies[/blue bold]")
+    console.print(
+        f"HTTP and SOCKS5 on [cyan]{front.host}:{front.port}[/cyan] " f"across: {names}"
+    )
+    if not all(b.healthy for b in front.balancer.backends):
+        console.print("[yellow]⚠ Some routers are not running yet[/yellow]")
+    console.print("[dim]Press Ctrl+C to stop[/dim]\n")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await front.stop()
+
+
+def print_stats(front: ProxyFront):
+    """Print connections served per router"""
+    from rich.table import Table
+
+    table = Table(title="Connections per Router")
+    table.add_column("Router", style="cyan")
+    table.add_column("Healthy")
+    table.add_column("Connections", justify="right")
+    table.add_column("Failures", justify="right")
+
+    for name, stats in front.stats().items():
+        table.add_row(
+            name,
+            "✓" if stats["healthy"] else "✗",
+            str(stats["total"]),
+            str(stats["failures"]),
+        )
+
+    console.print()
+    console.print(table)
+    console.print()
@@ -0,0 +1,76 @@
+"""
+Measure throughput and latency of the I2P HTTP and SOCKS proxies
+"""
+
+from ..bench import bench
+from ..tracing import traced
+from ..utils import console
+
+
+@traced("cmd.bench")
+def run(
+    managers, modes=("http", "socks"), target="bench.i2p", as_json=False, **options
+):
+    """Benchmark each mode in turn and print the results"""
+    cfg = managers["config"].load()["i2pd"]
+    ports = {
+        "http": cfg["http_port"],
+        "connect": cfg["http_port"],
+        "socks": cfg["socks_port"],
+    }
+
+    results = []
+    for mode in modes:
+        proxy = (cfg["host"], ports[mode])
+        if not as_json:
+            console.print(
+                f"\n[blue bold]⏱  {mode}[/blue bold] [dim]via {proxy[0]}:{proxy[1]} "
+                f"to {target}[/dim]"
+            )
+        results.append(bench(mode, proxy, target, **options))
+        if not as_json:
+            print_result(results[-1])
+
+    if as_json:
+        from .cmd_status import emit_json
+
+        emit_json([r.to_dict() for r in results])
+    else:
+        console.print()
+    return results
+
+
+def _ms(value):
+    return "-" if value is None else f"{value * 1000:.1f} ms"
+
+
+def print_result(result):
+    """Print rates, connect and request latency, and a histogram"""
+    summary = result.to_dict()
+    console.print(
+        f"  [cyan]{summary['requests_per_second']:.1f}[/cyan] req/s, "
+        f"[cyan]{summary['bytes_per_second'] / 1024:.1f}[/cyan] KB/s "
+        f"({result.requests} requests on {result.connections} connections "
+        f"in {result.elapsed:.1f}s)"
+    )
+    for label, key in (("connect", "connect"), ("request", "latency")):
+        spread = summary[key]
+        console.print(
+            f"  {label:<8} p50 [cyan]{_ms(spread['p50'])}[/cyan]  "
+            f"p90 [cyan]{_ms(spread['p90'])}[/cyan]  "
+            f"p99 [cyan]{_ms(spread['p99'])}[/cyan]"
+        )
+    if result.errors:
+        errors = ", ".join(f"{n}× {reason}" for reason, n in result.errors.items())
+        console.print(f"  [red]errors:[/red] {errors}")
+
+    counts = summary["histogram"]
+    peak = max(counts.values())
+    if not peak:
+        return
+    # Only show the range of buckets that were hit
+    labels = list(counts)
+    used = [i for i, label in enumerate(labels) if counts[label]]
+    for label in labels[used[0] : used[-1] + 1]:
+        bar = "█" * round(counts[label] / peak * 30)
+        console.print(f"  {label:>9} {bar} {counts[label]}", highlight=False)
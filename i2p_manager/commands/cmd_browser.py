@@ -2,12 +2,13 @@
 Launch Firefox with I2P profile
 """
 
-from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-console = Console()
+from ..tracing import traced
+from ..utils import console
 
 
+@traced("cmd.browser")
 def run(managers):
     """Launch Firefox with I2P profile"""
     config = managers["config"]
@@ -49,8 +50,14 @@ def run(managers):
         progress.update(task, description="Launching Firefox...")
 
         try:
-            firefox.launch(cfg["firefox"]["profile_name"])
-            progress.update(task, description="[green]Firefox launched[/green]")
+            result = firefox.launch(cfg["firefox"]["profile_name"])
+            if result["reused"]:
+                progress.update(
+                    task,
+                    description="[green]Firefox already running, opened new window[/green]",
+                )
+            else:
+                progress.update(task, description="[green]Firefox launched[/green]")
         except Exception as e:
             progress.stop()
             console.print(f"[red]✗ Failed to launch Firefox:[/red] {e}")
@@ -64,3 +71,19 @@ def run(managers):
         f"  [cyan]• http://127.0.0.1:{cfg['i2pd']['console_port']}[/cyan] - Router console"
     )
     console.print()
+
+    if cfg["firefox"].get("ram_profile") and not result["reused"]:
+        # The profile lives in RAM: save it back to disk once Firefox exits
+        console.print(
+            "[dim]Profile is in RAM, waiting for Firefox to exit to save it "
+            "(Ctrl+C to stop waiting)...[/dim]"
+        )
+        try:
+            synced = firefox.wait_and_sync(
+                cfg["firefox"]["profile_name"], result["pid"]
+            )
+            console.print(f"[green]✓ Profile saved ({synced} files)[/green]\n")
+        except KeyboardInterrupt:
+            console.print(
+                "\n[yellow]Not waiting; profile will be saved on next launch[/yellow]\n"
+            )
@@ -0,0 +1,89 @@
+"""
+Cache eepsite responses locally between Firefox and the I2P proxy
+"""
+
+import asyncio
+
+from ..httpcache import CachingProxy, open_cache, upstream_address
+from ..tracing import traced
+from ..utils import console
+
+
+@traced("cmd.cache")
+def run(managers, action="run", host=None, port=None):
+    """Run the caching proxy, or show or clear the cache"""
+    config = managers["config"]
+    cache = open_cache(config)
+
+    if action == "stats":
+        print_stats(cache)
+        return
+    if action == "clear":
+        count = cache.clear()
+        console.print(f"\n[green]✓[/green] Removed {count} cached responses\n")
+        return
+
+    settings = config.load()["cache"]
+    proxy = CachingProxy(
+        cache,
+        upstream_address(config),
+        host=host or settings["host"],
+        port=port if port is not None else settings["port"],
+    )
+
+    if settings["enabled"]:
+        # Keep the browser profile pointed at the cache
+        firefox = managers["firefox"]
+        profile_name = config.load()["firefox"]["profile_name"]
+        if firefox.profile_exists(profile_name) and firefox.configure_proxy(
+            str(firefox.get_profile_path(profile_name))
+        ):
+            console.print("[green]✓[/green] Firefox profile now uses the cache")
+
+    try:
+        asyncio.run(serve(proxy))
+    except KeyboardInterrupt:
+        pass
+
+    print_stats(cache)
+
+
+async def serve(proxy: CachingProxy):
+    """Start the proxy and wait forever"""
+    await proxy.start()
+
+    upstream = "{}:{}".format(*proxy.upstream)
+    console.print("\n[blue bold]🗄  Caching I2P proxy[/blue bold]")
+    console.print(
+        f"HTTP proxy on [cyan]{proxy.host}:{proxy.port}[/cyan], "
+        f"misses go to {upstream}"
+    )
+    console.print("[dim]Press Ctrl+C to stop[/dim]\n")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await proxy.stop()
+
+
+def print_stats(cache):
+    """Print cache size and hit ratio"""
+    stats = cache.stats
+    ratio = cache.hit_ratio()
+
+    console.print(f"\n[bold]HTTP cache[/bold] [dim]({cache.path})[/dim]")
+    console.print(
+        f"  Entries:     [cyan]{len(cache.entries)}[/cyan] "
+        f"({cache.size / 2**20:.1f} of {cache.max_bytes / 2**20:.0f} MB)"
+    )
+    console.print(
+        f"  Requests:    [cyan]{stats['hits']}[/cyan] fresh hits, "
+        f"[cyan]{stats['revalidated']}[/cyan] revalidated, "
+        f"[cyan]{stats['misses']}[/cyan] misses"
+    )
+    if ratio is not None:
+        console.print(f"  Hit ratio:   [cyan]{ratio:.0%}[/cyan]")
+    console.print(
+        f"  Served:      [cyan]{stats['bytes_served'] / 2**20:.1f} MB[/cyan] "
+        f"from cache, {stats['evicted']} evicted\n"
+    )
@@ -5,11 +5,12 @@ Open configuration file in editor
 import os
 import sys
 import subprocess
-from rich.console import Console
 
-console = Console()
+from ..tracing import traced
+from ..utils import console
 
 
+@traced("cmd.config")
 def run(managers):
     """Open configuration file in default editor"""
     config = managers["config"]
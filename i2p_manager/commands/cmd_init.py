@@ -2,12 +2,13 @@
 Initialize I2P Firefox profile and configuration
 """
 
-from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-console = Console()
+from ..tracing import traced
+from ..utils import console
 
 
+@traced("cmd.init")
 def run(managers, force=False):
     """Initialize I2P profile and configuration"""
     config = managers["config"]
@@ -73,24 +74,19 @@ def run(managers, force=False):
             console.print("\nUse --force to reinitialize\n")
             return
 
-        # Create Firefox profile
+        # Create Firefox profile from the cached template (hardening and
+        # proxy settings are baked into the template)
         progress.update(task, description="Creating Firefox profile...")
         profile = firefox.create_profile(profile_name)
         progress.update(
             task, description=f"[green]Profile created: {profile['name']}[/green]"
         )
 
-        # Apply Arkenfox hardening
         if cfg["firefox"]["harden_with_arkenfox"]:
-            progress.update(task, description="Applying Arkenfox hardening...")
-            firefox.apply_hardening(profile["path"])
             progress.update(
                 task, description="[green]Arkenfox settings applied[/green]"
             )
 
-        # Configure I2P proxy
-        progress.update(task, description="Configuring I2P proxy...")
-        firefox.configure_proxy(profile["path"])
         progress.update(task, description="[green]I2P proxy configured[/green]")
 
     # Success message
@@ -0,0 +1,53 @@
+"""
+Manage named i2pd instances
+"""
+
+from ..fleet import add_instance, instance_names, instance_config, remove_instance
+from ..tracing import traced
+from ..utils import console
+
+
+@traced("cmd.instance")
+def run(managers, action="list", name=None):
+    """Add, remove or list named i2pd instances"""
+    config = managers["config"]
+
+    if action == "add":
+        ports = add_instance(config, name)
+        console.print(f"\n[green]✓ Added instance[/green] [cyan]{name}[/cyan]")
+        for key, port in ports.items():
+            console.print(f"  {key}: {port}")
+        console.print(
+            "\n[dim]Start it with:[/dim] [cyan]i2p-manager start --all[/cyan]\n"
+        )
+
+    elif action == "remove":
+        remove_instance(config, name)
+        console.print(f"\n[green]✓ Removed instance[/green] [cyan]{name}[/cyan]")
+        console.print("[dim]Its data directory was kept[/dim]\n")
+
+    else:
+        from rich.table import Table
+
+        table = Table(title="I2P Routers", box=None, padding=(0, 2))
+        table.add_column("Instance", style="cyan")
+        table.add_column("Console", justify="right")
+        table.add_column("HTTP", justify="right")
+        table.add_column("SOCKS", justify="right")
+        table.add_column("SAM", justify="right")
+        table.add_column("Backend")
+
+        for instance in instance_names(config):
+            cfg = instance_config(config, instance).load()["i2pd"]
+            table.add_row(
+                instance,
+                str(cfg["console_port"]),
+                str(cfg["http_port"]),
+                str(cfg["socks_port"]),
+                str(cfg.get("sam_port", "")),
+                cfg.get("backend", "auto"),
+            )
+
+        console.print()
+        console.print(table)
+        console.print()
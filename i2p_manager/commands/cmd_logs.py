@@ -4,11 +4,12 @@ Show I2Pd logs
 
 import sys
 import subprocess
-from rich.console import Console
 
-console = Console()
+from ..tracing import traced
+from ..utils import console
 
 
+@traced("cmd.logs")
 def run(managers, follow=False, lines=50):
     """Show I2Pd logs"""
     i2pd = managers["i2pd"]
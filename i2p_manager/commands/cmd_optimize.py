@@ -0,0 +1,73 @@
+"""
+Optimize Firefox I2P profile storage
+"""
+
+from rich.table import Table
+
+from ..tracing import traced
+from ..utils import console
+
+
+@traced("cmd.optimize")
+def run(managers, max_cache_age=7, max_cache_size=256):
+    """Vacuum profile databases and prune the disk cache"""
+    config = managers["config"]
+    firefox = managers["firefox"]
+
+    console.print("\n[blue bold]🧹 Optimizing I2P Profile[/blue bold]\n")
+
+    cfg = config.load()
+    profile_name = cfg["firefox"]["profile_name"]
+
+    try:
+        report = firefox.optimize_profile(
+            profile_name,
+            max_cache_age_days=max_cache_age,
+            max_cache_size_mb=max_cache_size,
+        )
+    except FileNotFoundError:
+        console.print("[yellow]⚠ I2P profile not found[/yellow]")
+        console.print("\nRun [cyan]i2p-manager init[/cyan] first\n")
+        return
+    except RuntimeError as e:
+        console.print(f"[yellow]⚠ {e}[/yellow]\n")
+        return
+
+    table = Table(show_header=True, box=None, padding=(0, 2))
+    table.add_column("Database", style="cyan")
+    table.add_column("Before", justify="right")
+    table.add_column("After", justify="right")
+
+    for db in report["databases"]:
+        if "error" in db:
+            table.add_row(db["name"], f"[red]{db['error']}[/red]", "")
+        else:
+            table.add_row(
+                db["name"], _format_bytes(db["before"]), _format_bytes(db["after"])
+            )
+
+    if report["databases"]:
+        console.print(table)
+        console.print()
+
+    console.print(
+        f"Cache entries removed: {report['cache_entries_removed']} "
+        f"({_format_bytes(report['cache_bytes_removed'])})"
+    )
+    console.print(
+        f"Startup data: {_format_bytes(report['startup_bytes_before'])} → "
+        f"{_format_bytes(report['startup_bytes_after'])}"
+    )
+    console.print(
+        f"\n[green bold]✓ Reclaimed {_format_bytes(report['bytes_reclaimed'])}"
+        "[/green bold]\n"
+    )
+
+
+def _format_bytes(size):
+    """Format a byte count for display"""
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
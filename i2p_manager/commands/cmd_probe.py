@@ -0,0 +1,97 @@
+"""
+Check that eepsites answer through the I2P proxy, and how fast
+"""
+
+from ..probe import probe, summarize
+from ..tracing import traced
+from ..utils import console
+
+
+@traced("cmd.probe")
+def run(
+    managers,
+    targets,
+    concurrency=8,
+    deadline=60,
+    retries=2,
+    as_json=False,
+):
+    """Probe targets concurrently; returns True if all were reachable"""
+    cfg = managers["config"].load()["i2pd"]
+    proxy = (cfg["host"], cfg["http_port"])
+
+    if not as_json:
+        console.print(
+            f"\n[blue bold]🔎 Probing {len(targets)} target(s)[/blue bold] "
+            f"[dim]via {proxy[0]}:{proxy[1]}, {concurrency} at a time[/dim]\n"
+        )
+
+    def on_result(result):
+        if not as_json:
+            mark = "[green]✓[/green]" if result.ok else "[red]✗[/red]"
+            console.print(f"{mark} {result.target}", highlight=False)
+
+    results = probe(
+        targets,
+        proxy,
+        concurrency=concurrency,
+        deadline=deadline,
+        retries=retries,
+        on_result=on_result,
+    )
+    summary = summarize(results)
+
+    if as_json:
+        from .cmd_status import emit_json
+
+        emit_json({"results": [r._asdict() for r in results], "summary": summary})
+    else:
+        print_results(results, summary)
+
+    return summary["ok"] == summary["targets"]
+
+
+def _seconds(value):
+    if value is None:
+        return "-"
+    return f"{value * 1000:.0f} ms" if value < 1 else f"{value:.2f}s"
+
+
+def print_results(results, summary):
+    """Print a per-target table and overall percentiles"""
+    from rich.table import Table
+
+    table = Table(title="Probe Results")
+    table.add_column("Target", style="cyan")
+    table.add_column("Status")
+    table.add_column("TTFB", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("Tries", justify="right")
+
+    for r in results:
+        status = f"[green]{r.status}[/green]" if r.ok else f"[red]{r.error}[/red]"
+        table.add_row(
+            r.target,
+            status,
+            _seconds(r.ttfb),
+            _seconds(r.total),
+            f"{r.size / 1024:.1f} KB" if r.ok else "-",
+            str(r.attempts),
+        )
+
+    console.print()
+    console.print(table)
+    console.print(
+        f"\n[cyan]{summary['ok']}[/cyan] of [cyan]{summary['targets']}[/cyan] "
+        "reachable"
+    )
+    for field, label in (("ttfb", "TTFB"), ("total", "Total")):
+        values = summary[field]
+        if values["p50"] is not None:
+            console.print(
+                f"{label:<6} p50 [cyan]{_seconds(values['p50'])}[/cyan]  "
+                f"p90 [cyan]{_seconds(values['p90'])}[/cyan]  "
+                f"p99 [cyan]{_seconds(values['p99'])}[/cyan]"
+            )
+    console.print()
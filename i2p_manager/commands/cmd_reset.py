@@ -2,12 +2,14 @@
 Remove I2P profile and configuration
 """
 
-from rich.console import Console
+import shutil
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-console = Console()
+from ..tracing import traced
+from ..utils import console
 
 
+@traced("cmd.reset")
 def run(managers, keep_i2pd_data=False):
     """Remove I2P profile and configuration"""
     config = managers["config"]
@@ -44,6 +46,19 @@ def run(managers, keep_i2pd_data=False):
         else:
             progress.update(task, description="[yellow]I2Pd not running[/yellow]")
 
+        # Remove data of a natively launched i2pd (router identity, netDb)
+        data_dir = i2pd.get_data_dir()
+        if not keep_i2pd_data and data_dir.exists():
+            progress.update(task, description="Removing I2Pd data...")
+            try:
+                i2pd.stop_native()
+                shutil.rmtree(data_dir)
+                progress.update(task, description="[green]I2Pd data removed[/green]")
+            except Exception as e:
+                progress.update(
+                    task, description=f"[yellow]Could not remove data: {e}[/yellow]"
+                )
+
         # Remove Firefox profile
         progress.update(task, description="Removing Firefox profile...")
         profile_name = cfg["firefox"]["profile_name"]
@@ -3,12 +3,13 @@ Start I2Pd and launch Firefox with I2P profile
 """
 
 import time
-from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-console = Console()
+from ..tracing import span, traced
+from ..utils import console
 
 
+@traced("cmd.start")
 def run(managers, browser=True):
     """Start I2P and optionally launch browser"""
     config = managers["config"]
@@ -35,7 +36,8 @@ def run(managers, browser=True):
             progress.update(task, description="Starting I2Pd...")
             try:
                 i2pd.start()
-                time.sleep(3)
+                with span("wait for router"):
+                    time.sleep(3)
 
                 if i2pd.is_running(cfg["i2pd"]["console_port"]):
                     progress.update(
@@ -58,8 +60,13 @@ def run(managers, browser=True):
         if browser:
             progress.update(task, description="Launching Firefox...")
             try:
-                firefox.launch(cfg["firefox"]["profile_name"])
-                progress.update(task, description="[green]Firefox launched[/green]")
+                result = firefox.launch(cfg["firefox"]["profile_name"])
+                if result["reused"]:
+                    progress.update(
+                        task, description="[green]Firefox already running[/green]"
+                    )
+                else:
+                    progress.update(task, description="[green]Firefox launched[/green]")
             except Exception as e:
                 progress.stop()
                 console.print(f"[red]✗ Failed to launch Firefox:[/red] {e}")
@@ -73,3 +80,39 @@ def run(managers, browser=True):
     console.print("  • Wait 10-30 minutes for network integration")
     console.print("  • Check status: [cyan]i2p-manager status[/cyan]")
     console.print("  • Try visiting: [cyan]http://planet.i2p[/cyan]\n")
+
+
+# How long start --all waits for each router's console to come up
+FLEET_START_WAIT = 10
+
+
+def start_instance(name, managers):
+    """Start one router of the fleet, returns what happened"""
+    i2pd = managers["i2pd"]
+    console_port = managers["config"].get("i2pd.console_port", 7070)
+
+    if i2pd.is_running(console_port):
+        return "already running"
+
+    i2pd.start()
+    deadline = time.time() + FLEET_START_WAIT
+    while time.time() < deadline:
+        if i2pd.is_running(console_port):
+            return "started"
+        time.sleep(0.5)
+    return "starting"
+
+
+@traced("cmd.start_all")
+def run_all(managers):
+    """Start every configured router concurrently"""
+    from ..fleet import instance_managers, run_all as run_fleet
+    from .cmd_status import print_fleet_results
+
+    console.print("\n[blue bold]🚀 Starting all routers[/blue bold]\n")
+
+    fleet = instance_managers(managers["config"])
+    with console.status(f"Starting {len(fleet)} router(s)..."):
+        results = run_fleet(start_instance, fleet)
+
+    print_fleet_results(results, fleet)
@@ -2,21 +2,55 @@
 Check I2P connection status
 """
 
-from rich.console import Console
-from rich.table import Table
+import json
+import os
+import sys
+import time
 
-console = Console()
+from ..daemon import STATUS_MAX_AGE, DaemonError, get_client
+from ..polling import PollPolicy, integration_phase
+from ..tracing import traced
+from ..utils import get_console
 
+# Fields that tick on every poll, ignored when watching with --on-change
+VOLATILE_FIELDS = (
+    "ts",
+    "uptime",
+    "bandwidth_in",
+    "bandwidth_out",
+    "process",
+    "age",
+)
 
-def run(managers, verbose=False):
+
+@traced("cmd.status")
+def run(
+    managers,
+    verbose=False,
+    watch=False,
+    interval=None,
+    as_json=False,
+    on_change=False,
+):
     """Check I2P connection status"""
+    if watch:
+        run_watch(managers, interval=interval, as_json=as_json, on_change=on_change)
+        return
+
+    if as_json:
+        emit_json(collect(managers))
+        return
+
+    # rich is only loaded for human output, JSON callers skip it
+    from rich.table import Table
+
     config = managers["config"]
-    i2pd = managers["i2pd"]
+    console = get_console()
 
     console.print("\n[blue bold]📊 I2P Manager Status[/blue bold]\n")
 
     cfg = config.load()
-    status = i2pd.get_status(cfg["i2pd"]["console_port"])
+    status = collect(managers)
 
     if status["running"]:
         console.print("[green bold]● I2Pd is running[/green bold]\n")
@@ -29,12 +63,11 @@ def run(managers, verbose=False):
         tunnels = status.get("tunnels", 0)
 
         # Determine connection quality
-        if peers < 10:
-            status_text = "[yellow]Connecting[/yellow]"
-        elif peers < 50:
-            status_text = "[yellow]Integrating[/yellow]"
-        else:
+        phase = integration_phase(status)
+        if phase == "connected":
             status_text = "[green]Connected[/green]"
+        else:
+            status_text = f"[yellow]{phase.capitalize()}[/yellow]"
 
         table.add_row("Status", status_text)
         table.add_row(
@@ -47,10 +80,10 @@ def run(managers, verbose=False):
         console.print(table)
 
         # Status message
-        if peers < 10:
+        if phase == "connecting":
             console.print("\n[yellow]⚠️  Building connections...[/yellow]")
             console.print("[dim]This takes 10-30 minutes on first run[/dim]")
-        elif peers < 50:
+        elif phase == "integrating":
             console.print("\n[yellow]⏳ Network integration in progress...[/yellow]")
             console.print("[dim]Should be ready soon[/dim]")
         else:
@@ -64,6 +97,19 @@ def run(managers, verbose=False):
             console.print(
                 f"  Arkenfox: {'enabled' if cfg['firefox']['harden_with_arkenfox'] else 'disabled'}"
             )
+            console.print(f"  Network: {status.get('network_status') or 'unknown'}")
+            rate = status.get("tunnel_success_rate")
+            console.print(
+                f"  Tunnel success rate: {'unknown' if rate is None else f'{rate}%'}"
+            )
+
+            process = status.get("process")
+            if process:
+                console.print(
+                    f"  Process: PID {process['pid']}, "
+                    f"{process['memory_rss'] / 1024 / 1024:.0f} MB RSS, "
+                    f"{process['threads']} threads"
+                )
     else:
         console.print("[red bold]● I2Pd is not running[/red bold]")
         console.print(
@@ -71,3 +117,171 @@ def run(managers, verbose=False):
         )
 
     console.print()
+
+
+def collect(managers, max_age: float = STATUS_MAX_AGE) -> dict:
+    """Get a status snapshot with console and process metrics
+
+    Served by the manager daemon when one is running, with a snapshot no
+    older than max_age seconds, otherwise fetched from the router console
+    directly.
+    """
+    client = get_client(managers)
+    if client is not None:
+        try:
+            return client.status(max_age)
+        except (OSError, ValueError, DaemonError):
+            pass
+
+    i2pd = managers["i2pd"]
+    console_port = managers["config"].get("i2pd.console_port", 7070)
+
+    status = i2pd.get_status(console_port)
+    return {
+        "ts": round(time.time(), 3),
+        "phase": integration_phase(status),
+        **status,
+        "process": i2pd.get_process_info(),
+    }
+
+
+def emit_json(snapshot: dict):
+    """Write a snapshot as one line of JSON"""
+    sys.stdout.write(json.dumps(snapshot, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
+def emit_line(snapshot: dict):
+    """Print a one-line human readable snapshot"""
+    console = get_console()
+    stamp = time.strftime("%H:%M:%S", time.localtime(snapshot["ts"]))
+    if not snapshot["running"]:
+        console.print(f"{stamp}  [red]stopped[/red]")
+        return
+
+    rate = snapshot.get("bandwidth_in", 0) + snapshot.get("bandwidth_out", 0)
+    console.print(
+        f"{stamp}  [cyan]{snapshot['phase']:<11}[/cyan] "
+        f"peers {snapshot['peers']:<5} tunnels {snapshot['tunnels']:<4} "
+        f"{rate:.1f} KiB/s"
+    )
+
+
+def run_watch(managers, interval=None, as_json=False, on_change=False):
+    """Print a status snapshot repeatedly until interrupted
+
+    Keeps a single process and console connection alive, so supervisors
+    can read status from a pipe instead of spawning a CLI per check.
+    Without an interval, polling adapts to the integration phase.
+    """
+    policy = PollPolicy(
+        base_interval=managers["config"].get("dashboard.refresh_interval", 5)
+    )
+    emit = emit_json if as_json else emit_line
+    last_state = None
+    delay = interval or policy.interval
+
+    try:
+        while True:
+            # A daemon snapshot older than one poll would repeat itself
+            snapshot = collect(managers, max_age=delay)
+
+            state = {k: v for k, v in snapshot.items() if k not in VOLATILE_FIELDS}
+            if not on_change or state != last_state:
+                emit(snapshot)
+            last_state = state
+
+            delay = interval if interval else policy.next_interval(snapshot)
+            time.sleep(delay)
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        # Reader went away: silence the flush error at interpreter exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+
+
+@traced("cmd.status_all")
+def run_all(managers, as_json=False):
+    """Show the status of every configured router, fetched concurrently"""
+    from ..fleet import instance_managers, run_all as run_fleet
+
+    fleet = instance_managers(managers["config"])
+    results = run_fleet(lambda name, instance: collect(instance), fleet)
+
+    if as_json:
+        snapshots = []
+        for name, (ok, result) in results.items():
+            snapshot = result if ok else {"running": False, "error": str(result)}
+            snapshots.append({"instance": name, **snapshot})
+        emit_json(snapshots)
+        return
+
+    from rich.table import Table
+
+    console = get_console()
+    table = Table(title="I2P Routers", box=None, padding=(0, 2))
+    table.add_column("Instance", style="cyan")
+    table.add_column("Status")
+    table.add_column("Peers", justify="right")
+    table.add_column("Tunnels", justify="right")
+    table.add_column("Console", justify="right")
+    table.add_column("HTTP", justify="right")
+    table.add_column("SOCKS", justify="right")
+    table.add_column("PID", justify="right")
+
+    totals = {"running": 0, "peers": 0, "tunnels": 0}
+    for name, (ok, snapshot) in results.items():
+        cfg = fleet[name]["config"].load()["i2pd"]
+        ports = [str(cfg[key]) for key in ("console_port", "http_port", "socks_port")]
+
+        if not ok:
+            table.add_row(name, f"[red]error: {snapshot}[/red]", "", "", *ports, "")
+            continue
+
+        process = snapshot.get("process") or {}
+        if snapshot["running"]:
+            totals["running"] += 1
+            totals["peers"] += snapshot.get("peers", 0)
+            totals["tunnels"] += snapshot.get("tunnels", 0)
+            color = "green" if snapshot["phase"] == "connected" else "yellow"
+            state = f"[{color}]{snapshot['phase']}[/{color}]"
+        else:
+            state = "[red]stopped[/red]"
+
+        table.add_row(
+            name,
+            state,
+            str(snapshot.get("peers", 0)),
+            str(snapshot.get("tunnels", 0)),
+            *ports,
+            str(process.get("pid", "")),
+        )
+
+    console.print()
+    console.print(table)
+    console.print(
+        f"\n{totals['running']}/{len(fleet)} running, "
+        f"{totals['peers']} peers, {totals['tunnels']} client tunnels\n"
+    )
+
+
+def print_fleet_results(results, fleet):
+    """Print the outcome of a fleet action per router"""
+    from rich.table import Table
+
+    console = get_console()
+    table = Table(box=None, padding=(0, 2))
+    table.add_column("Instance", style="cyan")
+    table.add_column("Result")
+    table.add_column("Console", justify="right")
+
+    for name, (ok, result) in results.items():
+        port = str(fleet[name]["config"].get("i2pd.console_port"))
+        if ok:
+            table.add_row(name, f"[green]{result}[/green]", port)
+        else:
+            table.add_row(name, f"[red]✗ {result}[/red]", port)
+
+    console.print(table)
+    console.print()
@@ -3,12 +3,13 @@ Stop I2Pd daemon
 """
 
 import time
-from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-console = Console()
+from ..tracing import span, traced
+from ..utils import console
 
 
+@traced("cmd.stop")
 def run(managers):
     """Stop I2Pd daemon"""
     config = managers["config"]
@@ -34,7 +35,8 @@ def run(managers):
         progress.update(task, description="Stopping I2Pd...")
         try:
             i2pd.stop()
-            time.sleep(2)
+            with span("wait for router"):
+                time.sleep(2)
 
             if not i2pd.is_running(cfg["i2pd"]["console_port"]):
                 progress.update(
@@ -50,3 +52,30 @@ def run(managers):
             return
 
     console.print()
+
+
+def stop_instance(name, managers):
+    """Stop one router of the fleet, returns what happened"""
+    i2pd = managers["i2pd"]
+    console_port = managers["config"].get("i2pd.console_port", 7070)
+
+    if not i2pd.is_running(console_port) and i2pd.native_pid() is None:
+        return "not running"
+
+    i2pd.stop()
+    return "stopped"
+
+
+@traced("cmd.stop_all")
+def run_all(managers):
+    """Stop every configured router concurrently"""
+    from ..fleet import instance_managers, run_all as run_fleet
+    from .cmd_status import print_fleet_results
+
+    console.print("\n[blue bold]🛑 Stopping all routers[/blue bold]\n")
+
+    fleet = instance_managers(managers["config"])
+    with console.status(f"Stopping {len(fleet)} router(s)..."):
+        results = run_fleet(stop_instance, fleet)
+
+    print_fleet_results(results, fleet)
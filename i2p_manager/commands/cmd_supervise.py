@@ -0,0 +1,97 @@
+"""
+Keep I2Pd running, restarting it when it dies or hangs
+"""
+
+import threading
+import time
+
+from ..supervisor import Supervisor, load_history
+from ..tracing import traced
+from ..utils import console
+
+
+@traced("cmd.supervise")
+def run(managers, interval=None, show_history=False):
+    """Supervise I2Pd until interrupted"""
+    config = managers["config"]
+    history_path = config.get_config_dir() / "supervisor.jsonl"
+
+    if show_history:
+        print_history(load_history(history_path))
+        return
+
+    def on_event(message):
+        stamp = time.strftime("%H:%M:%S")
+        console.print(f"[dim]{stamp}[/dim]  {message}")
+
+    settings = {"check_interval": interval} if interval else {}
+    supervisor = Supervisor(
+        managers["i2pd"],
+        config,
+        on_event=on_event,
+        history_path=history_path,
+        **settings,
+    )
+
+    console.print("\n[blue bold]🛡  Supervising I2Pd[/blue bold]")
+    console.print(
+        f"[dim]Checking every {supervisor.settings['check_interval']}s, "
+        "press Ctrl+C to stop[/dim]\n"
+    )
+
+    stop = threading.Event()
+    try:
+        supervisor.run(stop.wait)
+    except KeyboardInterrupt:
+        pass
+
+    restarts = sum(incident.restarts for incident in supervisor.history)
+    if supervisor.incident is not None:
+        restarts += supervisor.incident.restarts
+
+    console.print(
+        f"\n[cyan]{supervisor.checks}[/cyan] checks, "
+        f"[cyan]{len(supervisor.history)}[/cyan] recoveries, "
+        f"[cyan]{restarts}[/cyan] restarts"
+    )
+    mttr = supervisor.mean_time_to_recover()
+    if mttr is not None:
+        console.print(f"Mean time to recover: [cyan]{mttr:.1f}s[/cyan]")
+    console.print()
+
+
+def print_history(records):
+    """Print recorded incidents and the mean time to recover"""
+    from rich.table import Table
+
+    if not records:
+        console.print("\n[dim]No restarts recorded[/dim]\n")
+        return
+
+    table = Table(title="Restart History")
+    table.add_column("When")
+    table.add_column("Reason", style="cyan")
+    table.add_column("Detail")
+    table.add_column("Restarts", justify="right")
+    table.add_column("Recovered in", justify="right")
+
+    for record in records:
+        ttr = record.get("time_to_recover")
+        table.add_row(
+            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record["ts"])),
+            record["reason"],
+            record.get("detail", ""),
+            str(record.get("restarts", 0)),
+            "-" if ttr is None else f"{ttr:.1f}s",
+        )
+
+    console.print()
+    console.print(table)
+
+    times = [r["time_to_recover"] for r in records if r.get("time_to_recover")]
+    if times:
+        console.print(
+            f"\nMean time to recover: [cyan]{sum(times) / len(times):.1f}s[/cyan] "
+            f"over {len(times)} incident(s)"
+        )
+    console.print()
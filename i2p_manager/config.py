@@ -3,11 +3,14 @@ Configuration Management
 Handles application configuration with validation
 """
 
+import copy
 import json
 import sys
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from .tracing import traced
+
 
 class ConfigManager:
     """Manages application configuration"""
@@ -19,15 +22,35 @@ class ConfigManager:
             "https_port": 4444,
             "socks_port": 4447,
             "console_port": 7070,
+            "sam_port": 7656,
+            "backend": "auto",
+            "data_dir": "",
+            "log_level": "warn",
         },
         "firefox": {
             "profile_name": "i2p-secure",
             "harden_with_arkenfox": True,
+            "ram_cache": False,
+            "ram_profile": False,
+            "ram_dir": "",
         },
         "dashboard": {
             "refresh_interval": 5,
             "show_welcome": True,
         },
+        "balancer": {
+            "enabled": False,
+            "host": "127.0.0.1",
+            "port": 4440,
+            "health_interval": 10,
+        },
+        "cache": {
+            "enabled": False,
+            "host": "127.0.0.1",
+            "port": 4450,
+            "max_size_mb": 256,
+            "dir": "",
+        },
         "version": "0.1.0",
     }
 
@@ -63,9 +86,10 @@ class ConfigManager:
         with open(config_path, "w") as f:
             json.dump(self.DEFAULT_CONFIG, f, indent=2)
 
-        self._config_cache = self.DEFAULT_CONFIG.copy()
+        self._config_cache = copy.deepcopy(self.DEFAULT_CONFIG)
         return self._config_cache
 
+    @traced("config.load")
     def load(self) -> Dict[str, Any]:
         """Load configuration with caching"""
         if self._config_cache is not None:
@@ -82,9 +106,10 @@ class ConfigManager:
         except Exception:
             pass
 
-        self._config_cache = self.DEFAULT_CONFIG.copy()
+        self._config_cache = copy.deepcopy(self.DEFAULT_CONFIG)
         return self._config_cache
 
+    @traced("config.save")
     def save(self, config: Dict[str, Any]):
         """Save configuration"""
         config_path = self.get_config_path()
@@ -127,7 +152,7 @@ class ConfigManager:
 
     def _merge(self, default: Dict, custom: Dict) -> Dict:
         """Recursively merge configurations"""
-        result = default.copy()
+        result = copy.deepcopy(default)
 
         for key, value in custom.items():
             if (
@@ -140,3 +165,45 @@ class ConfigManager:
                 result[key] = value
 
         return result
+
+
+class InstanceConfig(ConfigManager):
+    """Config view of a named i2pd instance
+
+    Reads like the main config, except that the "i2pd" section is the
+    main one overlaid with the instance's settings from "instances".
+    Instances always use the native backend, each in its own data
+    directory.
+    """
+
+    def __init__(self, parent: ConfigManager, name: str):
+        super().__init__()
+        self.parent = parent
+        self.name = name
+        self.platform = parent.platform
+
+    def get_config_dir(self) -> Path:
+        """Get configuration directory (shared with the main config)"""
+        return self.parent.get_config_dir()
+
+    def load(self) -> Dict[str, Any]:
+        """Load the main config with this instance's i2pd settings"""
+        config = self.parent.load()
+        overrides = config.get("instances", {}).get(self.name)
+        if overrides is None:
+            raise KeyError(f"No such instance: {self.name}")
+
+        i2pd = {
+            **config["i2pd"],
+            "backend": "native",
+            "data_dir": str(self.get_config_dir() / "instances" / self.name),
+            **overrides,
+        }
+        return {**config, "i2pd": i2pd}
+
+    def set(self, key: str, value: Any):
+        """Set a value, storing i2pd settings on the instance"""
+        section, _, rest = key.partition(".")
+        if section == "i2pd" and rest:
+            key = f"instances.{self.name}.{rest}"
+        self.parent.set(key, value)
@@ -0,0 +1,353 @@
+"""
+Manager Daemon
+Long-lived process keeping managers and router status warm for CLI clients
+
+The daemon owns a single StatusPoller and MetricsHistory and serves them
+over a Unix socket, so status queries from the CLI, the dashboard and
+scripts are local reads instead of console round trips.
+
+Protocol: newline-delimited JSON. Each request is {"op": ..., ...params}
+and gets one response line, {"ok": true, "result": ...} or
+{"ok": false, "error": "..."}. A connection may carry any number of
+requests.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import __version__
+
+SOCKET_NAME = "managerd.sock"
+
+# Status older than this is refreshed before answering a status request
+STATUS_MAX_AGE = 10
+
+# How long a request may wait for a refreshed status
+REFRESH_TIMEOUT = 5
+
+
+class DaemonError(Exception):
+    """The daemon answered a request with an error"""
+
+
+def socket_path(config) -> Path:
+    """Get the daemon socket path for a config"""
+    return config.get_config_dir() / SOCKET_NAME
+
+
+def _encode(message: Dict) -> bytes:
+    """Encode a protocol message as one line"""
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+# === Client ===
+
+
+class DaemonClient:
+    """Connection to a running daemon"""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._file = sock.makefile("rb")
+        self._lock = threading.Lock()
+
+    def request(self, op: str, **params) -> Any:
+        """Send a request and return its result"""
+        with self._lock:
+            self.sock.sendall(_encode({"op": op, **params}))
+            line = self._file.readline()
+
+        if not line:
+            raise ConnectionError("Daemon closed the connection")
+
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise DaemonError(response.get("error", "unknown error"))
+        return response.get("result")
+
+    def status(self, max_age: float = STATUS_MAX_AGE) -> Dict:
+        """Get a status snapshot no older than max_age seconds"""
+        return self.request("status", max_age=max_age)
+
+    def get_status(
+        self, console_port: Optional[int] = None, max_age: float = 2
+    ) -> Dict:
+        """Get router status, like I2PdManager.get_status
+
+        Lets a StatusPoller read from the daemon instead of the console.
+        """
+        snapshot = self.status(max_age)
+        if snapshot.get("error"):
+            raise DaemonError(snapshot["error"])
+        return snapshot
+
+    def close(self):
+        """Close the connection"""
+        self._file.close()
+        self.sock.close()
+
+
+def connect(path: Path, timeout: float = 1.0) -> Optional[DaemonClient]:
+    """Connect to the daemon at path, returns None if none is running"""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        # Stale socket left by a daemon that died
+        sock.close()
+        return None
+
+    # Requests may wait for a refresh, allow for that once connected
+    sock.settimeout(REFRESH_TIMEOUT + timeout)
+    return DaemonClient(sock)
+
+
+def get_client(managers) -> Optional[DaemonClient]:
+    """Get the daemon client from managers, if a daemon is running"""
+    try:
+        return managers["daemon"]
+    except KeyError:
+        return None
+
+
+# === Server ===
+
+
+class ManagerDaemon:
+    """Serves warm managers and shared router status over a Unix socket"""
+
+    def __init__(self, managers, path: Path):
+        from .polling import MetricsHistory, PollPolicy, StatusPoller
+
+        self.config = managers["config"]
+        self.i2pd = managers["i2pd"]
+        self.path = Path(path)
+        self.started_at = time.time()
+
+        self.history = MetricsHistory()
+        self.process: Optional[Dict] = None
+        self.poller = StatusPoller(
+            self.i2pd,
+            self.config,
+            on_update=self._on_update,
+            policy=PollPolicy(
+                base_interval=self.config.get("dashboard.refresh_interval", 5)
+            ),
+        )
+
+        self.requests = 0
+        self._updated = threading.Condition()
+        self._server = None
+
+    def _on_update(self, snapshot):
+        """Record a new poller snapshot and wake waiting requests"""
+        if snapshot.error is None:
+            if snapshot.status.get("running"):
+                self.history.add(snapshot.status, snapshot.updated_at)
+            else:
+                self.history.reset_trend()
+            self.process = self.i2pd.get_process_info()
+
+        with self._updated:
+            self._updated.notify_all()
+
+    def _wait_for_poll(self, after_seq: int, timeout: float):
+        """Wait until a snapshot newer than after_seq is published"""
+        deadline = time.monotonic() + timeout
+        with self._updated:
+            while self.poller.snapshot.seq <= after_seq:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                self._updated.wait(remaining)
+
+    # --- Requests ---
+
+    def dispatch(self, request: Dict) -> Any:
+        """Handle one request, returns its result"""
+        handler = getattr(self, f"op_{request.get('op')}", None)
+        if handler is None:
+            raise ValueError(f"Unknown op: {request.get('op')}")
+
+        self.requests += 1
+        params = {k: v for k, v in request.items() if k != "op"}
+        return handler(**params)
+
+    def op_ping(self) -> Dict:
+        """Daemon identity and uptime"""
+        return {
+            "pid": os.getpid(),
+            "version": __version__,
+            "uptime": round(time.time() - self.started_at, 3),
+            "requests": self.requests,
+        }
+
+    def op_status(self, max_age: float = STATUS_MAX_AGE) -> Dict:
+        """Latest status, refreshed first if older than max_age seconds"""
+        from .polling import integration_phase
+
+        snapshot = self.poller.snapshot
+        if snapshot.seq == 0:
+            # The first poll is already in flight
+            self._wait_for_poll(0, REFRESH_TIMEOUT)
+            snapshot = self.poller.snapshot
+        elif not snapshot.updated_at or time.time() - snapshot.updated_at > max_age:
+            self.poller.request_refresh()
+            self._wait_for_poll(snapshot.seq, REFRESH_TIMEOUT)
+            snapshot = self.poller.snapshot
+
+        result = {
+            "ts": round(time.time(), 3),
+            "phase": integration_phase(snapshot.status),
+            "running": False,
+            **snapshot.status,
+            "process": self.process,
+            "age": None,
+        }
+        if snapshot.updated_at:
+            result["age"] = round(time.time() - snapshot.updated_at, 3)
+        if snapshot.error:
+            result["error"] = snapshot.error
+        return result
+
+    def op_history(self) -> Dict:
+        """Recent metric samples and the peer growth trend"""
+        return {
+            "samples": {k: list(v) for k, v in self.history.samples.items()},
+            "peer_rate": self.history.peer_rate(),
+            "eta_to_integrated": self.history.eta_to_integrated(),
+        }
+
+    def op_refresh(self) -> Dict:
+        """Poll now and return the new status"""
+        return self.op_status(max_age=0)
+
+    def op_reload(self) -> Dict:
+        """Re-read the config file"""
+        self.config._config_cache = None
+        self.config.load()
+        self.poller.request_refresh()
+        return {"reloaded": True}
+
+    def op_shutdown(self) -> Dict:
+        """Stop the daemon after answering"""
+        threading.Thread(target=self.shutdown, daemon=True).start()
+        return {"stopping": True}
+
+    # --- Lifecycle ---
+
+    def bind(self):
+        """Create the listening socket, replacing a stale one"""
+        import socketserver
+
+        client = connect(self.path)
+        if client is not None:
+            client.close()
+            raise RuntimeError(f"A daemon is already listening on {self.path}")
+        if self.path.exists():
+            self.path.unlink()
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        result = daemon.dispatch(json.loads(line))
+                        response = {"ok": True, "result": result}
+                    except Exception as e:
+                        response = {"ok": False, "error": str(e)}
+                    self.wfile.write(_encode(response))
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Only the owner may talk to the daemon
+        old_umask = os.umask(0o077)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(
+                str(self.path), Handler
+            )
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_threads = True
+
+    def serve_forever(self):
+        """Poll the router and answer requests until shut down"""
+        if self._server is None:
+            self.bind()
+
+        self.poller.start()
+        try:
+            self._server.serve_forever(poll_interval=0.2)
+        finally:
+            self.poller.stop(timeout=1)
+            self._server.server_close()
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    def start(self):
+        """Serve on a background thread (for tests and embedding)"""
+        self.bind()
+        thread = threading.Thread(
+            target=self.serve_forever, name="managerd", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        """Stop serving"""
+        if self._server is not None:
+            self._server.shutdown()
+
+
+def main(argv=None):
+    """Run the daemon in the foreground (i2p-managerd)"""
+    import argparse
+    import signal
+    import sys
+
+    from .config import ConfigManager
+    from .i2pd import I2PdManager
+
+    parser = argparse.ArgumentParser(
+        prog="i2p-managerd",
+        description="Keep I2P Manager state warm for fast CLI commands",
+    )
+    parser.add_argument("--socket", type=Path, help="Socket path to listen on")
+    args = parser.parse_args(argv)
+
+    config = ConfigManager()
+    managers = {"config": config, "i2pd": I2PdManager(config)}
+    daemon = ManagerDaemon(managers, args.socket or socket_path(config))
+
+    def terminate(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, terminate)
+
+    try:
+        daemon.bind()
+    except RuntimeError as e:
+        print(f"i2p-managerd: {e}", file=sys.stderr)
+        return 1
+
+    print(f"i2p-managerd listening on {daemon.path}", file=sys.stderr)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
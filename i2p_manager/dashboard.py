@@ -3,15 +3,30 @@ Interactive Dashboard UI
 Clean, simple interface for managing I2P
 """
 
+import os
 import time
 import sys
-from rich.console import Console
+import selectors
+import threading
+from contextlib import contextmanager
+from typing import Optional
+from rich.live import Live
 from rich.panel import Panel
 from rich.layout import Layout
 from rich.table import Table
 from rich.text import Text
 
-console = Console()
+from .daemon import get_client
+from .jobs import JobRunner
+from .logtail import LEVEL_STYLES, LogTail
+from .polling import MetricsHistory, PollPolicy, StatusPoller, integration_phase
+from .utils import console
+
+# How often the log pane checks for new lines while it is shown
+LOG_POLL_INTERVAL = 0.5
+
+# Log pane keys -> lowest level shown
+LOG_FILTER_KEYS = {"e": "error", "w": "warn", "i": "info", "d": "debug"}
 
 
 class Dashboard:
@@ -21,21 +36,58 @@ class Dashboard:
         self.firefox = managers["firefox"]
         self.running = True
         self.status_data = None
+        self.stale_since = None
+
+        # Share the manager daemon's poller when one is running
+        self.daemon = get_client(managers)
+        self.poller = StatusPoller(
+            self.daemon or self.i2pd,
+            self.config,
+            on_update=lambda snapshot: self.wake(),
+            policy=PollPolicy(
+                base_interval=self.config.get("dashboard.refresh_interval", 5)
+            ),
+        )
+        self._snapshot_seq = 0
+        self.history = MetricsHistory()
+
+        self.jobs = JobRunner(on_change=self._on_job_change)
+        self.notice = None
+
+        self.logs = LogTail(self.i2pd._get_log_path())
+        self.show_logs = False
+        self.log_level = "info"
+
+        # Set by launch_dashboard
+        self.layout = None
+        self.live = None
+        self.terminal = None
+        self.wakeup = None
+
+        # name -> (inputs, renderable); panels re-render only on new inputs
+        self._panel_cache = {}
 
     def create_layout(self) -> Layout:
-        """Create the dashboard layout"""
+        """Create the dashboard layout
+
+        The header and menu never change, so they are rendered once here.
+        """
         layout = Layout()
 
         layout.split_column(
-            Layout(name="header", size=3),
+            Layout(self.render_header(), name="header", size=3),
             Layout(name="body", ratio=1),
-            Layout(name="footer", size=3),
+            Layout(name="logs", ratio=1, visible=self.show_logs),
+            Layout(name="activity", size=3),
+            Layout(self.render_menu(), name="footer", size=8),
         )
 
         layout["body"].split_row(
             Layout(name="status", ratio=1), Layout(name="network", ratio=1)
         )
 
+        self._panel_cache.clear()
+        self.layout = layout
         return layout
 
     def render_header(self) -> Panel:
@@ -57,18 +109,10 @@ class Dashboard:
         content = Text()
 
         if self.status_data.get("running"):
-            peers = self.status_data.get("peers", 0)
-
             # Determine status color and text
-            if peers < 10:
-                status_color = "yellow"
-                status_text = "● CONNECTING"
-            elif peers < 50:
-                status_color = "yellow"
-                status_text = "● INTEGRATING"
-            else:
-                status_color = "green"
-                status_text = "● CONNECTED"
+            phase = integration_phase(self.status_data)
+            status_color = "green" if phase == "connected" else "yellow"
+            status_text = f"● {phase.upper()}"
 
             content.append("\nStatus: ", style="white")
             content.append(f"{status_text}\n\n", style=status_color)
@@ -93,6 +137,10 @@ class Dashboard:
             content.append("Console: ", style="white")
             content.append("Unavailable", style="dim")
 
+        if self.stale_since:
+            stale_time = time.strftime("%H:%M:%S", time.localtime(self.stale_since))
+            content.append(f"\n\n⚠ Stale since {stale_time}", style="yellow")
+
         return Panel(content, title="Connection Status", border_style="cyan")
 
     def render_network(self) -> Panel:
@@ -108,25 +156,76 @@ class Dashboard:
 
         peers = self.status_data.get("peers", 0)
         tunnels = self.status_data.get("tunnels", 0)
+        bandwidth = self.status_data.get("bandwidth_in", 0) + self.status_data.get(
+            "bandwidth_out", 0
+        )
+        samples = self.history.samples
 
         content = Text()
-        content.append("\nKnown Peers: ", style="white")
-        content.append(f"{peers}\n\n", style="yellow")
-        content.append("Active Tunnels: ", style="white")
-        content.append(f"{tunnels}\n\n", style="yellow")
-
-        if peers < 10:
-            content.append("⚠ Building connections...\n", style="yellow")
-            content.append("(10-30 min on first run)", style="dim")
-        elif peers < 50:
-            content.append("⏳ Integrating...\n", style="yellow")
-            content.append("(May take a few minutes)", style="dim")
+        content.append("\nKnown Peers:    ", style="white")
+        content.append(f"{peers:<12}", style="yellow")
+        content.append(sparkline(samples["peers"]), style="cyan")
+        content.append("\nActive Tunnels: ", style="white")
+        content.append(f"{tunnels:<12}", style="yellow")
+        content.append(sparkline(samples["tunnels"]), style="cyan")
+        content.append("\nBandwidth:      ", style="white")
+        rate_text = f"{bandwidth:.1f} KiB/s"
+        content.append(f"{rate_text:<12}", style="yellow")
+        content.append(sparkline(samples["bandwidth"]), style="cyan")
+        content.append("\n\n")
+
+        phase = integration_phase(self.status_data)
+        if phase in ("connecting", "integrating"):
+            if phase == "connecting":
+                content.append("⚠ Building connections...\n", style="yellow")
+            else:
+                content.append("⏳ Integrating...\n", style="yellow")
+
+            eta = self.history.eta_to_integrated()
+            rate = self.history.peer_rate()
+            if eta is not None:
+                content.append(f"(~{format_duration(eta)} to integrated)", style="dim")
+            elif rate is not None:
+                content.append("(No peer growth, router may be stuck)", style="red")
+            else:
+                content.append("(Estimating time to integrate...)", style="dim")
         else:
             content.append("✓ Fully Integrated\n", style="green")
             content.append("Ready to browse I2P", style="dim")
 
         return Panel(content, title="Network Info", border_style="cyan")
 
+    def render_activity(self) -> Panel:
+        """Render progress and result of the latest action"""
+        content = Text()
+        job = self.jobs.latest()
+
+        if self.notice:
+            content.append(f"⚠ {self.notice}", style="yellow")
+        elif job is None:
+            content.append("No actions yet", style="dim")
+        elif job.state == "running":
+            content.append(f"⟳ {job.name}: ", style="cyan")
+            content.append(job.message or "Working...", style="white")
+        elif job.state == "done":
+            content.append(f"✓ {job.name}: ", style="green")
+            content.append(job.message, style="white")
+        else:
+            content.append(f"✗ {job.name}: ", style="red")
+            content.append(job.message, style="white")
+
+        return Panel(content, title="Activity", border_style="cyan")
+
+    def render_logs(self):
+        """Render the log pane, sized to fit its region"""
+        if self.logs.path is None:
+            return Panel(
+                "[dim]I2Pd log file not found[/dim]",
+                title="Logs",
+                border_style="cyan",
+            )
+        return LogView(self.logs, self.log_level)
+
     def render_menu(self) -> Panel:
         """Render menu options"""
         table = Table.grid(padding=(0, 2))
@@ -136,7 +235,7 @@ class Dashboard:
         table.add_column(style="white")
 
         table.add_row("[1]", "Start I2P", "[5]", "View Configuration")
-        table.add_row("[2]", "Stop I2P", "[6]", "View Logs")
+        table.add_row("[2]", "Stop I2P", "[6]", "Toggle Logs")
         table.add_row("[3]", "Restart I2P", "[7]", "Reset Everything")
         table.add_row("[4]", "Launch Browser", "[8]", "Help & About")
         table.add_row("", "")
@@ -144,20 +243,96 @@ class Dashboard:
 
         return Panel(table, title="Quick Actions", border_style="green")
 
-    def update_display(self, layout: Layout):
-        """Update all dashboard components"""
-        layout["header"].update(self.render_header())
-        layout["body"]["status"].update(self.render_status())
-        layout["body"]["network"].update(self.render_network())
-        layout["footer"].update(Layout(self.render_menu(), size=10))
+    def update_display(self, layout: Layout) -> bool:
+        """Update dashboard panels whose inputs changed
+
+        Returns True if anything needs to be repainted.
+        """
+        status_key = tuple(sorted((self.status_data or {}).items()))
+        cfg = self.config.load()
+        cfg_key = tuple(sorted(cfg["i2pd"].items()))
+
+        job = self.jobs.latest()
+        job_key = (job.name, job.state, job.message) if job else None
+
+        panels = (
+            (
+                layout["body"]["status"],
+                (status_key, cfg_key, self.stale_since),
+                self.render_status,
+            ),
+            (
+                layout["body"]["network"],
+                (status_key, self.history.version),
+                self.render_network,
+            ),
+            (layout["activity"], (job_key, self.notice), self.render_activity),
+        )
+        if self.show_logs:
+            panels += (
+                (
+                    layout["logs"],
+                    (self.logs.version, self.log_level),
+                    self.render_logs,
+                ),
+            )
+
+        changed = False
+        for region, inputs, render in panels:
+            cached = self._panel_cache.get(region.name)
+            if cached is not None and cached[0] == inputs:
+                continue
+
+            panel = render()
+            self._panel_cache[region.name] = (inputs, panel)
+            region.update(panel)
+            changed = True
+
+        return changed
 
     def update_status(self):
-        """Update I2P status data"""
-        try:
-            cfg = self.config.load()
-            self.status_data = self.i2pd.get_status(cfg["i2pd"]["console_port"])
-        except Exception:
-            self.status_data = {"running": False}
+        """Ask the background poller for fresh status"""
+        self.poller.request_refresh()
+
+    def wake(self):
+        """Wake the UI loop to pick up changes from background threads"""
+        if self.wakeup is not None:
+            self.wakeup.notify()
+
+    def next_timeout(self) -> Optional[float]:
+        """Seconds until the view must be re-checked without any event"""
+        timeout = None
+
+        deadline = self.poller.stale_deadline()
+        if deadline is not None:
+            timeout = max(deadline - time.time(), 0) + 0.05
+
+        if self.show_logs:
+            # Log files can't be waited on portably, so poll while shown
+            timeout = min(timeout or LOG_POLL_INTERVAL, LOG_POLL_INTERVAL)
+
+        return timeout
+
+    def apply_snapshot(self):
+        """Pick up the latest status published by the poller"""
+        snapshot = self.poller.snapshot
+
+        if snapshot.seq != self._snapshot_seq:
+            self._snapshot_seq = snapshot.seq
+            if snapshot.updated_at and snapshot.stale_since is None:
+                self.status_data = dict(snapshot.status)
+                if self.status_data.get("running"):
+                    self.history.add(self.status_data, snapshot.updated_at)
+                else:
+                    self.history.reset_trend()
+
+        if self.show_logs:
+            self.logs.poll()
+
+        if self.poller.is_stale():
+            self.stale_since = snapshot.updated_at or None
+        else:
+            self.stale_since = None
 
     def handle_input(self, key: str) -> bool:
         """Handle keyboard input. Returns False if should quit."""
@@ -180,159 +355,411 @@ class Dashboard:
         elif key == "8":
             self.action_help()
         elif key.lower() == "r":
-            pass  # Refresh happens automatically
+            self.update_status()
+        elif self.show_logs and key.lower() in LOG_FILTER_KEYS:
+            self.log_level = LOG_FILTER_KEYS[key.lower()]
 
         return True
 
+    # === Lifecycle Actions (run as background jobs) ===
+
     def action_start(self):
         """Start I2P"""
-        console.clear()
-        console.print("[blue]Starting I2P...[/blue]")
-
-        if self.status_data and self.status_data.get("running"):
-            console.print("[yellow]I2P is already running[/yellow]")
-            time.sleep(2)
-            return
-
-        try:
-            self.i2pd.start()
-            time.sleep(3)
-
-            cfg = self.config.load()
-            self.firefox.launch(cfg["firefox"]["profile_name"])
-
-            console.print("[green]✓ I2P started successfully![/green]")
-            console.print("[green]✓ Firefox launched[/green]")
-            console.print("[yellow]Wait 10-30 minutes for network integration[/yellow]")
-            time.sleep(3)
-        except Exception as e:
-            console.print(f"[red]✗ Error: {e}[/red]")
-            time.sleep(3)
+        self.run_job("Start I2P", self._job_start)
 
     def action_stop(self):
         """Stop I2P"""
-        console.clear()
-        console.print("[blue]Stopping I2P...[/blue]")
-
-        try:
-            self.i2pd.stop()
-            console.print("[green]✓ I2P stopped[/green]")
-            time.sleep(2)
-        except Exception as e:
-            console.print(f"[red]✗ Error: {e}[/red]")
-            time.sleep(3)
+        self.run_job("Stop I2P", self._job_stop)
 
     def action_restart(self):
         """Restart I2P"""
-        self.action_stop()
-        time.sleep(2)
-        self.action_start()
+        self.run_job("Restart I2P", self._job_restart)
 
     def action_browser(self):
         """Launch browser"""
-        console.clear()
-        console.print("[blue]Launching Firefox...[/blue]")
+        self.run_job("Launch Browser", self._job_browser, group="browser")
+
+    def run_job(self, name: str, func, group: str = "lifecycle"):
+        """Run an action in the background, refusing conflicting jobs"""
+        if self.jobs.submit(name, func, group) is None:
+            busy = self.jobs.running(group)[0]
+            self.notice = f"{busy.name} is still running"
+        else:
+            self.notice = None
+
+    def _on_job_change(self, job):
+        """Show job progress and refresh status once a job finishes"""
+        if job.done:
+            self.poller.request_refresh()
+        self.wake()
+
+    def _job_start(self, report) -> str:
+        """Start I2Pd and launch Firefox"""
+        cfg = self.config.load()
+        console_port = cfg["i2pd"]["console_port"]
+
+        if self.i2pd.is_running(console_port):
+            return "I2P is already running"
+
+        report("Starting I2Pd...")
+        self.i2pd.start()
+
+        report("Waiting for router console...")
+        if not self._wait_for_router(console_port, running=True):
+            raise RuntimeError("I2Pd failed to start, check logs")
+
+        report("Launching Firefox...")
+        self.firefox.launch(cfg["firefox"]["profile_name"])
+
+        return "I2P started, Firefox launched (integration takes 10-30 min)"
+
+    def _job_stop(self, report) -> str:
+        """Stop I2Pd"""
+        console_port = self.config.load()["i2pd"]["console_port"]
+
+        report("Stopping I2Pd...")
+        self.i2pd.stop()
+
+        report("Waiting for router to exit...")
+        if not self._wait_for_router(console_port, running=False):
+            return "I2Pd may still be running"
+
+        return "I2P stopped"
+
+    def _job_restart(self, report) -> str:
+        """Stop and start I2Pd"""
+        console_port = self.config.load()["i2pd"]["console_port"]
+
+        report("Stopping I2Pd...")
+        self.i2pd.stop()
+        self._wait_for_router(console_port, running=False)
+
+        report("Starting I2Pd...")
+        self.i2pd.start()
+
+        report("Waiting for router console...")
+        if not self._wait_for_router(console_port, running=True):
+            raise RuntimeError("I2Pd failed to start, check logs")
+
+        return "I2P restarted"
+
+    def _job_browser(self, report) -> str:
+        """Launch Firefox"""
+        cfg = self.config.load()
+
+        report("Launching Firefox...")
+        result = self.firefox.launch(cfg["firefox"]["profile_name"])
+
+        if result["reused"]:
+            return "Firefox already running, opened new window"
+        return "Firefox launched"
+
+    def _wait_for_router(
+        self, console_port: int, running: bool, timeout: float = 15
+    ) -> bool:
+        """Wait until the router console is up (or down)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.i2pd.is_running(console_port) == running:
+                return True
+            time.sleep(0.5)
+        return False
 
+    # === Info Actions (take over the terminal) ===
+
+    @contextmanager
+    def suspend_live(self):
+        """Hand the terminal to an action that prints and reads input"""
+        if self.live is None:
+            yield
+            return
+
+        self.live.stop()
         try:
-            cfg = self.config.load()
-            self.firefox.launch(cfg["firefox"]["profile_name"])
-            console.print("[green]✓ Firefox launched[/green]")
-            time.sleep(2)
-        except Exception as e:
-            console.print(f"[red]✗ Error: {e}[/red]")
-            time.sleep(3)
+            if self.terminal is not None:
+                with self.terminal.cooked():
+                    yield
+            else:
+                yield
+        finally:
+            self.live.start()
+            self.live.refresh()
 
     def action_config(self):
         """Show config location"""
-        console.clear()
-        console.print("[blue]Configuration File:[/blue]")
-        console.print(f"  {self.config.get_config_path()}")
-        console.print("\n[yellow]Edit with: i2p-manager config[/yellow]")
-        input("\nPress Enter to continue...")
+        with self.suspend_live():
+            console.clear()
+            console.print("[blue]Configuration File:[/blue]")
+            console.print(f"  {self.config.get_config_path()}")
+            console.print("\n[yellow]Edit with: i2p-manager config[/yellow]")
+            input("\nPress Enter to continue...")
 
     def action_logs(self):
-        """Show logs info"""
-        console.clear()
-        console.print("[blue]View Logs:[/blue]")
-        console.print("  i2p-manager logs")
-        console.print("  i2p-manager logs -f  (follow)")
-        input("\nPress Enter to continue...")
+        """Toggle the log pane"""
+        self.show_logs = not self.show_logs
+        if self.layout is not None:
+            self.layout["logs"].visible = self.show_logs
+            # Region sizes changed: force a full repaint
+            self._panel_cache.clear()
 
     def action_reset(self):
         """Reset warning"""
-        console.clear()
-        console.print("[red]Reset requires confirmation.[/red]")
-        console.print("[yellow]Use: i2p-manager reset[/yellow]")
-        input("\nPress Enter to continue...")
+        with self.suspend_live():
+            console.clear()
+            console.print("[red]Reset requires confirmation.[/red]")
+            console.print("[yellow]Use: i2p-manager reset[/yellow]")
+            input("\nPress Enter to continue...")
 
     def action_help(self):
         """Show help"""
-        console.clear()
-        console.print("[blue bold]I2P Easy Manager - Help[/blue bold]\n")
-        console.print("[cyan]Dashboard Keys:[/cyan]")
-        console.print("  1-8: Quick actions")
-        console.print("  R: Refresh status")
-        console.print("  Q: Quit dashboard\n")
-        console.print("[cyan]Command-line usage:[/cyan]")
-        console.print("  i2p-manager <command>\n")
-        console.print("[cyan]Resources:[/cyan]")
-        console.print("  Router Console: http://127.0.0.1:7070")
-        console.print("  I2P Forum: http://i2pforum.i2p")
-        console.print("  Planet I2P: http://planet.i2p")
-        input("\nPress Enter to continue...")
+        with self.suspend_live():
+            console.clear()
+            console.print("[blue bold]I2P Easy Manager - Help[/blue bold]\n")
+            console.print("[cyan]Dashboard Keys:[/cyan]")
+            console.print("  1-8: Quick actions")
+            console.print("  E/W/I/D: Log pane level (error/warn/info/debug)")
+            console.print("  R: Refresh status")
+            console.print("  Q: Quit dashboard\n")
+            console.print("[cyan]Command-line usage:[/cyan]")
+            console.print("  i2p-manager <command>\n")
+            console.print("[cyan]Resources:[/cyan]")
+            console.print("  Router Console: http://127.0.0.1:7070")
+            console.print("  I2P Forum: http://i2pforum.i2p")
+            console.print("  Planet I2P: http://planet.i2p")
+            input("\nPress Enter to continue...")
 
 
-def launch_dashboard(managers):
-    """Launch the interactive dashboard"""
-    # Platform-specific imports
-    if sys.platform == "win32":
-        import msvcrt
-    else:
-        import select
+class LogView:
+    """Log pane showing as many of the latest lines as fit its region"""
 
-    dashboard = Dashboard(managers)
+    def __init__(self, logs: LogTail, level: str):
+        self.logs = logs
+        self.level = level
 
-    # Initial status update
-    dashboard.update_status()
+    def __rich_console__(self, console, options):
+        height = (options.height or options.size.height) - 2  # panel borders
+        content = Text(no_wrap=True, overflow="ellipsis")
+        for i, line in enumerate(self.logs.tail(max(height, 1), self.level)):
+            if i:
+                content.append("\n")
+            content.append(line.text, style=LEVEL_STYLES[line.level])
 
-    layout = dashboard.create_layout()
+        title = f"Logs ({self.level}+) [E/W/I/D]"
+        yield Panel(content, title=title, border_style="cyan")
+
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(values, width: int = 24) -> str:
+    """Render the last width values as a unicode sparkline"""
+    values = list(values)[-width:]
+    if not values:
+        return ""
 
-    # For non-blocking keyboard input
-    def get_key():
-        """Get a single keypress"""
+    low = min(values)
+    span = max(values) - low
+    if span == 0:
+        return SPARK_CHARS[0] * len(values)
+
+    scale = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[round((v - low) / span * scale)] for v in values)
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration for display (e.g. 45s, 12 min, 2 h 5 min)"""
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes} min"
+    return f"{minutes // 60} h {minutes % 60} min"
+
+
+class Wakeup:
+    """Lets background threads wake the UI loop (self-pipe on POSIX)"""
+
+    def __init__(self):
         if sys.platform == "win32":
-            if msvcrt.kbhit():
-                return msvcrt.getch().decode("utf-8")
+            self._event = threading.Event()
         else:
-            if select.select([sys.stdin], [], [], 0)[0]:
-                return sys.stdin.read(1)
-        return None
+            self._read_fd, self._write_fd = os.pipe()
+            os.set_blocking(self._read_fd, False)
+            os.set_blocking(self._write_fd, False)
+
+    def fileno(self) -> int:
+        """Readable end of the pipe, for selectors"""
+        return self._read_fd
+
+    def notify(self):
+        """Wake the UI loop (safe from any thread)"""
+        if sys.platform == "win32":
+            self._event.set()
+            return
+
+        try:
+            os.write(self._write_fd, b"\0")
+        except BlockingIOError:
+            pass  # Pipe full: a wakeup is already pending
+
+    def drain(self) -> bool:
+        """Consume pending wakeups, returns True if there were any"""
+        if sys.platform == "win32":
+            woken = self._event.is_set()
+            self._event.clear()
+            return woken
+
+        woken = False
+        try:
+            while os.read(self._read_fd, 4096):
+                woken = True
+        except BlockingIOError:
+            pass
+        return woken
+
+    def close(self):
+        """Close the pipe"""
+        if sys.platform != "win32":
+            os.close(self._read_fd)
+            os.close(self._write_fd)
+
+
+class Terminal:
+    """Keyboard input in cbreak mode, so keys register without Enter"""
+
+    def __init__(self, stream, wakeup: Wakeup):
+        self.stream = stream
+        self.wakeup = wakeup
+        self._saved_mode = None
+        self._selector = None
+
+    def __enter__(self):
+        if sys.platform != "win32":
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self.stream, selectors.EVENT_READ, "keys")
+            self._selector.register(self.wakeup, selectors.EVENT_READ, "wakeup")
+            self._enter_cbreak()
+        return self
+
+    def __exit__(self, *exc):
+        if self._selector is not None:
+            self._restore()
+            self._selector.close()
+
+    @contextmanager
+    def cooked(self):
+        """Temporarily restore normal line-buffered input"""
+        self._restore()
+        try:
+            yield
+        finally:
+            self._enter_cbreak()
+
+    def read_keys(self, timeout: Optional[float]) -> str:
+        """Block until keys arrive, the UI is woken, or timeout expires
+
+        Returns the keys pressed, or an empty string.
+        """
+        if sys.platform == "win32":
+            return self._read_keys_windows(timeout)
+
+        keys = ""
+        for key, _ in self._selector.select(timeout):
+            if key.data == "wakeup":
+                self.wakeup.drain()
+                continue
+
+            data = os.read(self.stream.fileno(), 32)
+            if not data:
+                # stdin closed: stop watching it
+                self._selector.unregister(self.stream)
+            keys += data.decode(errors="ignore")
+
+        return keys
+
+    def _read_keys_windows(self, timeout: Optional[float]) -> str:
+        """Windows consoles can't be select()ed, so poll the keyboard"""
+        import msvcrt
+
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            if msvcrt.kbhit():
+                return msvcrt.getwch()
+            if self.wakeup.drain():
+                return ""
+            if deadline is not None and time.time() >= deadline:
+                return ""
+            time.sleep(0.05)
+
+    def _enter_cbreak(self):
+        """Switch the terminal to cbreak mode"""
+        if self._selector is None or not self.stream.isatty():
+            return
+
+        import termios
+        import tty
+
+        fd = self.stream.fileno()
+        self._saved_mode = termios.tcgetattr(fd)
+        tty.setcbreak(fd)
+
+    def _restore(self):
+        """Restore the terminal mode saved by _enter_cbreak"""
+        if self._saved_mode is None:
+            return
+
+        import termios
+
+        termios.tcsetattr(self.stream.fileno(), termios.TCSADRAIN, self._saved_mode)
+        self._saved_mode = None
+
+
+def launch_dashboard(managers):
+    """Launch the interactive dashboard
+
+    The loop sleeps until a key is pressed, a background poll or job
+    wakes it, or the next timer deadline passes, so an idle dashboard
+    uses no CPU.
+    """
+    dashboard = Dashboard(managers)
+    layout = dashboard.create_layout()
+
+    wakeup = Wakeup()
+    dashboard.wakeup = wakeup
+
+    # Status is fetched in the background so the UI never waits on it
+    dashboard.poller.start()
 
     try:
-        console.clear()
-        last_update = time.time()
+        with Terminal(sys.stdin, wakeup) as terminal, Live(
+            layout, console=console, screen=True, auto_refresh=False
+        ) as live:
+            dashboard.live = live
+            dashboard.terminal = terminal
 
-        while dashboard.running:
-            # Update status every 5 seconds
-            if time.time() - last_update > 5:
-                dashboard.update_status()
-                last_update = time.time()
+            while dashboard.running:
+                dashboard.apply_snapshot()
 
-            # Update display
-            dashboard.update_display(layout)
-            console.clear()
-            console.print(layout)
+                # Repaint only when a panel changed
+                if dashboard.update_display(layout):
+                    live.refresh()
+
+                keys = terminal.read_keys(dashboard.next_timeout())
 
-            # Check for input
-            time.sleep(0.1)
-            key = get_key()
+                if keys.startswith("\x1b"):
+                    continue  # Ignore escape sequences (arrow keys etc.)
 
-            if key:
-                if not dashboard.handle_input(key):
-                    break
+                for key in keys:
+                    if not dashboard.handle_input(key):
+                        dashboard.running = False
+                        break
 
     except KeyboardInterrupt:
         pass
     finally:
-        console.clear()
+        if dashboard.jobs.running():
+            console.print("[dim]Waiting for running actions to finish...[/dim]")
+            dashboard.jobs.wait(timeout=30)
+        dashboard.poller.stop(timeout=1)
+        wakeup.close()
         console.print("[yellow]Dashboard closed[/yellow]")
@@ -0,0 +1,708 @@
+"""
+Fake I2Pd
+Local stand-in for an i2pd router, for offline tests and load generation
+
+Serves web console pages shaped like i2pd's (status, tunnels,
+transports), an optional I2PControl JSON-RPC endpoint and dummy HTTP
+and SOCKS5 proxies whose .i2p "sites" answer locally. Router state follows a script
+of timed phases or is set directly.
+
+Standalone:
+    python -m i2p_manager.fake_i2pd --script starting:5,integrating:60,integrated
+"""
+
+import argparse
+import http.server
+import json
+import random
+import secrets
+import socket
+import socketserver
+import struct
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .polling import INTEGRATED_PEERS
+
+# starting: console answers 503; hung: requests never get an answer;
+# crashed: connections are reset
+STATES = ("starting", "integrating", "integrated", "hung", "crashed")
+
+# How long an unscripted integrating phase takes to reach full peers
+DEFAULT_RAMP = 60.0
+
+# Filler shaped like the webconsole's inline stylesheet, so pages have a
+# realistic size for parsing benchmarks
+STYLESHEET = "\n".join(
+    f".{name} {{ margin: {i % 7}px; padding: {i % 5}px {i % 9}px; "
+    f"color: #{(i * 2654435761) % 0xFFFFFF:06x}; font-size: {10 + i % 6}pt; }}"
+    for i, name in enumerate(
+        f"{part}{n}"
+        for n in range(12)
+        for part in ("header", "wrapper", "menu", "content", "slide", "listitem")
+    )
+)
+
+
+def parse_script(text: str) -> List[Tuple[str, Optional[float]]]:
+    """Parse "starting:5,integrating:60,integrated" into timed phases"""
+    script = []
+    for item in text.split(","):
+        state, _, duration = item.strip().partition(":")
+        if state not in STATES:
+            raise ValueError(f"Unknown state: {state}")
+        script.append((state, float(duration) if duration else None))
+    return script
+
+
+class RouterModel:
+    """Scriptable router state and the metrics it implies
+
+    The script is a list of (state, seconds) phases; the last phase (or
+    one with no duration) lasts forever.
+    """
+
+    def __init__(
+        self,
+        script: Optional[Sequence[Tuple[str, Optional[float]]]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.random = random.Random(seed)
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._set_script(script or [("integrated", None)])
+
+    def _set_script(self, script):
+        """Replace the script, starting its first phase now"""
+        for state, _ in script:
+            if state not in STATES:
+                raise ValueError(f"Unknown state: {state}")
+        with self._lock:
+            self._script = list(script)
+            self._script_start = time.monotonic()
+
+    def set_state(self, state: str):
+        """Switch to a state immediately and stay there"""
+        self._set_script([(state, None)])
+
+    def run_script(self, script: Sequence[Tuple[str, Optional[float]]]):
+        """Start following a new script"""
+        self._set_script(script)
+
+    def phase(self) -> Tuple[str, float, Optional[float]]:
+        """Get the current state, time spent in it and its duration"""
+        with self._lock:
+            elapsed = time.monotonic() - self._script_start
+            for i, (state, duration) in enumerate(self._script):
+                last = i == len(self._script) - 1
+                if duration is None or last or elapsed < duration:
+                    return state, elapsed, duration
+                elapsed -= duration
+        raise AssertionError("empty script")
+
+    @property
+    def state(self) -> str:
+        """Current state"""
+        return self.phase()[0]
+
+    def metrics(self) -> Dict:
+        """Console metrics for the current state"""
+        state, elapsed, duration = self.phase()
+        jitter = self.random.uniform(0.9, 1.1)
+
+        if state == "integrating":
+            progress = min(elapsed / (duration or DEFAULT_RAMP), 1.0)
+            # Stays below the integrated threshold until the phase ends
+            peers = int(progress * (INTEGRATED_PEERS - 1))
+            return {
+                "peers": peers,
+                "floodfills": peers // 6,
+                "tunnels": int(progress * 4),
+                "transit_tunnels": int(progress * 20),
+                "success_rate": int(5 + progress * 25),
+                "network_status": "Testing",
+                "bandwidth_in": round(2.0 * progress * jitter, 2),
+                "bandwidth_out": round(1.5 * progress * jitter, 2),
+                "uptime": int(time.time() - self.started_at),
+            }
+
+        return {
+            "peers": int(2800 * jitter),
+            "floodfills": int(480 * jitter),
+            "tunnels": 12,
+            "transit_tunnels": int(140 * jitter),
+            "success_rate": int(38 * jitter),
+            "network_status": "OK",
+            "bandwidth_in": round(12.4 * jitter, 2),
+            "bandwidth_out": round(14.9 * jitter, 2),
+            "uptime": int(time.time() - self.started_at),
+        }
+
+
+# === Console Pages ===
+
+
+def _page(title: str, body: str) -> str:
+    """Wrap content in the webconsole page layout"""
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n'
+        '  <meta charset="UTF-8">\n'
+        f"  <title>Purple I2P Webconsole</title>\n<style>\n{STYLESHEET}\n</style>\n"
+        '</head>\n<body>\n<div class="header">i2pd webconsole</div>\n'
+        '<div class="wrapper">\n<div class="menu">\n'
+        '  <a href="/">Main page</a><br><br>\n'
+        '  <a href="/?page=local_destinations">Local Destinations</a><br>\n'
+        '  <a href="/?page=tunnels">Tunnels</a><br>\n'
+        '  <a href="/?page=transit_tunnels">Transit Tunnels</a><br>\n'
+        '  <a href="/?page=transports">Transports</a><br>\n'
+        "</div>\n"
+        f'<div class="content">\n<h3>{title}</h3>\n{body}\n</div>\n'
+        "</div>\n</body>\n</html>\n"
+    )
+
+
+def _format_uptime(seconds: int) -> str:
+    """Format uptime the way the console does"""
+    days, rest = divmod(seconds, 86400)
+    hours, rest = divmod(rest, 3600)
+    minutes, seconds = divmod(rest, 60)
+    parts = []
+    if days:
+        parts.append(f"{days} days")
+    if days or hours:
+        parts.append(f"{hours} hours")
+    if days or hours or minutes:
+        parts.append(f"{minutes} minutes")
+    parts.append(f"{seconds} seconds")
+    return ", ".join(parts)
+
+
+def _router_hash(rng: random.Random) -> str:
+    """Short base64 router hash, as shown in tunnel lists"""
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-~"
+    return "".join(rng.choice(alphabet) for _ in range(4))
+
+
+def render_status_page(metrics: Dict) -> str:
+    """Main page: router status"""
+    received = metrics["bandwidth_in"] * metrics["uptime"] / 1024
+    sent = metrics["bandwidth_out"] * metrics["uptime"] / 1024
+    body = (
+        f"<b>Uptime:</b> {_format_uptime(metrics['uptime'])}<br>\n"
+        f"<b>Network status:</b> {metrics['network_status']}<br>\n"
+        "<b>Network status v6:</b> Unknown<br>\n"
+        f"<b>Tunnel creation success rate:</b> {metrics['success_rate']}%<br>\n"
+        f"<b>Received:</b> {received:.2f} MiB ({metrics['bandwidth_in']:.2f} KiB/s)<br>\n"
+        f"<b>Sent:</b> {sent:.2f} MiB ({metrics['bandwidth_out']:.2f} KiB/s)<br>\n"
+        f"<b>Transit:</b> {sent / 2:.2f} MiB ({metrics['bandwidth_out'] / 2:.2f} KiB/s)<br>\n"
+        "<b>Data path:</b> /var/lib/i2pd<br>\n<br>\n"
+        '<div class="slide">\n<label for="slide-info">Hidden content.</label>\n'
+        "<b>Router Ident:</b> 8xbWsPrLKPxtY4xkUE0yTabSk1lMSVo5n4uLw7QMUyU=<br>\n"
+        "<b>Router Family:</b> <br>\n<b>Router Caps:</b> LR<br>\n"
+        "<b>Version:</b> 2.50.2<br>\n</div>\n<br>\n"
+        f"<b>Routers:</b> {metrics['peers']} "
+        f"<b>Floodfills:</b> {metrics['floodfills']} <b>LeaseSets:</b> 0<br>\n"
+        f"<b>Client Tunnels:</b> {metrics['tunnels']} "
+        f"<b>Transit Tunnels:</b> {metrics['transit_tunnels']}<br>\n<br>\n"
+        '<table class="services">\n'
+        "<tr><td>HTTP Proxy</td><td class='enabled'>Enabled</td></tr>\n"
+        "<tr><td>SOCKS Proxy</td><td class='enabled'>Enabled</td></tr>\n"
+        "<tr><td>SAM</td><td class='disabled'>Disabled</td></tr>\n"
+        "<tr><td>I2PControl</td><td class='disabled'>Disabled</td></tr>\n"
+        "</table>"
+    )
+    return _page("Main page", body)
+
+
+def render_tunnels_page(metrics: Dict, rng: random.Random) -> str:
+    """Tunnels page: exploratory and client tunnel lists"""
+    rows = []
+    for direction, arrow in (("Inbound", "&#8658;"), ("Outbound", "&#8658;")):
+        rows.append(f'<b>{direction} tunnels:</b><br>\n<div class="list">')
+        for _ in range(max(metrics["tunnels"], 2)):
+            hops = f" {arrow} ".join(_router_hash(rng) for _ in range(3))
+            latency = rng.randint(150, 2500)
+            rows.append(
+                f'<div class="listitem">{rng.randint(10**8, 10**9)} {hops} '
+                f'<span class="tunnel established"> established</span> '
+                f'<span class="latency">({latency}ms)</span>, '
+                f"{rng.randint(1, 900)} KiB</div>"
+            )
+        rows.append("</div><br>")
+    body = "<b>Queue size:</b> 0<br>\n<br>\n" + "\n".join(rows)
+    return _page("Tunnels", body)
+
+
+def render_transports_page(metrics: Dict, rng: random.Random) -> str:
+    """Transports page: NTCP2 and SSU2 sessions"""
+    sections = []
+    total = max(metrics["peers"] // 30, 1)
+    for name, share in (("NTCP2", 0.6), ("SSU2", 0.4)):
+        count = max(int(total * share), 1)
+        sections.append(
+            f'<div class="slide">\n<label for="slide_{name}"><b>{name}</b> '
+            f'( {count} )</label>\n<div class="slidecontent list">'
+        )
+        for _ in range(count):
+            sections.append(
+                f'<div class="listitem">{_router_hash(rng)}: '
+                f"{rng.randint(1, 223)}.{rng.randint(0, 255)}."
+                f"{rng.randint(0, 255)}.{rng.randint(1, 254)}:"
+                f"{rng.randint(10000, 30000)} "
+                f"[{rng.randint(1, 400)}:{rng.randint(1, 400)}]</div>"
+            )
+        sections.append("</div>\n</div>")
+    return _page("Transports", "\n".join(sections))
+
+
+# === Servers ===
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    """HTTP server with a back-reference to the fake router"""
+
+    daemon_threads = True
+
+    def __init__(self, address, handler, router: "FakeI2pd"):
+        self.router = router
+        super().__init__(address, handler)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Shared request plumbing"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    @property
+    def router(self) -> "FakeI2pd":
+        return self.server.router
+
+    def send_body(
+        self,
+        code: int,
+        body: str,
+        content_type: str = "text/html",
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Send a complete response"""
+        data = body.encode()
+        self.send_response(code)
+        self.send_header("Content-Type", f"{content_type}; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def reset_connection(self):
+        """Drop the connection with a TCP reset, like a dead process"""
+        self.connection.setsockopt(
+            socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+        )
+        self.close_connection = True
+
+    def simulate_faults(self, endpoint: str) -> bool:
+        """Apply state, latency and errors; returns True if handled"""
+        router = self.router
+        router.count(endpoint)
+        state = router.model.state
+
+        if state == "crashed":
+            self.reset_connection()
+            return True
+        if state == "hung":
+            router.closing.wait(router.hang_timeout)
+            self.close_connection = True
+            return True
+
+        if router.latency:
+            time.sleep(router.latency)
+        if router.error_rate and router.model.random.random() < router.error_rate:
+            self.send_body(500, "<b>ERROR:</b> Internal error")
+            return True
+        return False
+
+    def log_message(self, *args):
+        pass
+
+
+class _ConsoleHandler(_Handler):
+    """Router web console"""
+
+    def do_GET(self):
+        if self.simulate_faults("console"):
+            return
+        if self.router.model.state == "starting":
+            self.send_body(503, "Service Unavailable")
+            return
+
+        query = parse_qs(urlsplit(self.path).query)
+        page = query.get("page", [""])[0]
+        metrics = self.router.model.metrics()
+        rng = self.router.model.random
+
+        if not page:
+            self.send_body(200, render_status_page(metrics))
+        elif page == "tunnels":
+            self.send_body(200, render_tunnels_page(metrics, rng))
+        elif page == "transports":
+            self.send_body(200, render_transports_page(metrics, rng))
+        else:
+            self.send_body(400, _page("Error", f"<b>ERROR:</b> Unknown page: {page}"))
+
+
+class _I2PControlHandler(_Handler):
+    """I2PControl JSON-RPC 2.0 endpoint"""
+
+    ROUTER_INFO = {
+        "i2p.router.uptime": lambda m: m["uptime"] * 1000,
+        "i2p.router.version": lambda m: "2.50.2",
+        "i2p.router.net.status": lambda m: 0 if m["network_status"] == "OK" else 1,
+        "i2p.router.net.tunnels.participating": lambda m: m["transit_tunnels"],
+        "i2p.router.netdb.knownpeers": lambda m: m["peers"],
+        "i2p.router.netdb.activepeers": lambda m: m["peers"] // 10,
+        "i2p.router.net.bw.inbound.1s": lambda m: m["bandwidth_in"] * 1024,
+        "i2p.router.net.bw.outbound.1s": lambda m: m["bandwidth_out"] * 1024,
+    }
+
+    def do_POST(self):
+        if self.simulate_faults("i2pcontrol"):
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length))
+            method, params = request["method"], request.get("params", {})
+        except (ValueError, KeyError, TypeError):
+            self.send_rpc(None, error=(-32700, "Parse error"))
+            return
+
+        rpc_id = request.get("id")
+        if method == "Authenticate":
+            if params.get("Password") != self.router.i2pcontrol_password:
+                self.send_rpc(rpc_id, error=(-32004, "Invalid password"))
+                return
+            token = secrets.token_hex(8)
+            self.router.tokens.add(token)
+            self.send_rpc(rpc_id, {"API": 1, "Token": token})
+        elif params.get("Token") not in self.router.tokens:
+            self.send_rpc(rpc_id, error=(-32003, "Token doesn't exist"))
+        elif method == "Echo":
+            self.send_rpc(rpc_id, {"Result": params.get("Echo")})
+        elif method == "RouterInfo":
+            metrics = self.router.model.metrics()
+            result = {
+                key: self.ROUTER_INFO[key](metrics)
+                for key in params
+                if key in self.ROUTER_INFO
+            }
+            self.send_rpc(rpc_id, result)
+        else:
+            self.send_rpc(rpc_id, error=(-32601, "Method not found"))
+
+    def send_rpc(self, rpc_id, result=None, error=None):
+        """Send a JSON-RPC response"""
+        response = {"id": rpc_id, "jsonrpc": "2.0"}
+        if error:
+            response["error"] = {"code": error[0], "message": error[1]}
+        else:
+            response["result"] = result
+        self.send_body(200, json.dumps(response), "application/json")
+
+
+class _ProxyHandler(_Handler):
+    """HTTP proxy where every .i2p host is a local fake eepsite"""
+
+    def do_GET(self):
+        if self.simulate_faults("proxy"):
+            return
+
+        url = urlsplit(self.path)
+        host = url.hostname or self.headers.get("Host", "").split(":")[0]
+
+        if not host.endswith(".i2p"):
+            self.send_body(503, "<b>Outproxy failure:</b> no outproxy configured")
+        elif host in self.router.unreachable:
+            time.sleep(self.router.site_latency)
+            self.send_body(504, "<b>Website is unreachable</b>")
+        else:
+            time.sleep(self.router.site_latency)
+            # Pages never change, so the URL works as a validator
+            etag = '"%08x"' % zlib.crc32(f"{host}{url.path}".encode())
+            headers = {"ETag": etag}
+            if self.router.site_max_age is not None:
+                headers["Cache-Control"] = f"max-age={self.router.site_max_age}"
+
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                return
+
+            head = f"<html><body>{host}{url.path}\n"
+            tail = "</body></html>"
+            filler = "x" * max(self.router.site_size - len(head) - len(tail), 0)
+            self.send_body(200, head + filler + tail, headers=headers)
+
+    def do_CONNECT(self):
+        """Open a "tunnel" that echoes back whatever it receives"""
+        if self.simulate_faults("proxy"):
+            return
+
+        time.sleep(self.router.site_latency)
+        self.send_response(200, "Connection established")
+        self.end_headers()
+        self.wfile.flush()
+
+        self.close_connection = True
+        self.connection.settimeout(self.router.hang_timeout)
+        try:
+            while True:
+                data = self.connection.recv(65536)
+                if not data:
+                    break
+                self.connection.sendall(data)
+        except OSError:
+            pass
+
+
+class _SocksHandler(socketserver.StreamRequestHandler):
+    """SOCKS5 proxy where every .i2p host is a local echo service"""
+
+    disable_nagle_algorithm = True
+
+    @property
+    def router(self) -> "FakeI2pd":
+        return self.server.router
+
+    def reply(self, code: int):
+        """Send a CONNECT reply (0 = succeeded)"""
+        self.wfile.write(b"\x05" + bytes([code]) + b"\x00\x01" + bytes(6))
+
+    def handle(self):
+        router = self.router
+        router.count("socks")
+        try:
+            version, count = self.rfile.read(2)
+            self.rfile.read(count)
+            self.wfile.write(b"\x05\x00")  # no authentication
+
+            _, command, _, address_type = self.rfile.read(4)
+            if address_type == 3:
+                host = self.rfile.read(self.rfile.read(1)[0]).decode()
+            else:
+                self.rfile.read(4 if address_type == 1 else 16)
+                host = ""
+            self.rfile.read(2)  # port
+        except (ValueError, IndexError, OSError):
+            return
+
+        state = router.model.state
+        if state == "crashed":
+            return
+        if state == "hung":
+            router.closing.wait(router.hang_timeout)
+            return
+        if router.latency:
+            time.sleep(router.latency)
+
+        if command != 1:
+            self.reply(7)  # command not supported
+            return
+        if not host.endswith(".i2p") or host in router.unreachable:
+            time.sleep(router.site_latency)
+            self.reply(4)  # host unreachable
+            return
+        if router.error_rate and router.model.random.random() < router.error_rate:
+            self.reply(1)  # general failure
+            return
+
+        time.sleep(router.site_latency)
+        self.reply(0)
+        self.connection.settimeout(router.hang_timeout)
+        try:
+            while True:
+                data = self.connection.recv(65536)
+                if not data:
+                    break
+                self.connection.sendall(data)
+        except OSError:
+            pass
+
+
+class FakeI2pd:
+    """A fake i2pd router listening on local ports
+
+    Ports default to 0 (pick a free port); the proxy, SOCKS and
+    I2PControl endpoints are only started when given a port. Use as a context
+    manager, or call start() and stop().
+    """
+
+    def __init__(
+        self,
+        script: Optional[Sequence[Tuple[str, Optional[float]]]] = None,
+        host: str = "127.0.0.1",
+        console_port: int = 0,
+        proxy_port: Optional[int] = None,
+        socks_port: Optional[int] = None,
+        i2pcontrol_port: Optional[int] = None,
+        i2pcontrol_password: str = "itoopie",
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        site_latency: float = 0.0,
+        site_size: int = 2048,
+        site_max_age: Optional[int] = None,
+        hang_timeout: float = 30.0,
+        seed: Optional[int] = None,
+    ):
+        self.model = RouterModel(script, seed=seed)
+        self.host = host
+        self.latency = latency
+        self.error_rate = error_rate
+        self.site_latency = site_latency
+        self.site_size = site_size
+        self.site_max_age = site_max_age
+        self.hang_timeout = hang_timeout
+        self.i2pcontrol_password = i2pcontrol_password
+        self.unreachable = set()
+        self.tokens = set()
+        self.requests: Dict[str, int] = {}
+        self.closing = threading.Event()
+
+        self._ports = {
+            "console": (console_port, _ConsoleHandler),
+            "proxy": (proxy_port, _ProxyHandler),
+            "socks": (socks_port, _SocksHandler),
+            "i2pcontrol": (i2pcontrol_port, _I2PControlHandler),
+        }
+        self._servers: Dict[str, _Server] = {}
+        self._threads: List[threading.Thread] = []
+        self._count_lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        """Start listening"""
+        self.closing.clear()
+        for name, (port, handler) in self._ports.items():
+            if port is None:
+                continue
+            server = _Server((self.host, port), handler, self)
+            thread = threading.Thread(
+                target=server.serve_forever,
+                kwargs={"poll_interval": 0.1},  # keeps stop() quick
+                name=f"fake-i2pd-{name}",
+                daemon=True,
+            )
+            thread.start()
+            self._servers[name] = server
+            self._threads.append(thread)
+
+    def stop(self):
+        """Stop listening and release hung requests"""
+        self.closing.set()
+        for server in self._servers.values():
+            server.shutdown()
+            server.server_close()
+        self._servers.clear()
+        self._threads.clear()
+
+    def set_state(self, state: str):
+        """Switch the router to a state immediately"""
+        self.model.set_state(state)
+
+    def run_script(self, script: Sequence[Tuple[str, Optional[float]]]):
+        """Follow a new script of timed states"""
+        self.model.run_script(script)
+
+    def count(self, endpoint: str):
+        """Record a request to an endpoint"""
+        with self._count_lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def port(self, name: str) -> Optional[int]:
+        """Bound port of the console, proxy, socks or i2pcontrol endpoint"""
+        server = self._servers.get(name)
+        return server.server_address[1] if server else None
+
+    @property
+    def console_port(self) -> Optional[int]:
+        return self.port("console")
+
+    @property
+    def proxy_port(self) -> Optional[int]:
+        return self.port("proxy")
+
+    @property
+    def socks_port(self) -> Optional[int]:
+        return self.port("socks")
+
+    @property
+    def i2pcontrol_port(self) -> Optional[int]:
+        return self.port("i2pcontrol")
+
+    def configure(self, config):
+        """Point a ConfigManager at this router"""
+        config.set("i2pd.host", self.host)
+        config.set("i2pd.console_port", self.console_port)
+        if self.proxy_port:
+            config.set("i2pd.http_port", self.proxy_port)
+        if self.socks_port:
+            config.set("i2pd.socks_port", self.socks_port)
+
+
+def main(argv=None):
+    """Run a fake router until interrupted"""
+    parser = argparse.ArgumentParser(description="Fake i2pd router")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--console-port", type=int, default=7070)
+    parser.add_argument("--proxy-port", type=int, default=4444)
+    parser.add_argument("--socks-port", type=int, default=4447)
+    parser.add_argument("--i2pcontrol-port", type=int, help="Enable I2PControl")
+    parser.add_argument(
+        "--script",
+        type=parse_script,
+        default=[("integrated", None)],
+        help="Timed states, e.g. starting:5,integrating:60,integrated",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0.0-1.0")
+    parser.add_argument("--site-latency", type=float, default=0.0, help="Seconds")
+    args = parser.parse_args(argv)
+
+    router = FakeI2pd(
+        script=args.script,
+        host=args.host,
+        console_port=args.console_port,
+        proxy_port=args.proxy_port,
+        socks_port=args.socks_port,
+        i2pcontrol_port=args.i2pcontrol_port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        site_latency=args.site_latency,
+    )
+    with router:
+        print(
+            f"Fake i2pd: console http://{args.host}:{router.console_port}, "
+            f"proxy {args.host}:{router.proxy_port}, "
+            f"socks {args.host}:{router.socks_port}"
+        )
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
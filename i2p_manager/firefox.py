@@ -4,11 +4,71 @@ Creates and configures hardened Firefox profiles for I2P
 """
 
 import os
+import re
 import sys
+import json
+import time
+import getpass
+import hashlib
+import sqlite3
+import stat
 import subprocess
 import shutil
+import tempfile
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+from .tracing import traced
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl request for copy-on-write clones (Linux btrfs/xfs/bcachefs)
+FICLONE = 0x40049409
+
+# Files Firefox uses to lock a profile (symlink on Linux, files elsewhere)
+PROFILE_LOCK_FILES = ("lock", ".parentlock", "parent.lock")
+
+# Profile files saved back to disk from a RAM-backed profile
+RAM_PERSISTENT_FILES = (
+    "prefs.js",
+    "places.sqlite",
+    "favicons.sqlite",
+    "cert9.db",
+    "cert_override.txt",
+    "key4.db",
+    "logins.json",
+    "permissions.sqlite",
+    "handlers.json",
+    "xulstore.json",
+    "containers.json",
+)
+
+# Bump when the layout of cached profile templates changes
+TEMPLATE_FORMAT = 2
+
+# Names of the prefs the managed layers wrote into a profile's user.js,
+# so prefs from a layer that was since turned off can be dropped
+MANAGED_PREFS_FILE = "i2p-manager-prefs.json"
+
+MINIMAL_HARDENING = """
+// Minimal I2P Firefox Hardening
+user_pref("privacy.resistFingerprinting", true);
+user_pref("privacy.trackingprotection.enabled", true);
+user_pref("media.peerconnection.enabled", false);
+user_pref("webgl.disabled", true);
+user_pref("geo.enabled", false);
+user_pref("network.dns.disablePrefetch", true);
+user_pref("network.prefetch-next", false);
+user_pref("toolkit.telemetry.enabled", false);
+user_pref("datareporting.healthreport.uploadEnabled", false);
+user_pref("dom.security.https_only_mode", true);
+"""
 
 
 class FirefoxManager:
@@ -17,6 +77,7 @@ class FirefoxManager:
     def __init__(self, config_manager):
         self.config = config_manager
         self.platform = sys.platform
+        self._ram_dirs: Dict[Path, Path] = {}
 
     # === Directory Paths ===
 
@@ -57,121 +118,823 @@ class FirefoxManager:
                 raise FileNotFoundError("Firefox not found in PATH")
             return result
 
+    def get_template_dir(self) -> Path:
+        """Get profile template cache directory
+
+        Kept inside the profiles directory so clones stay on the same
+        filesystem and can share blocks with the template.
+        """
+        return self.get_profiles_dir() / ".i2p-manager-templates"
+
+    def get_profile_path(self, profile_name: str) -> Path:
+        """Get profile directory path"""
+        return self.get_profiles_dir() / f"{profile_name}.default"
+
+    def get_profile_cache_dirs(self, profile_name: str) -> List[Path]:
+        """Get candidate disk cache (cache2) directories for a profile
+
+        Firefox keeps the cache in a separate local directory for profiles
+        under the default profiles root, and in the profile itself otherwise.
+        """
+        home = Path.home()
+        profile_dir = f"{profile_name}.default"
+
+        if self.platform == "darwin":
+            local_root = home / "Library" / "Caches" / "Firefox" / "Profiles"
+        elif self.platform == "win32":
+            local_root = home / "AppData" / "Local" / "Mozilla" / "Firefox" / "Profiles"
+        else:  # Linux
+            local_root = home / ".cache" / "mozilla" / "firefox"
+
+        return [
+            self.get_profile_path(profile_name) / "cache2",
+            local_root / profile_dir / "cache2",
+            self.get_ram_cache_dir(profile_name) / "cache2",
+        ]
+
+    def get_ram_dir(self) -> Path:
+        """Get tmpfs directory for RAM-backed caches and profiles
+
+        The per-user path is predictable, so it is created private to the
+        current user, and used only if it is ours with no access for
+        others; otherwise a fresh private directory stands in for it.
+        """
+        ram_dir = self.config.get("firefox.ram_dir")
+
+        if ram_dir:
+            base = Path(ram_dir)
+        elif Path("/dev/shm").is_dir():
+            base = Path("/dev/shm")
+        else:
+            base = Path(tempfile.gettempdir())
+
+        path = base / f"i2p-manager-{getpass.getuser()}"
+        if path not in self._ram_dirs:
+            self._ram_dirs[path] = _private_dir(path)
+        return self._ram_dirs[path]
+
+    def get_ram_cache_dir(self, profile_name: str) -> Path:
+        """Get RAM-backed disk cache directory for a profile"""
+        return self.get_ram_dir() / "cache" / profile_name
+
+    def get_ram_profile_path(self, profile_name: str) -> Path:
+        """Get RAM-backed copy of a profile"""
+        return self.get_ram_dir() / "profiles" / f"{profile_name}.default"
+
+    def get_active_profile_path(self, profile_name: str) -> Path:
+        """Get the profile directory Firefox runs from (RAM copy if enabled)"""
+        if self.config.get("firefox.ram_profile"):
+            return self.get_ram_profile_path(profile_name)
+        return self.get_profile_path(profile_name)
+
     # === Profile Management ===
 
     def profile_exists(self, profile_name: str) -> bool:
         """Check if profile exists"""
-        profile_path = self.get_profiles_dir() / f"{profile_name}.default"
-        return profile_path.exists()
+        return self.get_profile_path(profile_name).exists()
 
+    @traced("firefox.create_profile")
     def create_profile(self, profile_name: str) -> Dict[str, str]:
-        """Create new Firefox profile"""
-        firefox_exe = self.get_firefox_executable()
-        profiles_dir = self.get_profiles_dir()
-        profiles_dir.mkdir(parents=True, exist_ok=True)
+        """Create new Firefox profile from the cached profile template
+
+        The profile is cloned from a fully configured template (hardening
+        and proxy settings included), so Firefox is never spawned. Files
+        already in the profile that are not part of the template are kept,
+        and an existing user.js is merged rather than replaced, so prefs
+        the user added to it survive.
+        """
+        template_path = self.get_profile_template()
+        profile_path = self.get_profile_path(profile_name)
+
+        if (profile_path / "user.js").exists():
+            _clone_tree(
+                template_path, profile_path, skip=("user.js", MANAGED_PREFS_FILE)
+            )
+            self.write_user_js(str(profile_path))
+        else:
+            _clone_tree(template_path, profile_path)
 
-        profile_path = profiles_dir / f"{profile_name}.default"
+        return {"name": profile_name, "path": str(profile_path)}
 
-        # Create via Firefox CLI
-        try:
-            subprocess.run(
-                [firefox_exe, "-CreateProfile", f"{profile_name} {profile_path}"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                timeout=10,
-            )
-        except Exception:
-            pass  # Profile might exist
+    def get_profile_template(self) -> Path:
+        """Get the profile template for the current config, building it once
 
-        profile_path.mkdir(parents=True, exist_ok=True)
+        Templates are keyed by a hash of their contents, so a config change
+        produces a new template and unchanged configs reuse the cached one.
+        """
+        files = self._render_template_files()
 
-        return {"name": profile_name, "path": str(profile_path)}
+        digest = hashlib.sha256(str(TEMPLATE_FORMAT).encode())
+        for name in sorted(files):
+            digest.update(name.encode() + b"\0" + files[name] + b"\0")
+        key = digest.hexdigest()[:16]
+
+        template_dir = self.get_template_dir()
+        template_path = template_dir / key
+        if template_path.is_dir():
+            return template_path
+
+        template_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=template_dir))
+        try:
+            for name, data in files.items():
+                target = staging / name
+                target.write_bytes(data)
+                if os.name != "nt":
+                    # Templates are shared by every clone: never edit in place
+                    target.chmod(0o444)
+            os.rename(staging, template_path)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not template_path.is_dir():
+                raise
+
+        self._prune_templates(keep=key)
+        return template_path
 
     def delete_profile(self, profile_name: str):
         """Delete Firefox profile"""
-        profile_path = self.get_profiles_dir() / f"{profile_name}.default"
+        profile_path = self.get_profile_path(profile_name)
         if profile_path.exists():
             shutil.rmtree(profile_path)
 
-    # === Configuration ===
+        for ram_path in (
+            self.get_ram_profile_path(profile_name),
+            self.get_ram_cache_dir(profile_name),
+        ):
+            shutil.rmtree(ram_path, ignore_errors=True)
 
-    def apply_hardening(self, profile_path: str):
-        """Apply Arkenfox hardening"""
-        profile_dir = Path(profile_path)
-        user_js = profile_dir / "user.js"
+    # === RAM-backed Profiles ===
 
-        # Get template from package data
-        template_path = Path(__file__).parent / "data" / "user.js"
+    def stage_ram_profile(self, profile_name: str) -> Path:
+        """Copy a profile into RAM for a browsing session
 
-        if template_path.exists():
-            shutil.copy(template_path, user_js)
+        A RAM copy left over from a session that was never synced back is
+        saved to disk first and then reused. The disk cache is not copied.
+        """
+        profile_path = self.get_profile_path(profile_name)
+        ram_path = self.get_ram_profile_path(profile_name)
+
+        if ram_path.exists():
+            self.sync_ram_profile(profile_name)
         else:
-            # Fallback: minimal hardening
-            self._create_minimal_config(user_js)
+            ram_path.parent.mkdir(parents=True, exist_ok=True)
+            profile_path.mkdir(parents=True, exist_ok=True)
+            shutil.copytree(
+                profile_path,
+                ram_path,
+                symlinks=True,
+                ignore=shutil.ignore_patterns("cache2", *PROFILE_LOCK_FILES),
+            )
+
+        # user.js is managed on disk
+        user_js = profile_path / "user.js"
+        if user_js.exists():
+            _clone_file(user_js, ram_path / "user.js")
+
+        return ram_path
+
+    def sync_ram_profile(self, profile_name: str) -> int:
+        """Save the persistent parts of a RAM profile back to disk
+
+        Only prefs, bookmarks/history, certificates, logins and UI state
+        are kept; cookies, sessions and caches stay in RAM. Returns the
+        number of files synced.
+        """
+        profile_path = self.get_profile_path(profile_name)
+        ram_path = self.get_ram_profile_path(profile_name)
+        if not ram_path.is_dir():
+            return 0
+
+        synced = 0
+        for name in RAM_PERSISTENT_FILES:
+            src = ram_path / name
+            if not src.exists():
+                continue
+
+            _sync_file(src, profile_path / name)
+            synced += 1
+
+            if name.endswith(".sqlite"):
+                wal = ram_path / f"{name}-wal"
+                if wal.exists():
+                    _sync_file(wal, profile_path / f"{name}-wal")
+                elif (profile_path / f"{name}-wal").exists():
+                    (profile_path / f"{name}-wal").unlink()
+
+        return synced
+
+    def wait_and_sync(self, profile_name: str, pid: int) -> int:
+        """Wait for a RAM-profile browser to exit, then sync it to disk"""
+        try:
+            psutil.Process(pid).wait()
+        except psutil.NoSuchProcess:
+            pass
+
+        return self.sync_ram_profile(profile_name)
+
+    # === Maintenance ===
+
+    def optimize_profile(
+        self,
+        profile_name: str,
+        max_cache_age_days: float = 7,
+        max_cache_size_mb: float = 256,
+    ) -> Dict:
+        """Compact a profile's SQLite stores and prune its disk cache
+
+        The profile must not be in use. Returns a report with the databases
+        compacted, cache entries removed, bytes reclaimed and the size of
+        startup-relevant data before and after.
+
+        Raises:
+            FileNotFoundError: If the profile doesn't exist
+            RuntimeError: If Firefox is running with the profile
+        """
+        profile_path = self.get_profile_path(profile_name)
+        if not profile_path.exists():
+            raise FileNotFoundError(f"Profile not found: {profile_name}")
+
+        state = self.get_profile_state(profile_name)
+        if state["running"]:
+            raise RuntimeError(
+                f"Firefox is running with this profile (pid {state['pid']}), "
+                "close it first"
+            )
 
-    def configure_proxy(self, profile_path: str):
+        cache_dirs = [
+            path for path in self.get_profile_cache_dirs(profile_name) if path.is_dir()
+        ]
+
+        startup_before = self._startup_size(profile_path, cache_dirs)
+
+        databases = []
+        for db_path in sorted(profile_path.glob("*.sqlite")):
+            before = _sqlite_size(db_path)
+            try:
+                _vacuum_sqlite(db_path)
+            except sqlite3.Error as e:
+                databases.append({"name": db_path.name, "error": str(e)})
+                continue
+            databases.append(
+                {"name": db_path.name, "before": before, "after": _sqlite_size(db_path)}
+            )
+
+        cache_removed = 0
+        cache_bytes = 0
+        for cache_dir in cache_dirs:
+            removed, freed = _prune_cache(
+                cache_dir, max_cache_age_days * 86400, max_cache_size_mb * 1024**2
+            )
+            cache_removed += removed
+            cache_bytes += freed
+
+        startup_after = self._startup_size(profile_path, cache_dirs)
+
+        return {
+            "databases": databases,
+            "cache_entries_removed": cache_removed,
+            "cache_bytes_removed": cache_bytes,
+            "bytes_reclaimed": max(startup_before - startup_after, 0),
+            "startup_bytes_before": startup_before,
+            "startup_bytes_after": startup_after,
+        }
+
+    def _startup_size(self, profile_path: Path, cache_dirs: List[Path]) -> int:
+        """Estimate bytes Firefox touches at startup (SQLite stores + cache)"""
+        total = sum(_sqlite_size(db) for db in profile_path.glob("*.sqlite"))
+        for cache_dir in cache_dirs:
+            total += sum(f.stat().st_size for f in cache_dir.rglob("*") if f.is_file())
+        return total
+
+    # === Configuration ===
+
+    def get_overrides_path(self) -> Path:
+        """Get user pref overrides file (applied on top of everything else)"""
+        return self.config.get_config_dir() / "user-overrides.js"
+
+    def apply_hardening(self, profile_path: str) -> bool:
+        """Apply Arkenfox hardening"""
+        return self.write_user_js(profile_path, harden=True)
+
+    def configure_proxy(self, profile_path: str) -> bool:
         """Configure I2P proxy settings"""
-        profile_dir = Path(profile_path)
-        user_js = profile_dir / "user.js"
-
-        i2pd_config = self.config.load()["i2pd"]
-
-        proxy_config = f"""
-// I2P Proxy Configuration
-user_pref("network.proxy.type", 1);
-user_pref("network.proxy.http", "{i2pd_config['host']}");
-user_pref("network.proxy.http_port", {i2pd_config['http_port']});
-user_pref("network.proxy.ssl", "{i2pd_config['host']}");
-user_pref("network.proxy.ssl_port", {i2pd_config['https_port']});
-user_pref("network.proxy.socks", "{i2pd_config['host']}");
-user_pref("network.proxy.socks_port", {i2pd_config['socks_port']});
-user_pref("network.proxy.socks_version", 5);
-user_pref("network.proxy.no_proxies_on", "");
-user_pref("network.proxy.socks_remote_dns", true);
-user_pref("media.peerconnection.ice.proxy_only", true);
-"""
+        return self.write_user_js(profile_path)
+
+    def write_user_js(self, profile_path: str, harden: Optional[bool] = None) -> bool:
+        """Compile and write a profile's user.js
+
+        Prefs the user added to the profile's user.js are kept, then
+        overridden by the hardening, proxy and user-override layers, in
+        that order. Prefs an earlier run wrote from a layer are dropped,
+        so turning a layer off removes them. Returns False when the file
+        was already up to date.
+        """
+        user_js = Path(profile_path) / "user.js"
+        managed_path = Path(profile_path) / MANAGED_PREFS_FILE
+        existing = user_js.read_bytes() if user_js.exists() else b""
+        existing_managed = managed_path.read_bytes() if managed_path.exists() else b""
+
+        layers = self.managed_prefs(harden)
+        prefs = merge_prefs(
+            layers, parse_prefs(existing.decode()), read_managed(existing_managed)
+        )
+        content = render_prefs(prefs).encode()
+        managed = render_managed(layers).encode()
+
+        if (
+            hashlib.sha256(content).digest() == hashlib.sha256(existing).digest()
+            and managed == existing_managed
+        ):
+            return False
+
+        _atomic_write(user_js, content.decode())
+        _atomic_write(managed_path, managed.decode())
+        return True
+
+    def compile_prefs(
+        self,
+        base: Optional[Dict[str, str]] = None,
+        harden: Optional[bool] = None,
+        managed: Iterable[str] = (),
+    ) -> "OrderedDict[str, str]":
+        """Merge pref layers into one ordered map of name -> JS literal
+
+        Later layers win: base (existing user.js) < hardening < proxy <
+        RAM cache < user overrides. Base prefs named in managed were
+        written by a layer before and are dropped.
+        """
+        return merge_prefs(self.managed_prefs(harden), base or {}, managed)
+
+    def managed_prefs(self, harden: Optional[bool] = None) -> "OrderedDict[str, str]":
+        """Merge the hardening, proxy, RAM cache and user-override layers"""
+        if harden is None:
+            harden = self.config.load()["firefox"]["harden_with_arkenfox"]
+
+        layers = []
+        if harden:
+            layers.append(parse_prefs(self._hardening_config()))
+        layers.append(self._proxy_prefs())
+        layers.append(self._ram_cache_prefs())
+
+        overrides_path = self.get_overrides_path()
+        if overrides_path.exists():
+            layers.append(parse_prefs(overrides_path.read_text()))
+
+        merged = OrderedDict()
+        for layer in layers:
+            merged.update(layer)
+        return merged
+
+    def _hardening_config(self) -> str:
+        """Get hardening prefs from package data"""
+        template_path = Path(__file__).parent / "data" / "user.js"
 
-        with open(user_js, "a") as f:
-            f.write(proxy_config)
+        if template_path.exists():
+            return template_path.read_text()
+
+        # Fallback: minimal hardening
+        return MINIMAL_HARDENING
+
+    def _proxy_prefs(self) -> "OrderedDict[str, str]":
+        """Get I2P proxy prefs for the configured router (or balancer/cache)"""
+        config = self.config.load()
+        i2pd_config = config["i2pd"]
+        host = i2pd_config["host"]
+        http_port = i2pd_config["http_port"]
+        https_port = i2pd_config["https_port"]
+        socks_port = i2pd_config["socks_port"]
+
+        balancer = config.get("balancer", {})
+        if balancer.get("enabled"):
+            # One port serves HTTP, CONNECT and SOCKS5
+            host = balancer["host"]
+            http_port = https_port = socks_port = balancer["port"]
+
+        http_host = host
+        cache = config.get("cache", {})
+        if cache.get("enabled"):
+            # Plain HTTP goes through the cache, HTTPS can't be cached
+            http_host, http_port = cache["host"], cache["port"]
+
+        prefs = [
+            ("network.proxy.type", 1),
+            ("network.proxy.http", http_host),
+            ("network.proxy.http_port", http_port),
+            ("network.proxy.ssl", host),
+            ("network.proxy.ssl_port", https_port),
+            ("network.proxy.socks", host),
+            ("network.proxy.socks_port", socks_port),
+            ("network.proxy.socks_version", 5),
+            ("network.proxy.no_proxies_on", ""),
+            ("network.proxy.socks_remote_dns", True),
+            ("media.peerconnection.ice.proxy_only", True),
+        ]
+        return OrderedDict((name, js_value(value)) for name, value in prefs)
+
+    def _ram_cache_prefs(self) -> "OrderedDict[str, str]":
+        """Get prefs redirecting the disk cache to RAM, if enabled"""
+        cfg = self.config.load()["firefox"]
+        if not cfg.get("ram_cache") or cfg.get("ram_profile"):
+            # A RAM profile already keeps its cache in RAM
+            return OrderedDict()
+
+        cache_dir = self.get_ram_cache_dir(cfg["profile_name"])
+        return OrderedDict(
+            [("browser.cache.disk.parent_directory", js_value(str(cache_dir)))]
+        )
+
+    def _render_template_files(self) -> Dict[str, bytes]:
+        """Render the files of a fully configured profile template"""
+        layers = self.managed_prefs()
+        return {
+            "user.js": render_prefs(layers).encode(),
+            MANAGED_PREFS_FILE: render_managed(layers).encode(),
+        }
+
+    def _prune_templates(self, keep: str):
+        """Remove cached templates other than the current one"""
+        for entry in self.get_template_dir().iterdir():
+            if entry.name != keep and entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
 
     # === Launch ===
 
-    def launch(self, profile_name: str):
-        """Launch Firefox with profile"""
-        firefox_exe = self.get_firefox_executable()
-
-        cmd = [firefox_exe, "-P", profile_name, "-no-remote"]
+    @traced("firefox.launch")
+    def launch(self, profile_name: str) -> Dict:
+        """Launch Firefox with profile, reusing an instance already running it
 
+        Profiles are addressed by path, so they don't need to be registered
+        in Firefox's profiles.ini. Returns a dict with the browser 'pid' (if
+        known) and whether an existing instance was 'reused'.
+        """
+        firefox_exe = self.get_firefox_executable()
+        profile_path = self.get_active_profile_path(profile_name)
+
+        state = self.get_profile_state(profile_name)
+
+        if state["running"]:
+            # Firefox hands this off to the instance owning the profile,
+            # which opens a new window and the spawned process exits
+            self._spawn([firefox_exe, "-profile", str(profile_path)])
+            return {"pid": state["pid"], "reused": True}
+
+        if state["stale_lock"]:
+            self._remove_locks(profile_path)
+
+        if self.config.get("firefox.ram_profile"):
+            self.stage_ram_profile(profile_name)
+
+        # -new-instance (unlike -no-remote) keeps the instance reachable for
+        # later launches of the same profile
+        process = self._spawn(
+            [firefox_exe, "-profile", str(profile_path), "-new-instance"]
+        )
+        return {"pid": process.pid, "reused": False}
+
+    def get_profile_state(self, profile_name: str) -> Dict:
+        """Check whether a Firefox instance is using the profile
+
+        Returns a dict with 'running', the browser 'pid' (or None), and
+        'stale_lock' when lock files were left behind by a crashed session.
+        """
+        profile_path = self.get_active_profile_path(profile_name)
+
+        pid = self._find_profile_process(
+            profile_name,
+            [
+                self.get_profile_path(profile_name),
+                self.get_ram_profile_path(profile_name),
+            ],
+        )
+
+        if pid is None:
+            lock_pid = self._read_lock_pid(profile_path)
+            if lock_pid is not None and self._is_firefox_pid(lock_pid):
+                pid = lock_pid
+
+        locks = [
+            profile_path / name
+            for name in PROFILE_LOCK_FILES
+            if (profile_path / name).is_symlink() or (profile_path / name).exists()
+        ]
+
+        return {
+            "running": pid is not None,
+            "pid": pid,
+            "stale_lock": pid is None and bool(locks),
+        }
+
+    def clear_stale_locks(self, profile_name: str) -> bool:
+        """Remove lock files left by a crashed session
+
+        Does nothing while Firefox is using the profile. Returns True if
+        any lock file was removed.
+        """
+        if not self.get_profile_state(profile_name)["stale_lock"]:
+            return False
+
+        return self._remove_locks(self.get_active_profile_path(profile_name))
+
+    def _remove_locks(self, profile_path: Path) -> bool:
+        """Remove a profile's lock files"""
+        removed = False
+        for name in PROFILE_LOCK_FILES:
+            lock = profile_path / name
+            try:
+                lock.unlink()
+                removed = True
+            except FileNotFoundError:
+                pass
+
+        return removed
+
+    @traced("firefox.spawn")
+    def _spawn(self, cmd) -> subprocess.Popen:
+        """Start a detached Firefox process"""
         if self.platform == "win32":
-            subprocess.Popen(
+            return subprocess.Popen(
                 cmd,
                 creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
             )
-        else:
-            subprocess.Popen(
-                cmd,
-                start_new_session=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
+
+        return subprocess.Popen(
+            cmd,
+            start_new_session=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def _find_profile_process(
+        self, profile_name: str, profile_paths: List[Path]
+    ) -> Optional[int]:
+        """Find the main Firefox process running a profile"""
+        path_strs = {str(path) for path in profile_paths}
+
+        for proc in psutil.process_iter(["pid", "name", "cmdline"]):
+            try:
+                name = (proc.info["name"] or "").lower()
+                cmdline = proc.info["cmdline"] or []
+            except (psutil.Error, KeyError):
+                continue
+
+            if "firefox" not in name or "-contentproc" in cmdline:
+                continue
+
+            for flag, value in zip(cmdline, cmdline[1:]):
+                if flag in ("-profile", "--profile") and value in path_strs:
+                    return proc.info["pid"]
+                if flag in ("-P", "--P") and value == profile_name:
+                    return proc.info["pid"]
+
+        return None
+
+    def _read_lock_pid(self, profile_path: Path) -> Optional[int]:
+        """Read the owner PID from a profile's lock symlink ("host:+pid")"""
+        try:
+            target = os.readlink(profile_path / "lock")
+        except (OSError, AttributeError):
+            return None
+
+        _, _, pid = target.rpartition("+")
+        return int(pid) if pid.isdigit() else None
+
+    def _is_firefox_pid(self, pid: int) -> bool:
+        """Check if a PID belongs to a live Firefox process"""
+        try:
+            return "firefox" in psutil.Process(pid).name().lower()
+        except psutil.Error:
+            return False
 
     # === Helpers ===
 
     def _create_minimal_config(self, user_js_path: Path):
         """Create minimal hardening config if template missing"""
-        config = """
-// Minimal I2P Firefox Hardening
-user_pref("privacy.resistFingerprinting", true);
-user_pref("privacy.trackingprotection.enabled", true);
-user_pref("media.peerconnection.enabled", false);
-user_pref("webgl.disabled", true);
-user_pref("geo.enabled", false);
-user_pref("network.dns.disablePrefetch", true);
-user_pref("network.prefetch-next", false);
-user_pref("toolkit.telemetry.enabled", false);
-user_pref("datareporting.healthreport.uploadEnabled", false);
-user_pref("dom.security.https_only_mode", true);
-"""
-        user_js_path.write_text(config)
+        _atomic_write(user_js_path, MINIMAL_HARDENING)
+
+
+# === Prefs ===
+
+_PREFS_TOKEN_RE = re.compile(
+    r"""
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+  | user_pref\(\s*(?P<name>"(?:[^"\\]|\\.)*")\s*,
+      \s*(?P<value>"(?:[^"\\]|\\.)*"|[^)\s]+)\s*\)\s*;
+  | "(?:[^"\\]|\\.)*"
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+
+def parse_prefs(text: str) -> "OrderedDict[str, str]":
+    """Parse user_pref() calls into an ordered map of name -> JS literal
+
+    Commented-out prefs are ignored. When a pref is set more than once the
+    last value wins, but it keeps the position of its first occurrence.
+    """
+    prefs = OrderedDict()
+
+    for match in _PREFS_TOKEN_RE.finditer(text):
+        if match.group("name") is None:
+            continue
+        name = json.loads(match.group("name"))
+        prefs[name] = match.group("value")
+
+    return prefs
+
+
+def render_prefs(prefs: Dict[str, str]) -> str:
+    """Render a pref map as canonical user.js content"""
+    lines = [
+        "// Generated by I2P Easy Manager (hardening based on arkenfox user.js, MIT)",
+        "// Put your own prefs in user-overrides.js in the config directory",
+    ]
+    for name, value in prefs.items():
+        lines.append(f"user_pref({json.dumps(name)}, {value});")
+
+    return "\n".join(lines) + "\n"
+
+
+def merge_prefs(
+    layers: Dict[str, str], base: Dict[str, str], managed: Iterable[str] = ()
+) -> "OrderedDict[str, str]":
+    """Layer prefs first, then base prefs not set by a layer or in managed"""
+    managed = set(managed)
+    merged = OrderedDict(layers)
+    for name, value in base.items():
+        if name not in managed:
+            merged.setdefault(name, value)
+    return merged
+
+
+def read_managed(data: bytes) -> List[str]:
+    """Parse a MANAGED_PREFS_FILE, an empty list if missing or unreadable"""
+    try:
+        names = json.loads(data) if data else []
+    except ValueError:
+        return []
+    if not isinstance(names, list):
+        return []
+    return [name for name in names if isinstance(name, str)]
+
+
+def render_managed(layers: Dict[str, str]) -> str:
+    """Render the MANAGED_PREFS_FILE for a set of layer prefs"""
+    return json.dumps(sorted(layers), indent=0) + "\n"
+
+
+def js_value(value) -> str:
+    """Convert a Python value to a pref JS literal"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    return json.dumps(str(value))
+
+
+# === Maintenance Helpers ===
+
+
+def _sqlite_size(db_path: Path) -> int:
+    """Size of a SQLite database including its WAL and shared-memory files"""
+    total = 0
+    for suffix in ("", "-wal", "-shm"):
+        path = db_path.with_name(db_path.name + suffix)
+        if path.exists():
+            total += path.stat().st_size
+    return total
+
+
+def _vacuum_sqlite(db_path: Path):
+    """Checkpoint, VACUUM and ANALYZE a SQLite database"""
+    conn = sqlite3.connect(str(db_path), timeout=1)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _prune_cache(cache_dir: Path, max_age: float, max_size: float) -> Tuple[int, int]:
+    """Remove cache2 entries older than max_age seconds, then the oldest
+    entries until the cache fits in max_size bytes
+
+    Returns the number of entries and bytes removed.
+    """
+    entries_dir = cache_dir / "entries"
+    if not entries_dir.is_dir():
+        return 0, 0
+
+    entries = []
+    for entry in entries_dir.iterdir():
+        if entry.is_file():
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry))
+    entries.sort()
+
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    freed = 0
+
+    for mtime, size, entry in entries:
+        if now - mtime <= max_age and total - freed <= max_size:
+            break
+        entry.unlink()
+        removed += 1
+        freed += size
+
+    if removed:
+        # The index no longer matches the entries; Firefox rebuilds it
+        for name in ("index", "index.log"):
+            index = cache_dir / name
+            if index.exists():
+                freed += index.stat().st_size
+                index.unlink()
+        shutil.rmtree(cache_dir / "doomed", ignore_errors=True)
+
+    return removed, freed
+
+
+def _private_dir(path: Path) -> Path:
+    """Create a directory only the current user can access
+
+    An existing directory is used if the current user owns it, after
+    tightening its mode. Anything else at path (another user's directory,
+    a symlink) is left alone and a new directory from mkdtemp is used
+    instead.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if os.name == "nt":
+        path.mkdir(exist_ok=True)
+        return path
+
+    try:
+        path.mkdir(mode=0o700)
+    except FileExistsError:
+        pass
+
+    try:
+        st = os.lstat(path)
+        if stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid():
+            if st.st_mode & 0o077:
+                os.chmod(path, 0o700)
+                st = os.lstat(path)
+            if not st.st_mode & 0o077:
+                return path
+    except OSError:
+        pass
+
+    return Path(tempfile.mkdtemp(prefix=f"{path.name}-", dir=path.parent))
+
+
+def _atomic_write(path: Path, content: str):
+    """Replace a file's content without writing through to other links"""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(content)
+    os.replace(tmp_path, path)
+
+
+def _sync_file(src: Path, dst: Path):
+    """Copy a file over another one atomically"""
+    tmp_path = dst.with_name(f".{dst.name}.tmp")
+    shutil.copy2(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+def _clone_tree(src: Path, dst: Path, skip: Tuple[str, ...] = ()):
+    """Clone a directory tree, sharing file blocks where possible"""
+    dst.mkdir(parents=True, exist_ok=True)
+
+    for entry in src.iterdir():
+        if entry.name in skip:
+            continue
+        target = dst / entry.name
+        if entry.is_dir():
+            _clone_tree(entry, target)
+        else:
+            _clone_file(entry, target)
+
+
+def _clone_file(src: Path, dst: Path):
+    """Copy a file via reflink, else a plain copy
+
+    The copy gets normal permissions for a new file rather than the
+    source's, since templates are read-only.
+    """
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+
+    if fcntl is not None:
+        try:
+            with open(src, "rb") as s, open(dst, "wb") as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            return
+        except OSError:
+            dst.unlink()
+
+    shutil.copyfile(src, dst)
@@ -0,0 +1,131 @@
+"""
+Router Fleet
+Several i2pd instances on one host, managed as one unit
+"""
+
+import re
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import InstanceConfig
+
+# The main router from the "i2pd" config section
+DEFAULT_INSTANCE = "default"
+
+# Port settings every instance needs its own value for
+PORT_KEYS = ("http_port", "socks_port", "console_port", "sam_port")
+
+# New instances take the main ports plus a multiple of this
+PORT_STEP = 10
+
+NAME_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]{0,31}$")
+
+
+def instance_names(config) -> List[str]:
+    """Names of all routers, the main one first"""
+    return [DEFAULT_INSTANCE, *sorted(config.get("instances", {}) or {})]
+
+
+def instance_config(config, name: str):
+    """Config for a router by name"""
+    if name == DEFAULT_INSTANCE:
+        return config
+    return InstanceConfig(config, name)
+
+
+def instance_managers(config, names: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """Managers dict (config and i2pd) for each router"""
+    from .i2pd import I2PdManager
+
+    managers = {}
+    for name in names or instance_names(config):
+        view = instance_config(config, name)
+        managers[name] = {"config": view, "i2pd": I2PdManager(view)}
+    return managers
+
+
+def used_ports(config) -> set:
+    """Ports configured for any router"""
+    ports = set()
+    for name in instance_names(config):
+        i2pd = instance_config(config, name).load()["i2pd"]
+        ports.update(i2pd[key] for key in PORT_KEYS if key in i2pd)
+    return ports
+
+
+def port_is_free(port: int, host: str = "127.0.0.1") -> bool:
+    """Check if nothing on this host listens on a port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind((host, port))
+        except OSError:
+            return False
+    return True
+
+
+def allocate_ports(config, is_free: Callable[[int], bool] = port_is_free) -> Dict:
+    """Pick a port set that no router uses and nothing else listens on
+
+    Tries the main router's ports plus PORT_STEP, 2 * PORT_STEP, ...
+    so related ports stay easy to tell apart.
+    """
+    base = config.load()["i2pd"]
+    taken = used_ports(config)
+
+    for offset in range(PORT_STEP, 65535, PORT_STEP):
+        ports = {key: base[key] + offset for key in PORT_KEYS}
+        if any(port > 65535 for port in ports.values()):
+            break
+        if all(p not in taken and is_free(p) for p in ports.values()):
+            return ports
+
+    raise RuntimeError("No free ports left for another instance")
+
+
+def add_instance(config, name: str, ports: Optional[Dict] = None) -> Dict:
+    """Add a named router, allocating ports if none are given"""
+    if not NAME_PATTERN.match(name) or name == DEFAULT_INSTANCE:
+        raise ValueError(
+            f"Invalid instance name: {name!r} "
+            "(lowercase letters, digits, - and _; not 'default')"
+        )
+    if name in (config.get("instances", {}) or {}):
+        raise ValueError(f"Instance already exists: {name}")
+
+    settings = {**allocate_ports(config), **(ports or {})}
+    config.set(f"instances.{name}", settings)
+    return settings
+
+
+def remove_instance(config, name: str):
+    """Remove a named router from the config (its data is kept)"""
+    instances = dict(config.get("instances", {}) or {})
+    if name not in instances:
+        raise KeyError(f"No such instance: {name}")
+
+    del instances[name]
+    config.set("instances", instances)
+
+
+def run_all(
+    action: Callable[[str, Dict], object],
+    fleet: Dict[str, Dict],
+    max_workers: Optional[int] = None,
+) -> Dict[str, Tuple[bool, object]]:
+    """Run action(name, managers) for every router concurrently
+
+    Returns name -> (ok, result or exception), in fleet order.
+    """
+    if not fleet:
+        return {}
+
+    def attempt(name):
+        try:
+            return True, action(name, fleet[name])
+        except Exception as e:
+            return False, e
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(fleet)) as pool:
+        results = pool.map(attempt, fleet)
+        return dict(zip(fleet, results))
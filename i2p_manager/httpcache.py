@@ -0,0 +1,712 @@
+"""
+HTTP Cache
+Local caching proxy between the browser and the router's HTTP proxy
+
+Follows the HTTP caching rules for a private cache: freshness from
+Cache-Control and Expires (or a heuristic from Last-Modified), Vary,
+and revalidation with If-None-Match / If-Modified-Since. Bodies are
+kept on disk next to a JSON index, and the least recently used entries
+are evicted once the cache grows past its size limit.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .balancer import MAX_HEAD, http_error, pipe
+
+INDEX_NAME = "index.json"
+
+# Statuses that may be cached without explicit freshness (RFC 9110 15.1)
+HEURISTIC_STATUS = {200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501}
+
+# Heuristic lifetime: this fraction of the time since Last-Modified, capped
+HEURISTIC_FRACTION = 0.1
+HEURISTIC_MAX = 24 * 3600
+
+# Largest single response stored, as a fraction of the cache size
+MAX_OBJECT_FRACTION = 0.125
+
+# Headers that only apply to one connection
+HOP_BY_HOP = {
+    "connection",
+    "keep-alive",
+    "proxy-connection",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+}
+
+# Conditional request headers, which only make sense against one copy
+VALIDATORS = {"if-none-match", "if-modified-since"}
+
+# Headers a 304 must not change in the stored response
+KEEP_ON_UPDATE = {"content-length", "content-encoding", "content-range"}
+
+Headers = List[Tuple[str, str]]
+
+
+# === Caching rules ===
+
+
+def get_header(headers: Headers, name: str) -> Optional[str]:
+    """Value of a header (repeated headers are joined with commas)"""
+    values = [v for n, v in headers if n.lower() == name]
+    return ", ".join(values) if values else None
+
+
+def cache_control(headers: Headers) -> Dict[str, object]:
+    """Parse Cache-Control directives (and Pragma: no-cache)"""
+    directives = {}
+    for part in (get_header(headers, "cache-control") or "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') if value else True
+    if "no-cache" in (get_header(headers, "pragma") or "").lower():
+        directives.setdefault("no-cache", True)
+    return directives
+
+
+def _seconds(value) -> Optional[int]:
+    """A delta-seconds directive value, or None if it is not a number"""
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_date(value: Optional[str]) -> Optional[float]:
+    """Parse an HTTP date to a timestamp"""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def freshness_lifetime(status: int, headers: Headers, response_time: float) -> float:
+    """Seconds a response stays fresh after it was generated"""
+    directives = cache_control(headers)
+    max_age = _seconds(directives.get("max-age"))
+    if max_age is not None:
+        return max_age
+
+    date = _parse_date(get_header(headers, "date")) or response_time
+    expires = get_header(headers, "expires")
+    if expires is not None:
+        # An invalid Expires means "already expired"
+        expires_at = _parse_date(expires)
+        return max(expires_at - date, 0) if expires_at else 0
+
+    last_modified = _parse_date(get_header(headers, "last-modified"))
+    if status in HEURISTIC_STATUS and last_modified and last_modified < date:
+        return min((date - last_modified) * HEURISTIC_FRACTION, HEURISTIC_MAX)
+    return 0
+
+
+def current_age(entry: Dict, now: float) -> float:
+    """Age of a stored response in seconds (RFC 9111 4.2.3)"""
+    headers = entry["headers"]
+    date = _parse_date(get_header(headers, "date")) or entry["response_time"]
+    age_value = _seconds(get_header(headers, "age")) or 0
+
+    apparent_age = max(entry["response_time"] - date, 0)
+    response_delay = entry["response_time"] - entry["request_time"]
+    initial_age = max(apparent_age, age_value + response_delay)
+    return initial_age + now - entry["response_time"]
+
+
+def is_storable(status: int, request_headers: Headers, headers: Headers) -> bool:
+    """Check if a response to a GET may be stored"""
+    if "no-store" in cache_control(request_headers):
+        return False
+    directives = cache_control(headers)
+    if "no-store" in directives:
+        return False
+    if (get_header(headers, "vary") or "").strip() == "*":
+        return False
+    if status in HEURISTIC_STATUS:
+        return True
+    # Only complete final responses; others need explicit freshness
+    return (
+        200 <= status < 600
+        and status not in (206, 304)
+        and ("max-age" in directives or get_header(headers, "expires") is not None)
+    )
+
+
+def needs_revalidation(entry: Dict, request_headers: Headers, now: float) -> bool:
+    """Check if a stored response must be validated before use"""
+    if "no-cache" in cache_control(entry["headers"]):
+        return True
+
+    request = cache_control(request_headers)
+    if "no-cache" in request:
+        return True
+
+    age = current_age(entry, now)
+    max_age = _seconds(request.get("max-age"))
+    if max_age is not None and age > max_age:
+        return True
+    return age >= entry["lifetime"]
+
+
+def may_serve_stale(entry: Dict) -> bool:
+    """Check if a stale response may stand in when the origin is unreachable"""
+    directives = cache_control(entry["headers"])
+    return not ("must-revalidate" in directives or "no-cache" in directives)
+
+
+# === Storage ===
+
+
+class DiskCache:
+    """Response store with a JSON index and LRU eviction by total size"""
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.size = 0
+        self.stats = {
+            "hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "stored": 0,
+            "evicted": 0,
+            "bytes_served": 0,
+        }
+        self._dirty = False
+        self.load()
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Storage key for a URL"""
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _body_path(self, key: str) -> Path:
+        return self.path / key[:2] / key
+
+    def load(self):
+        """Read the index, dropping entries whose body is missing"""
+        index_path = self.path / INDEX_NAME
+        try:
+            index = json.loads(index_path.read_text())
+        except (OSError, ValueError):
+            return
+
+        self.stats.update(index.get("stats", {}))
+        for entry in index.get("entries", []):
+            key = self.key(entry["url"])
+            if self._body_path(key).exists():
+                self.entries[key] = entry
+                self.size += entry["size"]
+            else:
+                self._dirty = True
+
+    def flush(self):
+        """Write the index if it changed"""
+        if not self._dirty:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        index_path = self.path / INDEX_NAME
+        tmp = index_path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"entries": list(self.entries.values()), "stats": self.stats})
+        )
+        os.replace(tmp, index_path)
+        self._dirty = False
+
+    def get(self, url: str, request_headers: Headers) -> Optional[Tuple[Dict, bytes]]:
+        """Stored entry and body matching a request, or None"""
+        key = self.key(url)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        for name, value in entry["vary"].items():
+            if get_header(request_headers, name) != value:
+                return None
+
+        try:
+            body = self._body_path(key).read_bytes()
+        except OSError:
+            self.remove(url)
+            return None
+
+        self.entries.move_to_end(key)
+        self._dirty = True
+        return entry, body
+
+    def put(
+        self,
+        url: str,
+        request_headers: Headers,
+        status: int,
+        reason: str,
+        headers: Headers,
+        body: bytes,
+        request_time: float,
+        response_time: float,
+    ) -> bool:
+        """Store a response; returns False if it is too large"""
+        if len(body) > self.max_bytes * MAX_OBJECT_FRACTION:
+            return False
+
+        self.remove(url)
+        key = self.key(url)
+        body_path = self._body_path(key)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = body_path.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, body_path)
+
+        vary = {}
+        for name in (get_header(headers, "vary") or "").split(","):
+            name = name.strip().lower()
+            if name:
+                vary[name] = get_header(request_headers, name)
+
+        self.entries[key] = {
+            "url": url,
+            "status": status,
+            "reason": reason,
+            "headers": headers,
+            "vary": vary,
+            "request_time": request_time,
+            "response_time": response_time,
+            "lifetime": freshness_lifetime(status, headers, response_time),
+            "size": len(body),
+        }
+        self.size += len(body)
+        self.stats["stored"] += 1
+        self._dirty = True
+        self.evict()
+        return True
+
+    def update(self, entry: Dict, headers: Headers, request_time: float, now: float):
+        """Refresh a stored entry from a 304 response"""
+        names = {n.lower() for n, _ in headers} - KEEP_ON_UPDATE
+        entry["headers"] = [
+            (n, v) for n, v in entry["headers"] if n.lower() not in names
+        ] + [(n, v) for n, v in headers if n.lower() in names]
+        entry["request_time"] = request_time
+        entry["response_time"] = now
+        entry["lifetime"] = freshness_lifetime(entry["status"], entry["headers"], now)
+        self._dirty = True
+
+    def remove(self, url: str):
+        """Drop a URL from the cache"""
+        key = self.key(url)
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= entry["size"]
+        self._body_path(key).unlink(missing_ok=True)
+        self._dirty = True
+
+    def evict(self):
+        """Drop least recently used entries until under the size limit"""
+        while self.size > self.max_bytes and self.entries:
+            key, entry = self.entries.popitem(last=False)
+            self.size -= entry["size"]
+            self._body_path(key).unlink(missing_ok=True)
+            self.stats["evicted"] += 1
+            self._dirty = True
+
+    def clear(self) -> int:
+        """Remove every entry; returns how many there were"""
+        count = len(self.entries)
+        for entry in list(self.entries.values()):
+            self.remove(entry["url"])
+        self.flush()
+        return count
+
+    def record(self, stat: str, count: int = 1):
+        """Add to a counter"""
+        self.stats[stat] += count
+        self._dirty = True
+
+    def hit_ratio(self) -> Optional[float]:
+        """Share of cacheable requests answered from the cache"""
+        hits = self.stats["hits"] + self.stats["revalidated"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else None
+
+
+# === Proxy ===
+
+
+def _parse_head(head: bytes) -> Tuple[List[str], Headers]:
+    """Split a request or response head into its first line and headers"""
+    lines = head.decode("latin-1").split("\r\n")
+    headers = []
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers.append((name.strip(), value.strip()))
+    return lines[0].split(" ", 2), headers
+
+
+def _render_head(first_line: str, headers: Headers) -> bytes:
+    lines = [first_line, *(f"{n}: {v}" for n, v in headers), "", ""]
+    return "\r\n".join(lines).encode("latin-1")
+
+
+def _end_to_end(headers: Headers) -> Headers:
+    """Headers without the hop-by-hop ones (including any Connection lists)"""
+    listed = {
+        name.strip().lower()
+        for name in (get_header(headers, "connection") or "").split(",")
+    }
+    return [(n, v) for n, v in headers if n.lower() not in HOP_BY_HOP | listed]
+
+
+def _decode_chunked(raw: bytes) -> bytes:
+    """Decode a chunked body"""
+    body, pos = bytearray(), 0
+    while True:
+        end = raw.index(b"\r\n", pos)
+        size = int(raw[pos:end].split(b";")[0], 16)
+        if size == 0:
+            return bytes(body)
+        body += raw[end + 2 : end + 2 + size]
+        pos = end + 4 + size
+
+
+class CachingProxy:
+    """HTTP proxy that answers repeat requests from a DiskCache
+
+    GET responses are cached; other methods pass through and invalidate
+    the URL. CONNECT is tunnelled unchanged (HTTPS can't be cached).
+    """
+
+    def __init__(
+        self,
+        cache: DiskCache,
+        upstream: Tuple[str, int],
+        host: str = "127.0.0.1",
+        port: int = 4450,
+        timeout: float = 120,
+        flush_interval: float = 5,
+    ):
+        self.cache = cache
+        self.upstream = upstream
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.flush_interval = flush_interval
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start listening"""
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, limit=MAX_HEAD
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._flush_task = asyncio.ensure_future(self._flush_loop())
+
+    async def stop(self):
+        """Stop listening and save the index"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.cache.flush()
+
+    async def _flush_loop(self):
+        """Save the index periodically"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.cache.flush()
+
+    async def _handle(self, reader, writer):
+        """Serve requests on one client connection until it closes"""
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not await self._serve(head, reader, writer):
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve(self, head: bytes, reader, writer) -> bool:
+        """Answer one request; returns True to keep the connection open"""
+        try:
+            (method, target, version), headers = _parse_head(head)
+        except ValueError:
+            writer.write(http_error(400, "Bad Request"))
+            return False
+
+        if method == "CONNECT":
+            await self._tunnel(head, reader, writer)
+            return False
+
+        if get_header(headers, "transfer-encoding"):
+            writer.write(http_error(411, "Length Required"))
+            return False
+        length = _seconds(get_header(headers, "content-length")) or 0
+        body = await reader.readexactly(length) if length else b""
+
+        connection = (get_header(headers, "connection") or "").lower()
+        keep_alive = (
+            "keep-alive" in connection
+            if version == "HTTP/1.0"
+            else "close" not in connection
+        )
+
+        if method != "GET":
+            if method not in ("HEAD", "OPTIONS", "TRACE"):
+                self.cache.remove(target)  # unsafe methods invalidate
+            await self._pass_through(method, target, headers, body, writer)
+            return False
+
+        return await self._get(target, headers, writer, keep_alive)
+
+    async def _get(self, url: str, headers: Headers, writer, keep_alive: bool) -> bool:
+        """Answer a GET from the cache, revalidating or fetching as needed"""
+        cache = self.cache
+        cached = None
+        if "no-store" not in cache_control(headers):
+            cached = cache.get(url, headers)
+
+        now = time.time()
+        if cached and not needs_revalidation(cached[0], headers, now):
+            cache.record("hits")
+            self._send_cached(writer, *cached, headers, keep_alive)
+            return keep_alive
+
+        client_validators = [(n, v) for n, v in headers if n.lower() in VALIDATORS]
+        if client_validators and not cached:
+            # A 304 for the browser's own copy has nothing to store
+            await self._pass_through("GET", url, headers, b"", writer)
+            return False
+
+        # Validate our copy, not the browser's; _send_cached answers the
+        # browser's validators from our copy afterwards
+        conditional = [(n, v) for n, v in headers if n.lower() not in VALIDATORS]
+        if cached:
+            entry = cached[0]
+            etag = get_header(entry["headers"], "etag")
+            last_modified = get_header(entry["headers"], "last-modified")
+            if etag:
+                conditional.append(("If-None-Match", etag))
+            if last_modified:
+                conditional.append(("If-Modified-Since", last_modified))
+
+        request_time = time.time()
+        try:
+            response = await self._fetch("GET", url, conditional, b"")
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            response = None
+
+        if response is None or response[0] >= 500:
+            if cached and may_serve_stale(cached[0]):
+                if response is not None:
+                    response[4].close()
+                cache.record("hits")
+                self._send_cached(writer, *cached, headers, keep_alive)
+                return keep_alive
+            if response is None:
+                writer.write(http_error(502, "I2P proxy unreachable"))
+                return False
+
+        status, reason, response_headers, up_reader, up_writer = response
+        try:
+            if status == 304 and cached:
+                cache.update(cached[0], response_headers, request_time, time.time())
+                cache.record("revalidated")
+                self._send_cached(writer, *cached, headers, keep_alive)
+                return keep_alive
+
+            cache.record("misses")
+            body, complete = await self._read_body(status, response_headers, up_reader)
+            if not complete:
+                # Too large to cache: send what was read, relay the rest
+                response_headers = [
+                    (n, v) for n, v in response_headers if n.lower() != "connection"
+                ] + [("Connection", "close")]
+                writer.write(
+                    _render_head(f"HTTP/1.1 {status} {reason}", response_headers) + body
+                )
+                await pipe(up_reader, writer)
+                return False
+
+            if is_storable(status, headers, response_headers):
+                cache.put(
+                    url,
+                    headers,
+                    status,
+                    reason,
+                    _end_to_end(response_headers),
+                    body,
+                    request_time,
+                    time.time(),
+                )
+            elif cached:
+                cache.remove(url)
+
+            self._send(writer, status, reason, response_headers, body, keep_alive)
+            return keep_alive
+        finally:
+            up_writer.close()
+
+    async def _fetch(self, method: str, url: str, headers: Headers, body: bytes):
+        """Send a request upstream and read the response head
+
+        Returns (status, reason, headers, reader, writer).
+        """
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(*self.upstream), self.timeout
+        )
+        request_headers = _end_to_end(headers) + [("Connection", "close")]
+        if body:
+            request_headers = [
+                (n, v) for n, v in request_headers if n.lower() != "content-length"
+            ] + [("Content-Length", str(len(body)))]
+        writer.write(_render_head(f"{method} {url} HTTP/1.1", request_headers) + body)
+
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.timeout)
+            status_line, response_headers = _parse_head(head)
+            status = int(status_line[1])
+        except (ValueError, IndexError, asyncio.LimitOverrunError):
+            writer.close()
+            raise ConnectionError("Bad response from the I2P proxy")
+        except BaseException:
+            writer.close()
+            raise
+        reason = status_line[2] if len(status_line) > 2 else ""
+        return status, reason, response_headers, reader, writer
+
+    async def _read_body(
+        self, status: int, headers: Headers, reader
+    ) -> Tuple[bytes, bool]:
+        """Read a response body up to the cacheable size
+
+        Returns (body, complete). An incomplete body is the raw bytes read
+        so far; the rest is still waiting in reader.
+        """
+        if status in (204, 304) or status < 200:
+            return b"", True
+        limit = self.cache.max_bytes * MAX_OBJECT_FRACTION
+        length = _seconds(get_header(headers, "content-length"))
+        if length is not None and length > limit:
+            return b"", False
+        if length is not None:
+            body = await asyncio.wait_for(reader.readexactly(length), self.timeout)
+            return body, True
+
+        # The upstream connection is "close", so the body ends at EOF
+        raw = b""
+        while len(raw) <= limit:
+            chunk = await asyncio.wait_for(reader.read(65536), self.timeout)
+            if not chunk:
+                break
+            raw += chunk
+        if len(raw) > limit:
+            return raw, False
+        chunked = "chunked" in (get_header(headers, "transfer-encoding") or "")
+        return (_decode_chunked(raw) if chunked else raw), True
+
+    def _send(self, writer, status, reason, headers, body, keep_alive, age=None):
+        """Write a complete response with a fixed length"""
+        headers = [
+            (n, v)
+            for n, v in _end_to_end(headers)
+            if n.lower() not in ("content-length", "age")
+        ]
+        if age is not None:
+            headers.append(("Age", str(int(age))))
+        headers.append(("Content-Length", str(len(body))))
+        headers.append(("Connection", "keep-alive" if keep_alive else "close"))
+        writer.write(_render_head(f"HTTP/1.1 {status} {reason}", headers) + body)
+
+    def _send_cached(self, writer, entry, body, request_headers, keep_alive):
+        """Answer from a stored entry (304 if the client's copy matches)"""
+        age = current_age(entry, time.time())
+        etag = get_header(entry["headers"], "etag")
+        if etag and get_header(request_headers, "if-none-match") == etag:
+            self._send(writer, 304, "Not Modified", entry["headers"], b"", keep_alive)
+            return
+
+        self.cache.record("bytes_served", len(body))
+        self._send(
+            writer,
+            entry["status"],
+            entry["reason"],
+            entry["headers"],
+            body,
+            keep_alive,
+            age=age,
+        )
+
+    async def _pass_through(self, method, url, headers, body, writer):
+        """Relay a request that is never cached"""
+        try:
+            response = await self._fetch(method, url, headers, body)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            writer.write(http_error(502, "I2P proxy unreachable"))
+            return
+
+        status, reason, response_headers, up_reader, up_writer = response
+        response_headers = [
+            (n, v) for n, v in response_headers if n.lower() != "connection"
+        ] + [("Connection", "close")]
+        writer.write(_render_head(f"HTTP/1.1 {status} {reason}", response_headers))
+        try:
+            await pipe(up_reader, writer)
+        finally:
+            up_writer.close()
+
+    async def _tunnel(self, head: bytes, reader, writer):
+        """Relay a CONNECT request and the tunnel after it"""
+        try:
+            up_reader, up_writer = await asyncio.wait_for(
+                asyncio.open_connection(*self.upstream), self.timeout
+            )
+        except (OSError, asyncio.TimeoutError):
+            writer.write(http_error(502, "I2P proxy unreachable"))
+            return
+
+        up_writer.write(head)
+        try:
+            await asyncio.gather(pipe(reader, up_writer), pipe(up_reader, writer))
+        finally:
+            up_writer.close()
+
+
+def cache_dir(config) -> Path:
+    """Directory holding the HTTP cache"""
+    path = config.get("cache.dir")
+    return Path(path) if path else config.get_config_dir() / "http-cache"
+
+
+def open_cache(config) -> DiskCache:
+    """The configured HTTP cache"""
+    return DiskCache(cache_dir(config), int(config.get("cache.max_size_mb") * 2**20))
+
+
+def upstream_address(config) -> Tuple[str, int]:
+    """Where cache misses go: the balancer if enabled, else the router"""
+    if config.get("balancer.enabled"):
+        return config.get("balancer.host"), config.get("balancer.port")
+    return config.get("i2pd.host"), config.get("i2pd.http_port")
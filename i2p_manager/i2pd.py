@@ -6,10 +6,17 @@ Manages I2Pd router lifecycle across platforms
 import sys
 import subprocess
 import shutil
-import requests
+import threading
+import time
+import psutil
 import re
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+from .tracing import span, traced
+
+if TYPE_CHECKING:
+    import requests
 
 
 class I2PdManager:
@@ -18,6 +25,22 @@ class I2PdManager:
     def __init__(self, config_manager):
         self.config = config_manager
         self.platform = sys.platform
+        self._local = threading.local()
+        self._process: Optional[psutil.Process] = None
+
+    @property
+    def session(self) -> "requests.Session":
+        """HTTP session for the router console, one per thread
+
+        Reusing it keeps the console connection alive between polls.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests  # Slow to import, only needed to reach the console
+
+            session = requests.Session()
+            self._local.session = session
+        return session
 
     # === Status Checks ===
 
@@ -32,30 +55,44 @@ class I2PdManager:
 
         return False
 
+    @traced("i2pd.is_running")
     def is_running(self, console_port: Optional[int] = None) -> bool:
         """Check if I2Pd is running"""
         if console_port is None:
             console_port = self.config.get("i2pd.console_port", 7070)
 
         try:
-            response = requests.get(f"http://127.0.0.1:{console_port}", timeout=2)
+            response = self.session.get(f"http://127.0.0.1:{console_port}", timeout=2)
             return response.status_code == 200
         except Exception:
             return False
 
     # === Daemon Control ===
 
+    @traced("i2pd.start")
     def start(self):
-        """Start I2Pd daemon"""
-        if self.platform == "darwin":
+        """Start I2Pd daemon
+
+        The i2pd.backend setting picks how: "service" uses the system
+        service, "native" spawns i2pd as the current user with its own
+        data directory, and "auto" tries the service first.
+        """
+        if self.get_backend() == "native" or self.platform == "win32":
+            self.start_native()
+        elif self.platform == "darwin":
             self._start_macos()
-        elif self.platform == "win32":
-            self._start_windows()
         else:
             self._start_linux()
 
+    @traced("i2pd.stop")
     def stop(self):
         """Stop I2Pd daemon"""
+        if self.native_pid() is not None:
+            self.stop_native()
+            return
+        if self.get_backend() == "native":
+            return
+
         if self.platform == "darwin":
             self._stop_macos()
         elif self.platform == "win32":
@@ -73,35 +110,65 @@ class I2PdManager:
 
     # === Status Information ===
 
+    @traced("i2pd.get_status")
     def get_status(self, console_port: Optional[int] = None) -> Dict:
         """Get I2Pd status with network stats"""
         if console_port is None:
             console_port = self.config.get("i2pd.console_port", 7070)
 
-        if not self.is_running(console_port):
-            return {"running": False, "tunnels": 0, "peers": 0, "uptime": 0}
-
+        # One request: the console's main page is the status page, and an
+        # unreachable console means the router is down
         try:
-            response = requests.get(
-                f"http://127.0.0.1:{console_port}/?page=status", timeout=5
-            )
+            response = self.session.get(f"http://127.0.0.1:{console_port}/", timeout=5)
+        except Exception:
+            response = None
 
-            if response.status_code == 200:
-                html = response.text
+        if response is None or response.status_code != 200:
+            return {"running": False, "tunnels": 0, "peers": 0, "uptime": 0}
 
-                tunnels = self._extract_stat(html, r"Client Tunnels[^\d]*(\d+)")
-                peers = self._extract_stat(html, r"Known Routers[^\d]*(\d+)")
+        html = response.text
+
+        return {
+            "running": True,
+            "tunnels": self._extract_stat(html, r"Client Tunnels:[^\d]*(\d+)"),
+            "peers": self._extract_stat(html, r"Routers:[^\d]*(\d+)"),
+            "uptime": self._extract_uptime(html),
+            "network_status": self._extract_text(html, "Network status"),
+            # None when the console doesn't show it, rather than 0%
+            "tunnel_success_rate": self._extract_stat(
+                html, r"Tunnel creation success rate:[^\d]*(\d+)", default=None
+            ),
+            "transit_tunnels": self._extract_stat(html, r"Transit Tunnels:[^\d]*(\d+)"),
+            "bandwidth_in": self._extract_rate(html, "Received"),
+            "bandwidth_out": self._extract_rate(html, "Sent"),
+        }
+
+    def get_process_info(self) -> Optional[Dict]:
+        """Get resource usage of the i2pd process, or None if not found
+
+        The process handle is kept between calls, so repeated calls don't
+        rescan the process table and cpu_percent covers the time since
+        the previous call (0.0 on the first).
+        """
+        proc = self._process
+        if proc is None or not proc.is_running():
+            proc = self._find_process()
+            self._process = proc
+            if proc is None:
+                return None
 
+        try:
+            with proc.oneshot():
                 return {
-                    "running": True,
-                    "tunnels": tunnels,
-                    "peers": peers,
-                    "uptime": "unknown",
+                    "pid": proc.pid,
+                    "cpu_percent": proc.cpu_percent(None),
+                    "memory_rss": proc.memory_info().rss,
+                    "threads": proc.num_threads(),
+                    "uptime": int(time.time() - proc.create_time()),
                 }
-        except Exception:
-            pass
-
-        return {"running": True, "tunnels": 0, "peers": 0, "uptime": "unknown"}
+        except psutil.Error:
+            self._process = None
+            return None
 
     def get_logs(self, lines: int = 50) -> str:
         """Get I2Pd log content"""
@@ -125,56 +192,189 @@ class I2PdManager:
         except Exception as e:
             return f"Error reading logs: {e}"
 
-    # === Platform-Specific Start/Stop ===
+    # === Native Backend ===
+
+    def get_backend(self) -> str:
+        """Get the configured launch backend: auto, service or native"""
+        return self.config.get("i2pd.backend", "auto")
+
+    def get_data_dir(self) -> Path:
+        """Get the data directory used by the native backend"""
+        data_dir = self.config.get("i2pd.data_dir")
+        if data_dir:
+            return Path(data_dir).expanduser()
+        return self.config.get_config_dir() / "i2pd"
+
+    def native_conf(self) -> str:
+        """Render i2pd.conf for the native backend from the config"""
+        cfg = self.config.load()["i2pd"]
+        return "\n".join(
+            [
+                "# Generated by i2p-manager on every start, edit its config instead",
+                "daemon = false",
+                "log = stdout",
+                f"loglevel = {cfg.get('log_level', 'warn')}",
+                "",
+                "[http]",
+                "address = 127.0.0.1",
+                f"port = {cfg['console_port']}",
+                "",
+                "[httpproxy]",
+                f"address = {cfg['host']}",
+                f"port = {cfg['http_port']}",
+                "",
+                "[socksproxy]",
+                f"address = {cfg['host']}",
+                f"port = {cfg['socks_port']}",
+                "",
+                "[sam]",
+                "enabled = true",
+                "address = 127.0.0.1",
+                f"port = {cfg.get('sam_port', 7656)}",
+                "",
+            ]
+        )
 
-    def _start_macos(self):
-        """Start I2Pd on macOS via Homebrew"""
+    def native_command(self) -> list:
+        """Build the i2pd command line for the native backend"""
+        executable = shutil.which("i2pd")
+        if executable is None and self.platform == "win32":
+            executable = self._find_i2pd_windows()
+        if executable is None:
+            raise FileNotFoundError("I2Pd not found")
+
+        data_dir = self.get_data_dir()
+        return [
+            executable,
+            f"--datadir={data_dir}",
+            f"--conf={data_dir / 'i2pd.conf'}",
+        ]
+
+    def native_pid(self) -> Optional[int]:
+        """Get the PID of the i2pd started by the native backend, if alive
+
+        The pid file also records the process start time, so a reused
+        PID is not mistaken for i2pd.
+        """
+        pid_path = self.get_data_dir() / "i2pd.pid"
         try:
-            # Try brew
-            subprocess.run(
-                ["brew", "services", "start", "i2pd"],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-        except subprocess.CalledProcessError:
-            # Fallback to manual
-            subprocess.Popen(
-                ["i2pd", "--daemon"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
+            pid, created = pid_path.read_text().split()
+            proc = psutil.Process(int(pid))
+            if abs(proc.create_time() - float(created)) < 1:
+                return proc.pid
+        except (OSError, ValueError, psutil.Error):
+            pass
 
-    def _start_windows(self):
-        """Start I2Pd on Windows"""
-        i2pd_path = self._find_i2pd_windows()
-        if not i2pd_path:
-            raise FileNotFoundError("I2Pd not found")
+        pid_path.unlink(missing_ok=True)
+        return None
+
+    @traced("i2pd.start_native")
+    def start_native(self) -> int:
+        """Spawn i2pd as the current user, returns its PID
+
+        Output goes through i2p_manager.logpipe into a size-rotated
+        i2pd.log in the data directory.
+        """
+        pid = self.native_pid()
+        if pid is not None:
+            return pid
+
+        command = self.native_command()
+        data_dir = self.get_data_dir()
+        data_dir.mkdir(parents=True, exist_ok=True)
+        (data_dir / "i2pd.conf").write_text(self.native_conf())
 
-        subprocess.Popen(
-            [i2pd_path, "--daemon"],
-            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
+        # Detach from our session so i2pd outlives the CLI and its terminal
+        if self.platform == "win32":
+            detach = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            detach = {"start_new_session": True}
+
+        pipe = subprocess.Popen(
+            [sys.executable, "-m", "i2p_manager.logpipe", str(data_dir / "i2pd.log")],
+            stdin=subprocess.PIPE,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
+            **detach,
         )
+        try:
+            with span("i2pd spawn"):
+                proc = subprocess.Popen(
+                    command,
+                    cwd=data_dir,
+                    stdin=subprocess.DEVNULL,
+                    stdout=pipe.stdin,
+                    stderr=subprocess.STDOUT,
+                    **detach,
+                )
+        finally:
+            # The pipe now belongs to i2pd; logpipe exits when i2pd does
+            pipe.stdin.close()
+
+        created = psutil.Process(proc.pid).create_time()
+        (data_dir / "i2pd.pid").write_text(f"{proc.pid} {created}\n")
+        self._process = None
+        return proc.pid
+
+    @traced("i2pd.stop_native")
+    def stop_native(self, timeout: float = 10):
+        """Stop the natively started i2pd, killing it after timeout seconds"""
+        pid = self.native_pid()
+        if pid is None:
+            return
+
+        try:
+            self._terminate(psutil.Process(pid), timeout)
+        except psutil.NoSuchProcess:
+            pass
+
+        (self.get_data_dir() / "i2pd.pid").unlink(missing_ok=True)
+
+    @staticmethod
+    def _terminate(proc: psutil.Process, timeout: float = 10):
+        """Stop a process, killing it after timeout seconds"""
+        # SIGTERM exits at once; SIGINT would wait for transit tunnels
+        proc.terminate()
+        try:
+            proc.wait(timeout)
+        except psutil.TimeoutExpired:
+            proc.kill()
+            proc.wait(timeout)
+
+    # === Platform-Specific Start/Stop ===
+
+    def _start_macos(self):
+        """Start I2Pd on macOS via Homebrew"""
+        try:
+            # Try brew
+            with span("brew services start"):
+                subprocess.run(
+                    ["brew", "services", "start", "i2pd"],
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            if self.get_backend() == "service":
+                raise
+            self.start_native()
 
     def _start_linux(self):
         """Start I2Pd on Linux"""
         try:
-            # Try systemd
-            subprocess.run(
-                ["sudo", "systemctl", "start", "i2pd"],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-        except subprocess.CalledProcessError:
-            # Fallback to manual
-            subprocess.Popen(
-                ["i2pd", "--daemon"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
+            # Try systemd; -n fails instead of prompting for a password
+            with span("systemctl start"):
+                subprocess.run(
+                    ["sudo", "-n", "systemctl", "start", "i2pd"],
+                    check=True,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            if self.get_backend() == "service":
+                raise
+            self.start_native()
 
     def _stop_macos(self):
         """Stop I2Pd on macOS"""
@@ -187,30 +387,51 @@ class I2PdManager:
 
     def _stop_windows(self):
         """Stop I2Pd on Windows"""
-        subprocess.run(
-            ["taskkill", "/F", "/IM", "i2pd.exe"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
+        self._stop_found_process()
 
     def _stop_linux(self):
         """Stop I2Pd on Linux"""
         try:
-            subprocess.run(
-                ["sudo", "systemctl", "stop", "i2pd"],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-        except subprocess.CalledProcessError:
-            subprocess.run(
-                ["pkill", "i2pd"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            with span("systemctl stop"):
+                subprocess.run(
+                    ["sudo", "-n", "systemctl", "stop", "i2pd"],
+                    check=True,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            self._stop_found_process()
+
+    def _stop_found_process(self):
+        """Stop this router's i2pd process, leaving other instances alone"""
+        proc = self._find_process()
+        if proc is None:
+            return
+        try:
+            self._terminate(proc)
+        except psutil.NoSuchProcess:
+            pass
+        except psutil.AccessDenied:
+            hint = (
+                "stop the i2pd service"
+                if self.platform == "win32"
+                else "run: sudo systemctl stop i2pd"
             )
+            raise PermissionError(
+                f"i2pd (PID {proc.pid}) is owned by another user, "
+                f"it runs as a system service; {hint}"
+            ) from None
+        self._process = None
 
     # === Helpers ===
 
     def _get_log_path(self) -> Optional[Path]:
         """Get platform-specific log path"""
+        native_log = self.get_data_dir() / "i2pd.log"
+        if self.get_backend() == "native" or native_log.exists():
+            return native_log
+
         if self.platform == "darwin":
             return Path("/usr/local/var/log/i2pd/i2pd.log")
 
@@ -234,6 +455,65 @@ class I2PdManager:
                     return path
             return None
 
+    def _find_process(self) -> Optional[psutil.Process]:
+        """Find this router's running i2pd process
+
+        Tries the pid file, then an i2pd running in this router's data
+        directory. Only a router not on the native backend (a system
+        service) falls back to any i2pd, and never to one running in the
+        data directory of another configured router.
+        """
+        pid = self.native_pid()
+        if pid is not None:
+            try:
+                return psutil.Process(pid)
+            except psutil.Error:
+                pass
+
+        own = self.get_data_dir().resolve()
+        managed = None
+        fallback = None
+        for proc in psutil.process_iter(["name", "cmdline"]):
+            name = (proc.info["name"] or "").lower()
+            if name not in ("i2pd", "i2pd.exe"):
+                continue
+            dirs = self._cmdline_dirs(proc.info["cmdline"] or [])
+            if own in dirs:
+                return proc
+            if fallback is None and self.get_backend() != "native":
+                if managed is None:
+                    managed = self._managed_data_dirs()
+                if not dirs & managed:
+                    fallback = proc
+        return fallback
+
+    def _managed_data_dirs(self) -> Set[Path]:
+        """Data directories of every configured router"""
+        from .config import InstanceConfig
+        from .fleet import instance_config, instance_names
+
+        main = self.config
+        if isinstance(main, InstanceConfig):
+            main = main.parent
+        return {
+            I2PdManager(instance_config(main, name)).get_data_dir().resolve()
+            for name in instance_names(main)
+        }
+
+    @staticmethod
+    def _cmdline_dirs(cmdline: List[str]) -> Set[Path]:
+        """Directories an i2pd command line names with --datadir or --conf"""
+        dirs = set()
+        for i, arg in enumerate(cmdline):
+            flag, _, value = arg.partition("=")
+            if flag not in ("--datadir", "--conf"):
+                continue
+            if not value and i + 1 < len(cmdline):
+                value = cmdline[i + 1]
+            path = Path(value).expanduser().resolve()
+            dirs.add(path if flag == "--datadir" else path.parent)
+        return dirs
+
     def _find_i2pd_windows(self) -> Optional[str]:
         """Find I2Pd executable on Windows"""
         paths = [
@@ -249,7 +529,35 @@ class I2PdManager:
         result = shutil.which("i2pd")
         return result
 
-    def _extract_stat(self, html: str, pattern: str) -> int:
-        """Extract numeric stat from HTML"""
+    def _extract_stat(
+        self, html: str, pattern: str, default: Optional[int] = 0
+    ) -> Optional[int]:
+        """Extract numeric stat from HTML, default if the console lacks it"""
         match = re.search(pattern, html, re.IGNORECASE)
-        return int(match.group(1)) if match else 0
+        return int(match.group(1)) if match else default
+
+    def _extract_rate(self, html: str, label: str) -> float:
+        """Extract a transfer rate in KiB/s (e.g. "Received: 1 MiB (2.5 KiB/s)")"""
+        match = re.search(
+            label + r"[^(\n]*\(\s*([\d.]+)\s*KiB/s\)", html, re.IGNORECASE
+        )
+        return float(match.group(1)) if match else 0.0
+
+    def _extract_text(self, html: str, label: str) -> Optional[str]:
+        """Extract the text after a label (e.g. "<b>Network status:</b> OK")"""
+        match = re.search(label + r":\s*(?:<[^>]+>\s*)*([^<\n]+)", html, re.IGNORECASE)
+        return match.group(1).strip() if match else None
+
+    def _extract_uptime(self, html: str) -> int:
+        """Extract uptime in seconds (e.g. "Uptime: 1 hours, 2 minutes")"""
+        text = self._extract_text(html, "Uptime")
+        if not text:
+            return 0
+
+        units = {"day": 86400, "hour": 3600, "minute": 60, "second": 1}
+        return sum(
+            int(value) * units[unit.lower()]
+            for value, unit in re.findall(
+                r"(\d+)\s*(day|hour|minute|second)", text, re.I
+            )
+        )
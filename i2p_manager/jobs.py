@@ -0,0 +1,114 @@
+"""
+Background Jobs
+Runs long lifecycle actions on worker threads with progress reporting
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+
+class Job:
+    """A background action and its progress"""
+
+    def __init__(self, name: str, group: str, on_change: Optional[Callable] = None):
+        self.name = name
+        self.group = group
+        self.state = "running"  # running, done, failed
+        self.message = ""
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._on_change = on_change
+
+    @property
+    def done(self) -> bool:
+        """Check if the job has finished"""
+        return self.state != "running"
+
+    def report(self, message: str):
+        """Publish a progress message"""
+        self.message = message
+        if self._on_change is not None:
+            self._on_change(self)
+
+
+class JobRunner:
+    """Runs jobs on worker threads, one job per group at a time
+
+    Jobs in the same group conflict (e.g. start and stop of the router), so
+    submitting while another job of the group is running is refused.
+    """
+
+    def __init__(self, on_change: Optional[Callable[[Job], None]] = None):
+        self.on_change = on_change
+        self.history = deque(maxlen=10)
+        self._active: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        name: str,
+        func: Callable[[Callable[[str], None]], Optional[str]],
+        group: str,
+    ) -> Optional[Job]:
+        """Run func(report) in the background
+
+        func reports progress through the callable it receives and may
+        return a final result message. Returns None if a job of the same
+        group is already running.
+        """
+        with self._lock:
+            if group in self._active:
+                return None
+            job = Job(name, group, self.on_change)
+            self._active[group] = job
+
+        thread = threading.Thread(
+            target=self._run, args=(job, func), name=f"job-{group}", daemon=True
+        )
+        thread.start()
+        self._notify(job)
+        return job
+
+    def running(self, group: Optional[str] = None) -> List[Job]:
+        """Get running jobs, optionally only for one group"""
+        with self._lock:
+            jobs = list(self._active.values())
+        return [job for job in jobs if group is None or job.group == group]
+
+    def latest(self) -> Optional[Job]:
+        """Get the most recently started job, running or finished"""
+        jobs = self.running() + list(self.history)
+        return max(jobs, key=lambda job: job.started_at, default=None)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for all running jobs to finish, returns False on timeout"""
+        deadline = None if timeout is None else time.time() + timeout
+        while self.running():
+            if deadline is not None and time.time() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _run(self, job: Job, func: Callable):
+        """Worker thread body"""
+        try:
+            result = func(job.report)
+            job.state = "done"
+            if result:
+                job.message = result
+        except Exception as e:
+            job.state = "failed"
+            job.message = f"Error: {e}"
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._active.pop(job.group, None)
+                self.history.append(job)
+            self._notify(job)
+
+    def _notify(self, job: Job):
+        """Tell the owner that a job changed"""
+        if self.on_change is not None:
+            self.on_change(job)
@@ -0,0 +1,102 @@
+"""
+Log Pipe
+Copies a process's output into a size-rotated log file
+
+Run as `python -m i2p_manager.logpipe PATH` with the output piped to
+stdin; it exits when the writer closes the pipe.
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+# Rotate at this size, keeping this many old files (PATH.1 ... PATH.N)
+MAX_BYTES = 10 * 1024 * 1024
+BACKUPS = 3
+
+
+class RotatingWriter:
+    """Appends to a log file, rotating it once it grows past max_bytes
+
+    Rotation happens at a line break where the data has one, so lines
+    are rarely split across two files.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = MAX_BYTES, backups: int = BACKUPS):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file: Optional[BinaryIO] = None
+        self._size = 0
+
+    def _open(self):
+        """Open the current log file for appending"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+
+    def rotate(self):
+        """Shift PATH -> PATH.1 -> ... dropping the oldest"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        for i in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{i}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backups > 0 and self.path.exists():
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        elif self.path.exists():
+            self.path.unlink()
+
+    def write(self, data: bytes):
+        """Append data, rotating first if it would overflow the file"""
+        if self._file is None:
+            self._open()
+
+        if self._size and self._size + len(data) > self.max_bytes:
+            # Rotate at the last complete line that still fits
+            cut = data.rfind(b"\n", 0, max(self.max_bytes - self._size, 0)) + 1
+            if cut:
+                self._file.write(data[:cut])
+                data = data[cut:]
+            self.rotate()
+            self._open()
+
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+
+    def close(self):
+        """Close the log file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def main(argv=None):
+    """Copy stdin to a rotating log until EOF"""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 1:
+        print("usage: python -m i2p_manager.logpipe PATH", file=sys.stderr)
+        return 2
+
+    writer = RotatingWriter(Path(args[0]))
+    stdin = sys.stdin.buffer
+    try:
+        while True:
+            chunk = stdin.read1(65536)
+            if not chunk:
+                break
+            writer.write(chunk)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
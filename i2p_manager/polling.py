@@ -0,0 +1,297 @@
+"""
+Status Polling
+Background router status polling shared by interactive views
+"""
+
+import threading
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Callable, Deque, Dict, Mapping, NamedTuple, Optional
+
+
+class StatusSnapshot(NamedTuple):
+    """Immutable router status published by a poller"""
+
+    status: Mapping
+    updated_at: float  # when status was last fetched successfully (0 = never)
+    stale_since: Optional[float]  # first failed poll since the last success
+    error: Optional[str]
+    seq: int  # increases with every published snapshot
+
+
+EMPTY_SNAPSHOT = StatusSnapshot(MappingProxyType({}), 0.0, None, None, 0)
+
+# Known peer counts at which the router stops connecting / is integrated
+CONNECTING_PEERS = 10
+INTEGRATED_PEERS = 50
+
+
+def integration_phase(status: Optional[Mapping]) -> str:
+    """Classify router status as stopped, connecting, integrating or connected"""
+    if not status or not status.get("running"):
+        return "stopped"
+
+    peers = status.get("peers", 0)
+    if peers < CONNECTING_PEERS:
+        return "connecting"
+    if peers < INTEGRATED_PEERS:
+        return "integrating"
+    return "connected"
+
+
+class PollPolicy:
+    """Adaptive polling cadence
+
+    Polls every fast_interval while the router is connecting or
+    integrating. Otherwise polls every base_interval, and once connected
+    backs off exponentially up to max_interval while the metrics stay
+    stable. A phase change or poke() (user action) snaps back to fast
+    polling.
+    """
+
+    # Peer/tunnel changes within this fraction count as stable
+    TOLERANCE = 0.1
+
+    def __init__(
+        self,
+        base_interval: float = 5,
+        fast_interval: float = 2,
+        max_interval: float = 60,
+        backoff: float = 2.0,
+    ):
+        self.base_interval = base_interval
+        self.fast_interval = min(fast_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+        self.backoff = backoff
+
+        self.interval = self.fast_interval
+        self._phase: Optional[str] = None
+        self._metrics: Optional[tuple] = None
+        self._poked = False
+
+    def poke(self):
+        """Poll fast again (e.g. after a user action), at least once"""
+        self.interval = self.fast_interval
+        self._poked = True
+
+    def next_interval(self, status: Optional[Mapping]) -> float:
+        """Get the delay before the next poll, given the latest status"""
+        phase = integration_phase(status)
+        metrics = (status or {}).get("peers", 0), (status or {}).get("tunnels", 0)
+
+        if self._poked or phase in ("connecting", "integrating"):
+            self._poked = False
+            self.interval = self.fast_interval
+        elif phase != self._phase or phase == "stopped":
+            # Probing a stopped router is cheap, keep noticing restarts
+            self.interval = self.base_interval
+        elif self._is_stable(metrics):
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        else:
+            self.interval = self.base_interval
+
+        self._phase = phase
+        self._metrics = metrics
+        return self.interval
+
+    def _is_stable(self, metrics: tuple) -> bool:
+        """Check if metrics changed less than TOLERANCE since the last poll"""
+        if self._metrics is None:
+            return False
+
+        for new, old in zip(metrics, self._metrics):
+            if abs(new - old) > max(old * self.TOLERANCE, 1):
+                return False
+        return True
+
+
+class StatusPoller:
+    """Polls router status on a background thread
+
+    The latest snapshot is published with a single attribute assignment,
+    so readers never block on the poller or the network. Refresh requests
+    made while a poll is pending or in flight are coalesced into one poll.
+    """
+
+    def __init__(
+        self,
+        i2pd,
+        config,
+        interval: Optional[float] = None,
+        on_update: Optional[Callable[[StatusSnapshot], None]] = None,
+        policy: Optional[PollPolicy] = None,
+    ):
+        self.i2pd = i2pd
+        self.config = config
+        self.policy = policy
+        self.on_update = on_update
+
+        if policy is not None:
+            self.interval = policy.interval
+        else:
+            self.interval = interval or config.get("dashboard.refresh_interval", 5)
+
+        self.snapshot = EMPTY_SNAPSHOT
+
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start polling in the background"""
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="status-poller", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop polling (an in-flight request is abandoned, not awaited)"""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def request_refresh(self):
+        """Ask for a poll as soon as possible (and poll fast for a while)"""
+        if self.policy is not None:
+            self.policy.poke()
+        self._wake.set()
+
+    def stale_deadline(self) -> Optional[float]:
+        """Time at which the snapshot goes stale if no new one arrives
+
+        Returns None if it is already stale or nothing was fetched yet.
+        """
+        snapshot = self.snapshot
+        if snapshot.stale_since is not None or not snapshot.updated_at:
+            return None
+        return snapshot.updated_at + self.interval * 2
+
+    def is_stale(self) -> bool:
+        """Check if the published snapshot is out of date"""
+        if self.snapshot.stale_since is not None:
+            return True
+
+        deadline = self.stale_deadline()
+        return deadline is not None and time.time() > deadline
+
+    def poll_once(self) -> StatusSnapshot:
+        """Fetch status and publish a new snapshot"""
+        previous = self.snapshot
+        started = time.time()
+
+        try:
+            console_port = self.config.get("i2pd.console_port", 7070)
+            status = self.i2pd.get_status(console_port)
+        except Exception as e:
+            snapshot = previous._replace(
+                stale_since=previous.stale_since or started,
+                error=str(e),
+                seq=previous.seq + 1,
+            )
+        else:
+            snapshot = StatusSnapshot(
+                MappingProxyType(dict(status)),
+                time.time(),
+                None,
+                None,
+                previous.seq + 1,
+            )
+
+        if self.policy is not None:
+            self.interval = self.policy.next_interval(snapshot.status)
+
+        self.snapshot = snapshot
+        if self.on_update is not None:
+            self.on_update(snapshot)
+
+        return snapshot
+
+    def _run(self):
+        """Poller thread main loop"""
+        while not self._stopped.is_set():
+            self.poll_once()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+class MetricsHistory:
+    """Bounded history of router metrics with a running peer growth trend
+
+    The trend is a least-squares line over the last trend_window peer
+    samples, kept as running sums so each sample costs O(1).
+    """
+
+    METRICS = ("peers", "tunnels", "bandwidth")
+
+    def __init__(self, size: int = 120, trend_window: int = 20):
+        self.samples: Dict[str, Deque[float]] = {
+            name: deque(maxlen=size) for name in self.METRICS
+        }
+        self.version = 0
+        self.trend_window = trend_window
+        self.reset_trend()
+
+    def reset_trend(self):
+        """Forget the peer growth trend (e.g. after the router restarted)"""
+        self._trend: Deque[tuple] = deque()
+        self._t0: Optional[float] = None
+        self._n = 0
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
+
+    def add(self, status: Mapping, timestamp: float):
+        """Record a status sample"""
+        peers = status.get("peers", 0)
+        bandwidth = status.get("bandwidth_in", 0) + status.get("bandwidth_out", 0)
+
+        self.samples["peers"].append(peers)
+        self.samples["tunnels"].append(status.get("tunnels", 0))
+        self.samples["bandwidth"].append(bandwidth)
+        self.version += 1
+
+        if self._t0 is None:
+            self._t0 = timestamp
+        x = timestamp - self._t0
+        self._trend.append((x, peers))
+        self._update_sums(x, peers, 1)
+
+        if len(self._trend) > self.trend_window:
+            old_x, old_y = self._trend.popleft()
+            self._update_sums(old_x, old_y, -1)
+
+    def peer_rate(self) -> Optional[float]:
+        """Peer growth in peers per second, or None without enough data"""
+        if self._n < 3:
+            return None
+
+        denominator = self._n * self._sxx - self._sx * self._sx
+        if denominator <= 0:
+            return None
+        return (self._n * self._sxy - self._sx * self._sy) / denominator
+
+    def eta_to_integrated(self, target: int = INTEGRATED_PEERS) -> Optional[float]:
+        """Estimated seconds until the router has target peers
+
+        Returns 0 once integrated and None if peers aren't growing.
+        """
+        if not self._trend:
+            return None
+
+        current = self._trend[-1][1]
+        if current >= target:
+            return 0.0
+
+        rate = self.peer_rate()
+        if rate is None or rate <= 0:
+            return None
+        return (target - current) / rate
+
+    def _update_sums(self, x: float, y: float, sign: int):
+        """Add (sign=1) or remove (sign=-1) a point from the running sums"""
+        self._n += sign
+        self._sx += sign * x
+        self._sy += sign * y
+        self._sxx += sign * x * x
+        self._sxy += sign * x * y
@@ -0,0 +1,194 @@
+"""
+Eepsite Probe
+Concurrent reachability and latency checks through the HTTP proxy
+
+Each target gets its own deadline covering all attempts. Proxy errors
+(5xx), timeouts and dropped connections are retried with backoff, since
+a first lookup over I2P often fails while the router finds the lease set.
+"""
+
+import asyncio
+import re
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+# b32 addresses are 52 characters, encrypted (b33) ones longer
+B32_PATTERN = re.compile(r"^[a-z2-7]{52,}$")
+
+USER_AGENT = "MYOB/6.66 (AN/ON)"  # what i2pd's proxy sends anyway
+
+
+class ProbeResult(NamedTuple):
+    """Outcome of probing one target"""
+
+    target: str
+    url: str
+    ok: bool
+    status: Optional[int] = None
+    ttfb: Optional[float] = None  # seconds to the first response byte
+    total: Optional[float] = None  # seconds to the end of the body
+    size: int = 0
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+def normalize_target(target: str) -> str:
+    """Turn a URL, .i2p host or bare b32 address into a URL"""
+    target = target.strip()
+    if "://" in target:
+        return target
+    host, _, path = target.partition("/")
+    if B32_PATTERN.match(host.lower()):
+        host = f"{host.lower()}.b32.i2p"
+    return f"http://{host}/{path}"
+
+
+def read_targets(lines: Sequence[str]) -> List[str]:
+    """Targets from a file's lines, skipping blanks and # comments"""
+    targets = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            targets.append(line)
+    return targets
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """q-th percentile (0-100) with linear interpolation"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(results: List[ProbeResult]) -> Dict:
+    """Success count and TTFB/total percentiles over reachable targets"""
+    reachable = [r for r in results if r.ok]
+    summary = {"targets": len(results), "ok": len(reachable)}
+    for field in ("ttfb", "total"):
+        values = [getattr(r, field) for r in reachable]
+        summary[field] = {f"p{q}": percentile(values, q) for q in (50, 90, 99)}
+    return summary
+
+
+async def fetch(url: str, proxy: Tuple[str, int], timeout: float) -> Tuple:
+    """GET a URL through an HTTP proxy
+
+    Returns (status, ttfb, total, size), timed from opening the proxy
+    connection.
+    """
+    started = time.perf_counter()
+
+    async def attempt():
+        reader, writer = await asyncio.open_connection(*proxy)
+        try:
+            host = urlsplit(url).netloc
+            writer.write(
+                f"GET {url} HTTP/1.1\r\nHost: {host}\r\n"
+                f"User-Agent: {USER_AGENT}\r\nAccept: */*\r\n"
+                "Connection: close\r\n\r\n".encode()
+            )
+            first = await reader.readexactly(1)
+            ttfb = time.perf_counter() - started
+            head = first + await reader.readuntil(b"\r\n\r\n")
+            size = 0
+            while True:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                size += len(chunk)
+        finally:
+            writer.close()
+
+        try:
+            status = int(head.split(b" ", 2)[1])
+        except (IndexError, ValueError):
+            raise ConnectionError("bad response from proxy")
+        return status, ttfb, time.perf_counter() - started, size
+
+    return await asyncio.wait_for(attempt(), timeout)
+
+
+def _describe(error: BaseException) -> str:
+    """Short failure reason for an exception"""
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(error, ConnectionRefusedError):
+        return "proxy refused connection"
+    if isinstance(error, asyncio.IncompleteReadError):
+        return "connection closed early"
+    return str(error) or type(error).__name__
+
+
+async def probe_target(
+    target: str,
+    proxy: Tuple[str, int],
+    deadline: float = 60,
+    retries: int = 2,
+    retry_delay: float = 1.0,
+) -> ProbeResult:
+    """Probe one target, retrying failures until its deadline"""
+    url = normalize_target(target)
+    give_up_at = time.monotonic() + deadline
+    attempts = 0
+    error = "deadline exceeded"
+    status = None
+
+    while attempts <= retries:
+        remaining = give_up_at - time.monotonic()
+        if remaining <= 0:
+            break
+        attempts += 1
+        try:
+            status, ttfb, total, size = await fetch(url, proxy, remaining)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            error = _describe(e)
+        else:
+            if status < 500:
+                return ProbeResult(
+                    target, url, True, status, ttfb, total, size, attempts
+                )
+            error = f"HTTP {status}"
+
+        delay = retry_delay * 2 ** (attempts - 1)
+        if attempts <= retries and time.monotonic() + delay < give_up_at:
+            await asyncio.sleep(delay)
+        else:
+            break
+
+    return ProbeResult(target, url, False, status, attempts=attempts, error=error)
+
+
+async def probe_all(
+    targets: Sequence[str],
+    proxy: Tuple[str, int],
+    concurrency: int = 8,
+    on_result: Optional[Callable[[ProbeResult], None]] = None,
+    **options,
+) -> List[ProbeResult]:
+    """Probe targets concurrently, at most `concurrency` at a time
+
+    Results are returned in target order; on_result sees each one as it
+    finishes.
+    """
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(target):
+        async with limit:
+            result = await probe_target(target, proxy, **options)
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    return list(await asyncio.gather(*(one(t) for t in targets)))
+
+
+def probe(
+    targets: Sequence[str], proxy: Tuple[str, int], **options
+) -> List[ProbeResult]:
+    """Probe targets concurrently (blocking)"""
+    return asyncio.run(probe_all(targets, proxy, **options))
@@ -0,0 +1,328 @@
+"""
+Router Supervisor
+Watches i2pd health and restarts it with backoff when it dies or hangs
+"""
+
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional
+
+from .tracing import traced
+
+# Failure reasons, and how many consecutive failed checks trigger a restart.
+# A dead router is restarted at once; a hung or degraded one gets a few
+# chances, since every restart costs re-integration time.
+FAILURE_CHECKS = {
+    "down": 1,  # no i2pd process
+    "unresponsive": 3,  # process alive, console not answering
+    "degraded": 30,  # tunnel creation success rate stays too low
+}
+
+DEFAULT_SETTINGS = {
+    "check_interval": 10,
+    "min_success_rate": 5,
+    "integration_grace": 900,
+    "start_timeout": 90,
+    "backoff_base": 10,
+    "backoff_max": 600,
+    "crash_loop_restarts": 5,
+    "crash_loop_window": 1800,
+    "stable_after": 600,
+}
+
+
+class Health(NamedTuple):
+    """Result of one health check"""
+
+    healthy: bool
+    reason: Optional[str]  # a FAILURE_CHECKS key when unhealthy
+    detail: str
+
+
+class Incident:
+    """A period of failure, from detection to recovery"""
+
+    def __init__(self, reason: str, detail: str, detected_at: float, wall: float):
+        self.reason = reason
+        self.detail = detail
+        self.detected_at = detected_at
+        self.detected_wall = wall  # time.time() of detection, for the log
+        self.restarts = 0
+        self.last_restart: Optional[float] = None
+        self.recovered_at: Optional[float] = None
+
+    @property
+    def time_to_recover(self) -> Optional[float]:
+        """Seconds from detection to recovery, None while ongoing"""
+        if self.recovered_at is None:
+            return None
+        return self.recovered_at - self.detected_at
+
+    def to_dict(self) -> Dict:
+        """Serializable summary"""
+        ttr = self.time_to_recover
+        return {
+            "ts": round(self.detected_wall, 3),
+            "reason": self.reason,
+            "detail": self.detail,
+            "restarts": self.restarts,
+            "time_to_recover": None if ttr is None else round(ttr, 3),
+        }
+
+
+class RestartPolicy:
+    """Exponential restart backoff with crash-loop detection
+
+    Consecutive restarts are spaced backoff_base, 2x, 4x ... up to
+    backoff_max apart; the count resets once the router has stayed
+    healthy for stable_after seconds. crash_loop_restarts restarts
+    within crash_loop_window is a crash loop: restarts pause for
+    backoff_max, since restarting faster will not help.
+    """
+
+    def __init__(
+        self,
+        backoff_base: float = 10,
+        backoff_max: float = 600,
+        crash_loop_restarts: int = 5,
+        crash_loop_window: float = 1800,
+        stable_after: float = 600,
+    ):
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.crash_loop_restarts = crash_loop_restarts
+        self.crash_loop_window = crash_loop_window
+        self.stable_after = stable_after
+
+        self.attempts = 0
+        self.restarts: Deque[float] = deque()
+        self._last_restart: Optional[float] = None
+        self._healthy_since: Optional[float] = None
+
+    def record_restart(self, now: float):
+        """Count a restart attempt"""
+        self.attempts += 1
+        self._last_restart = now
+        self._healthy_since = None
+        self.restarts.append(now)
+
+    def record_healthy(self, now: float):
+        """Note a healthy check, forgetting old attempts once stable"""
+        if self._healthy_since is None:
+            self._healthy_since = now
+        elif now - self._healthy_since >= self.stable_after:
+            self.attempts = 0
+
+    def in_crash_loop(self, now: float) -> bool:
+        """Check if the router restarted too often recently"""
+        while self.restarts and now - self.restarts[0] > self.crash_loop_window:
+            self.restarts.popleft()
+        return len(self.restarts) >= self.crash_loop_restarts
+
+    def next_restart_at(self, now: float) -> float:
+        """Earliest time the next restart may happen"""
+        if self._last_restart is None or self.attempts == 0:
+            return now
+
+        delay = min(self.backoff_base * 2 ** (self.attempts - 1), self.backoff_max)
+        if self.in_crash_loop(now):
+            delay = max(delay, self.backoff_max)
+        return self._last_restart + delay
+
+
+class Supervisor:
+    """Checks router health periodically and restarts it when it fails
+
+    Health is judged from the process table (is i2pd alive?), the web
+    console (does it answer?) and, once the router has had time to
+    integrate, the tunnel creation success rate.
+    """
+
+    def __init__(
+        self,
+        i2pd,
+        config,
+        policy: Optional[RestartPolicy] = None,
+        check_process: bool = True,
+        on_event: Optional[Callable[[str], None]] = None,
+        history_path: Optional[Path] = None,
+        clock: Callable[[], float] = time.monotonic,
+        **settings,
+    ):
+        self.i2pd = i2pd
+        self.config = config
+        self.check_process = check_process
+        self.on_event = on_event
+        self.history_path = history_path
+        self.clock = clock
+
+        self.settings = {
+            key: settings.get(key, config.get(f"supervisor.{key}", default))
+            for key, default in DEFAULT_SETTINGS.items()
+        }
+        self.policy = policy or RestartPolicy(
+            backoff_base=self.settings["backoff_base"],
+            backoff_max=self.settings["backoff_max"],
+            crash_loop_restarts=self.settings["crash_loop_restarts"],
+            crash_loop_window=self.settings["crash_loop_window"],
+            stable_after=self.settings["stable_after"],
+        )
+
+        self.incident: Optional[Incident] = None
+        self.history: List[Incident] = []
+        self.checks = 0
+        self._failures = 0
+        self._failure_reason: Optional[str] = None
+        self._failing_since: Optional[float] = None
+        self._crash_loop_reported = False
+
+    # --- Health ---
+
+    @traced("supervisor.check")
+    def check(self) -> Health:
+        """Check router health once"""
+        console_port = self.config.get("i2pd.console_port", 7070)
+        status = self.i2pd.get_status(console_port)
+
+        if not status.get("running"):
+            # Only this router's own i2pd counts; another instance running
+            # on the host doesn't make a dead router merely unresponsive
+            if self.check_process and self.i2pd.get_process_info() is None:
+                return Health(False, "down", "i2pd process not found")
+            return Health(False, "unresponsive", "web console not answering")
+
+        # No rate when the console doesn't show one: nothing to judge by
+        rate = status.get("tunnel_success_rate")
+        uptime = status.get("uptime", 0)
+        if (
+            rate is not None
+            and uptime >= self.settings["integration_grace"]
+            and rate < self.settings["min_success_rate"]
+        ):
+            return Health(False, "degraded", f"tunnel success rate {rate}%")
+
+        return Health(True, None, "ok")
+
+    # --- Supervision ---
+
+    def step(self) -> float:
+        """Run one check and act on it, returns seconds until the next"""
+        self.checks += 1
+        interval = self.settings["check_interval"]
+        now = self.clock()
+        health = self.check()
+
+        if health.healthy:
+            self._failures = 0
+            self._failure_reason = None
+            self._failing_since = None
+            self.policy.record_healthy(now)
+            if self.incident is not None:
+                self._recovered(now)
+            return interval
+
+        if health.reason != self._failure_reason:
+            self._failures = 0
+            self._failure_reason = health.reason
+            self._failing_since = now
+        self._failures += 1
+
+        incident = self.incident
+        if incident is None:
+            if self._failures < FAILURE_CHECKS[health.reason]:
+                return interval
+            incident = self.incident = Incident(
+                health.reason, health.detail, self._failing_since, time.time()
+            )
+            self._emit(f"Unhealthy: {health.detail}")
+
+        # Give a restarted router time to bring its console up
+        if (
+            incident.last_restart is not None
+            and now - incident.last_restart < self.settings["start_timeout"]
+        ):
+            return interval
+
+        restart_at = self.policy.next_restart_at(now)
+        if now < restart_at:
+            if self.policy.in_crash_loop(now) and not self._crash_loop_reported:
+                self._crash_loop_reported = True
+                self._emit(
+                    f"Crash loop: {len(self.policy.restarts)} restarts in "
+                    f"{self.settings['crash_loop_window']:.0f}s, "
+                    f"next attempt in {restart_at - now:.0f}s"
+                )
+            return min(interval, restart_at - now)
+
+        self._restart(health, now)
+        return interval
+
+    def _restart(self, health: Health, now: float):
+        """Restart the router for the current incident"""
+        incident = self.incident
+        incident.restarts += 1
+        incident.last_restart = now
+        self.policy.record_restart(now)
+        self._emit(f"Restarting i2pd (attempt {self.policy.attempts})")
+
+        try:
+            # A dead router only needs starting; stop clears hung ones
+            if health.reason != "down":
+                self.i2pd.stop()
+            self.i2pd.start()
+        except Exception as e:
+            self._emit(f"Restart failed: {e}")
+
+    def _recovered(self, now: float):
+        """Close the current incident"""
+        incident = self.incident
+        incident.recovered_at = now
+        self.incident = None
+        self._crash_loop_reported = False
+        self.history.append(incident)
+        self._emit(
+            f"Recovered from {incident.reason} in {incident.time_to_recover:.1f}s "
+            f"({incident.restarts} restart(s))"
+        )
+
+        if self.history_path is not None:
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.history_path, "a") as f:
+                f.write(json.dumps(incident.to_dict(), separators=(",", ":")) + "\n")
+
+    def _emit(self, message: str):
+        """Report a supervision event"""
+        if self.on_event is not None:
+            self.on_event(message)
+
+    def mean_time_to_recover(self) -> Optional[float]:
+        """Mean seconds from detection to recovery over recovered incidents"""
+        times = [i.time_to_recover for i in self.history]
+        if not times:
+            return None
+        return sum(times) / len(times)
+
+    def run(self, should_stop: Callable[[float], bool]):
+        """Supervise until should_stop(timeout) returns True
+
+        should_stop waits up to timeout seconds, e.g. threading.Event.wait.
+        """
+        while not should_stop(self.step()):
+            pass
+
+
+def load_history(path: Path) -> List[Dict]:
+    """Read recorded incidents from a history file"""
+    if not path.exists():
+        return []
+
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
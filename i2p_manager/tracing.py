@@ -0,0 +1,185 @@
+"""
+Tracing
+Lightweight timing spans for finding where commands spend their time
+
+Spans are only recorded after enable(); while disabled, a traced call
+costs one global check.
+"""
+
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+# Top-level spans kept for the report. Long-running commands (status
+# --watch, supervise, the dashboard) keep only the latest ones.
+MAX_ROOTS = 1000
+
+_enabled = False
+_local = threading.local()
+_roots: Deque["Span"] = deque(maxlen=MAX_ROOTS)
+_roots_lock = threading.Lock()
+_dropped = 0
+
+
+class Span:
+    """A timed operation and the operations it called"""
+
+    __slots__ = ("name", "start", "duration", "children", "thread", "error")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.children: List["Span"] = []
+        self.thread = threading.current_thread().name
+        self.error: Optional[str] = None
+
+    @property
+    def ms(self) -> float:
+        """Duration in milliseconds (so far, if still running)"""
+        if self.duration is None:
+            return (time.perf_counter() - self.start) * 1000
+        return self.duration * 1000
+
+    def walk(self, depth: int = 0) -> Iterator[tuple]:
+        """Yield (depth, span) for this span and its descendants"""
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+
+def enable():
+    """Start recording spans"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop recording spans"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Check if spans are being recorded"""
+    return _enabled
+
+
+def reset():
+    """Forget recorded spans"""
+    global _dropped
+    with _roots_lock:
+        _roots.clear()
+        _dropped = 0
+    _local.stack = []
+
+
+def roots() -> List[Span]:
+    """Top-level spans recorded so far, from all threads"""
+    with _roots_lock:
+        return list(_roots)
+
+
+def dropped() -> int:
+    """Number of older top-level spans discarded to stay under MAX_ROOTS"""
+    return _dropped
+
+
+@contextmanager
+def _record(name: str):
+    """Record a span around the block"""
+    global _dropped
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+
+    span = Span(name)
+    if stack:
+        stack[-1].children.append(span)
+    else:
+        with _roots_lock:
+            if len(_roots) == MAX_ROOTS:
+                _dropped += 1
+            _roots.append(span)
+
+    stack.append(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = type(e).__name__
+        raise
+    finally:
+        span.duration = time.perf_counter() - span.start
+        stack.pop()
+
+
+_NOOP = nullcontext()
+
+
+def span(name: str):
+    """Context manager timing a block, when tracing is enabled"""
+    return _record(name) if _enabled else _NOOP
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator timing every call of a function, when tracing is enabled"""
+
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _record(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+# === Reporting ===
+
+
+def format_tree(spans: List[Span]) -> List[str]:
+    """Render spans as an indented timing tree"""
+    lines = []
+    for root in spans:
+        for depth, item in root.walk():
+            label = item.name
+            if depth == 0 and item.thread != "MainThread":
+                label += f" [{item.thread}]"
+            if item.error:
+                label += f" ({item.error})"
+            lines.append(f"{item.ms:10.1f} ms  {'  ' * depth}{label}")
+    return lines
+
+
+def summarize(spans: List[Span]) -> Dict[str, Dict]:
+    """Total time and call count per span name"""
+    totals: Dict[str, Dict] = {}
+    for root in spans:
+        for _, item in root.walk():
+            entry = totals.setdefault(item.name, {"calls": 0, "ms": 0.0})
+            entry["calls"] += 1
+            entry["ms"] = round(entry["ms"] + item.ms, 3)
+    return totals
+
+
+def append_timings(path: Path, command: str, total_ms: float, spans: List[Span]):
+    """Append one invocation's timings to a JSONL file"""
+    record = {
+        "ts": round(time.time(), 3),
+        "command": command,
+        "total_ms": round(total_ms, 3),
+        "spans": summarize(spans),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
@@ -4,10 +4,33 @@ Utility Functions
 
 import sys
 
+_console = None
+
 
 def get_platform():
     """Get current platform"""
     return sys.platform
 
 
+def get_console():
+    """Get the console shared by all commands
+
+    rich is imported on first use, so commands that print nothing
+    (e.g. --version) don't pay for it.
+    """
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+def __getattr__(name):
+    """Create the shared console on `from .utils import console`"""
+    if name == "console":
+        return get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Add more utilities as needed
@@ -0,0 +1,13 @@
+"""Shared pytest fixtures"""
+
+import pytest
+from i2p_manager.fake_i2pd import FakeI2pd
+
+
+@pytest.fixture
+def fake_i2pd():
+    """Fake i2pd router with console, proxies and I2PControl on free ports"""
+    with FakeI2pd(
+        proxy_port=0, socks_port=0, i2pcontrol_port=0, hang_timeout=1, seed=0
+    ) as router:
+        yield router
@@ -0,0 +1,183 @@
+"""Tests for the proxy balancer"""
+
+import asyncio
+import pytest
+from i2p_manager.balancer import Backend, Balancer, ProxyFront
+from i2p_manager.config import ConfigManager
+from i2p_manager.fake_i2pd import FakeI2pd
+from i2p_manager.i2pd import I2PdManager
+
+
+def backends(*names):
+    return [Backend(name, "127.0.0.1", 0, 0) for name in names]
+
+
+class TestBalancer:
+    """Test backend choice"""
+
+    def test_least_outstanding(self):
+        """Test the backend with fewest open connections is chosen"""
+        a, b = backends("a", "b")
+        balancer = Balancer([a, b])
+
+        a.outstanding = 2
+        assert balancer.pick() is b
+
+        b.outstanding = 2
+        b.total = 5
+        assert balancer.pick() is a
+
+    def test_i2p_destinations_are_sticky(self):
+        """Test a .i2p host keeps its router while that router is healthy"""
+        a, b = backends("a", "b")
+        balancer = Balancer([a, b])
+
+        first = balancer.pick("site.i2p")
+        first.outstanding = 10
+        assert balancer.pick("SITE.i2p") is first
+
+        balancer.mark_failed(first)
+        assert balancer.pick("site.i2p") is not first
+
+    def test_sticky_table_is_bounded(self):
+        """Test the oldest destinations are forgotten"""
+        balancer = Balancer(backends("a"), sticky_size=2)
+        for host in ("a.i2p", "b.i2p", "c.i2p"):
+            balancer.pick(host)
+        assert list(balancer._sticky) == ["b.i2p", "c.i2p"]
+
+    def test_routers_without_tunnels_used_last(self):
+        """Test a router still building tunnels only gets load as a fallback"""
+        a, b = backends("a", "b")
+        balancer = Balancer([a, b])
+        a.ready = False
+        b.outstanding = 5
+
+        assert balancer.pick() is b
+        b.healthy = False
+        assert balancer.pick() is a
+        a.healthy = False
+        assert balancer.pick() is None
+
+
+@pytest.fixture
+def routers(tmp_path, monkeypatch):
+    """Two fake routers with HTTP and SOCKS proxies"""
+    monkeypatch.setattr(ConfigManager, "get_config_dir", lambda self: tmp_path)
+    with FakeI2pd(proxy_port=0, socks_port=0, hang_timeout=2) as one:
+        with FakeI2pd(proxy_port=0, socks_port=0, hang_timeout=2) as two:
+            yield [one, two]
+
+
+def fleet_of(routers):
+    i2pd = I2PdManager(ConfigManager())
+    return [
+        Backend(
+            f"r{i}",
+            "127.0.0.1",
+            router.proxy_port,
+            router.socks_port,
+            i2pd=i2pd,
+            console_port=router.console_port,
+        )
+        for i, router in enumerate(routers)
+    ]
+
+
+async def http_connect(port, host):
+    """Open a CONNECT tunnel through the front"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"CONNECT {host}:80 HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    status = await reader.readuntil(b"\r\n\r\n")
+    return status, reader, writer
+
+
+async def socks_connect(port, host):
+    """Open a SOCKS5 connection through the front"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"\x05\x01\x00")
+    assert await reader.readexactly(2) == b"\x05\x00"
+    name = host.encode()
+    writer.write(b"\x05\x01\x00\x03" + bytes([len(name)]) + name + b"\x00\x50")
+    reply = await reader.readexactly(10)
+    return reply, reader, writer
+
+
+async def echo(reader, writer, data):
+    writer.write(data)
+    return await reader.readexactly(len(data))
+
+
+def test_connections_spread_and_relay(routers):
+    """Test HTTP and SOCKS clients are relayed and load is spread"""
+
+    async def scenario():
+        front = ProxyFront(Balancer(fleet_of(routers)), port=0)
+        await front.start()
+        try:
+            opened = []
+            for i in range(4):
+                status, reader, writer = await http_connect(front.port, f"s{i}.i2p")
+                assert status.split()[1] == b"200"
+                assert await echo(reader, writer, b"ping") == b"ping"
+                opened.append(writer)
+
+            reply, reader, writer = await socks_connect(front.port, "echo.i2p")
+            assert reply[1] == 0
+            assert await echo(reader, writer, b"hello") == b"hello"
+            opened.append(writer)
+
+            reply, reader, writer = await socks_connect(front.port, "example.com")
+            assert reply[1] == 4  # the router's refusal is passed on
+
+            stats = front.stats()
+            for w in opened:
+                w.close()
+            return stats
+        finally:
+            await front.stop()
+
+    stats = asyncio.run(scenario())
+
+    assert [s["total"] for s in stats.values()] == [3, 2]
+    assert [r.requests.get("proxy", 0) for r in routers] == [2, 2]
+
+
+def test_dead_router_skipped(routers):
+    """Test connections fail over when a router stops listening"""
+
+    async def scenario():
+        front = ProxyFront(Balancer(fleet_of(routers)), port=0)
+        await front.start()
+        routers[0].stop()
+        try:
+            for i in range(3):
+                status, reader, writer = await http_connect(front.port, f"s{i}.i2p")
+                assert status.split()[1] == b"200"
+                writer.close()
+            return front.stats()
+        finally:
+            await front.stop()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["r0"] == dict(stats["r0"], healthy=False, total=0, failures=1)
+    assert stats["r1"]["total"] == 3
+
+
+def test_no_router_available(routers):
+    """Test clients get a 503 when every router is down"""
+
+    async def scenario():
+        front = ProxyFront(Balancer(fleet_of(routers)), port=0)
+        await front.start()
+        for router in routers:
+            router.stop()
+        try:
+            status, _, writer = await http_connect(front.port, "site.i2p")
+            writer.close()
+            return status
+        finally:
+            await front.stop()
+
+    assert asyncio.run(scenario()).split()[1] == b"503"
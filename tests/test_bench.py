@@ -0,0 +1,58 @@
+"""Tests for the proxy benchmark"""
+
+import pytest
+from i2p_manager.bench import bench, histogram, split_target
+
+
+def test_histogram():
+    """Test latencies land in the right buckets"""
+    counts = histogram([0.0005, 0.003, 0.003, 20.0], bounds_ms=(1, 5, 10))
+    assert counts == {"<=1ms": 1, "<=5ms": 2, "<=10ms": 0, ">10ms": 1}
+
+
+def test_split_target():
+    assert split_target("echo.i2p") == ("echo.i2p", 80)
+    assert split_target("echo.i2p:7000") == ("echo.i2p", 7000)
+
+
+def test_http_mode(fake_i2pd):
+    """Test a fixed number of GETs is made through the HTTP proxy"""
+    proxy = ("127.0.0.1", fake_i2pd.proxy_port)
+    result = bench("http", proxy, "bench.i2p", concurrency=4, requests=20)
+
+    assert result.requests == result.connections == 20
+    assert result.bytes == 20 * fake_i2pd.site_size
+    assert len(result.connect_times) == len(result.latencies) == 20
+    assert fake_i2pd.requests["proxy"] == 20
+    assert not result.errors
+
+
+@pytest.mark.parametrize("mode", ["connect", "socks"])
+def test_tunnel_modes(fake_i2pd, mode):
+    """Test echo round trips are counted per message, setup per tunnel"""
+    port = fake_i2pd.proxy_port if mode == "connect" else fake_i2pd.socks_port
+    result = bench(
+        mode,
+        ("127.0.0.1", port),
+        "bench.i2p",
+        concurrency=2,
+        requests=25,
+        size=512,
+        messages=10,
+    )
+
+    assert result.requests == 25
+    assert result.bytes == 25 * 512
+    assert result.connections == len(result.connect_times) == 3
+    summary = result.to_dict()
+    assert sum(summary["histogram"].values()) == 25
+    assert summary["latency"]["p50"] is not None
+
+
+def test_errors_counted(fake_i2pd):
+    """Test refused tunnels are reported, not raised"""
+    proxy = ("127.0.0.1", fake_i2pd.socks_port)
+    result = bench("socks", proxy, "example.com", duration=0.3)
+
+    assert result.requests == 0
+    assert set(result.errors) == {"SOCKS error 4"}
@@ -1,8 +1,10 @@
 """Tests for CLI interface"""
 
+import subprocess
+import sys
 import pytest
 from click.testing import CliRunner
-from i2p_manager.cli import main
+from i2p_manager.cli import Managers, main
 
 
 class TestCLI:
@@ -47,3 +49,48 @@ class TestCLI:
         assert result.exit_code == 0
         assert "status" in result.output.lower()
         assert "--verbose" in result.output
+
+    def test_version_imports_no_commands(self):
+        """Test --version loads neither commands, managers nor rich"""
+        code = (
+            "import sys\n"
+            "from i2p_manager.cli import main\n"
+            "try:\n"
+            "    main(['--version'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(' '.join(sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        loaded = result.stdout.splitlines()[-1].split()
+        for module in ("rich", "requests", "psutil", "i2p_manager.commands"):
+            assert module not in loaded
+        assert "i2p_manager.cli" in loaded
+
+    def test_managers_created_on_demand(self):
+        """Test managers are only constructed when a command uses them"""
+        managers = Managers()
+        assert len(managers) == 0
+
+        i2pd = managers["i2pd"]
+        assert set(managers) == {"config", "i2pd"}
+        assert managers["i2pd"] is i2pd
+        assert i2pd.config is managers["config"]
+
+    def test_trace_flag(self, runner, tmp_path, monkeypatch):
+        """Test --trace prints a timing tree and logs the invocation"""
+        from i2p_manager import tracing
+        from i2p_manager.config import ConfigManager
+
+        monkeypatch.setattr(ConfigManager, "get_config_dir", lambda self: tmp_path)
+        monkeypatch.setattr(tracing, "_enabled", False)
+
+        result = runner.invoke(main, ["--trace", "logs", "-n", "1"])
+
+        assert "Timings for logs" in result.output
+        assert "cmd.logs" in result.output
+        record = (tmp_path / "timings.jsonl").read_text()
+        assert '"command":"logs"' in record
@@ -0,0 +1,57 @@
+"""Tests for the status command"""
+
+import json
+import pytest
+from unittest.mock import Mock, patch
+from i2p_manager.commands import cmd_status
+from i2p_manager.config import ConfigManager
+
+
+@pytest.fixture
+def managers():
+    """Create managers with a mocked router"""
+    i2pd = Mock()
+    i2pd.get_status.return_value = {"running": True, "peers": 60, "tunnels": 4}
+    i2pd.get_process_info.return_value = {"pid": 42}
+    return {"config": ConfigManager(), "i2pd": i2pd, "firefox": Mock()}
+
+
+def test_json_snapshot(managers, capsys):
+    """Test --json prints a single JSON snapshot"""
+    cmd_status.run(managers, as_json=True)
+
+    snapshot = json.loads(capsys.readouterr().out)
+    assert snapshot["phase"] == "connected"
+    assert snapshot["peers"] == 60
+    assert snapshot["process"] == {"pid": 42}
+
+
+@patch("i2p_manager.commands.cmd_status.time.sleep")
+def test_watch_on_change(mock_sleep, managers, capsys):
+    """Test watch mode emits NDJSON only when the state changes"""
+    statuses = [
+        {"running": True, "peers": 60, "tunnels": 4, "uptime": 1},
+        {"running": True, "peers": 60, "tunnels": 4, "uptime": 6},
+        {"running": True, "peers": 61, "tunnels": 4, "uptime": 11},
+    ]
+    managers["i2pd"].get_status.side_effect = statuses
+    mock_sleep.side_effect = [None, None, KeyboardInterrupt]
+
+    cmd_status.run(managers, watch=True, interval=5, as_json=True, on_change=True)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["peers"] for line in lines] == [60, 61]
+    mock_sleep.assert_called_with(5)
+
+
+@patch("i2p_manager.commands.cmd_status.time.sleep")
+def test_watch_asks_daemon_for_fresh_status(mock_sleep, managers, capsys):
+    """Test each watched snapshot from the daemon is at most one interval old"""
+    client = Mock()
+    client.status.return_value = {"ts": 0, "running": False, "phase": "stopped"}
+    mock_sleep.side_effect = [None, KeyboardInterrupt]
+
+    with patch.object(cmd_status, "get_client", return_value=client):
+        cmd_status.run(managers, watch=True, interval=1, as_json=True)
+
+    assert [c.args for c in client.status.call_args_list] == [(1,), (1,)]
@@ -0,0 +1,100 @@
+"""Tests for the manager daemon"""
+
+import json
+import time
+import pytest
+from i2p_manager.commands import cmd_status
+from i2p_manager.config import ConfigManager
+from i2p_manager.daemon import DaemonError, ManagerDaemon, connect
+from i2p_manager.i2pd import I2PdManager
+
+
+@pytest.fixture
+def daemon(fake_i2pd, tmp_path, monkeypatch):
+    """Daemon watching the fake router, listening in a temporary directory"""
+    monkeypatch.setattr(ConfigManager, "get_config_dir", lambda self: tmp_path)
+    config = ConfigManager()
+    config.init()
+    config.set("i2pd.console_port", fake_i2pd.console_port)
+
+    daemon = ManagerDaemon(
+        {"config": config, "i2pd": I2PdManager(config)}, tmp_path / "managerd.sock"
+    )
+    thread = daemon.start()
+    yield daemon
+    daemon.shutdown()
+    thread.join(timeout=2)
+
+
+@pytest.fixture
+def client(daemon):
+    """Client connected to the daemon"""
+    client = connect(daemon.path)
+    yield client
+    client.close()
+
+
+def test_connect_without_daemon(tmp_path):
+    """Test connect returns None when nothing is listening"""
+    assert connect(tmp_path / "missing.sock") is None
+
+    stale = tmp_path / "stale.sock"
+    stale.touch()
+    assert connect(stale) is None
+
+
+def test_status_is_served_from_the_poller(daemon, client, fake_i2pd):
+    """Test repeated status requests share one console poll"""
+    first = client.status()
+    assert first["running"] is True
+    assert first["peers"] > 0
+    assert first["phase"] == "connected"
+    polls = fake_i2pd.requests["console"]
+
+    for _ in range(20):
+        assert client.status()["peers"] == first["peers"]
+    assert fake_i2pd.requests["console"] == polls
+
+    client.request("refresh")
+    assert fake_i2pd.requests["console"] == polls + 1
+
+
+def test_requests(client):
+    """Test ping, history and unknown ops"""
+    client.status()
+    ping = client.request("ping")
+    assert ping["requests"] == 2
+    assert client.request("history")["samples"]["peers"]
+
+    with pytest.raises(DaemonError, match="Unknown op"):
+        client.request("explode")
+
+    # The connection survives an error
+    assert client.request("ping")["requests"] == 4
+
+
+def test_second_daemon_refuses_to_start(daemon):
+    """Test binding a live socket fails instead of stealing it"""
+    other = ManagerDaemon({"config": daemon.config, "i2pd": daemon.i2pd}, daemon.path)
+    with pytest.raises(RuntimeError, match="already listening"):
+        other.bind()
+
+
+def test_status_command_uses_daemon(client, capsys):
+    """Test status --json is answered by the daemon when one is running"""
+    managers = {"daemon": client}
+    cmd_status.run(managers, as_json=True)
+
+    snapshot = json.loads(capsys.readouterr().out)
+    assert snapshot["running"] is True
+    assert "age" in snapshot
+
+
+def test_shutdown_removes_socket(daemon, client):
+    """Test the shutdown op stops the daemon and cleans up"""
+    client.request("shutdown")
+
+    deadline = time.time() + 2
+    while daemon.path.exists() and time.time() < deadline:
+        time.sleep(0.02)
+    assert not daemon.path.exists()
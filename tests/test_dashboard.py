@@ -0,0 +1,103 @@
+"""Tests for the interactive dashboard"""
+
+import select
+import sys
+import threading
+import pytest
+from unittest.mock import Mock
+from i2p_manager.config import ConfigManager
+from i2p_manager.dashboard import Dashboard, Wakeup, sparkline
+
+
+class TestDashboard:
+    """Test Dashboard class"""
+
+    @pytest.fixture
+    def dashboard(self):
+        """Create Dashboard fixture with mocked managers"""
+        return Dashboard({"config": ConfigManager(), "i2pd": Mock(), "firefox": Mock()})
+
+    def test_update_display_only_when_changed(self, dashboard):
+        """Test panels are re-rendered only when their inputs change"""
+        layout = dashboard.create_layout()
+        dashboard.render_network = Mock(wraps=dashboard.render_network)
+
+        assert dashboard.update_display(layout) is True
+        assert dashboard.update_display(layout) is False
+        assert dashboard.render_network.call_count == 1
+
+        dashboard.status_data = {"running": True, "peers": 60, "tunnels": 4}
+        assert dashboard.update_display(layout) is True
+        assert dashboard.render_network.call_count == 2
+
+    def test_log_pane(self, dashboard, tmp_path):
+        """Test toggling the log pane and filtering it by level"""
+        log_path = tmp_path / "i2pd.log"
+        log_path.write_text("12:00:00@1/info - hello\n12:00:01@1/error - oops\n")
+        dashboard.logs.path = log_path
+        dashboard.poller.stale_deadline = Mock(return_value=None)
+        layout = dashboard.create_layout()
+
+        assert dashboard.next_timeout() is None
+        dashboard.handle_input("6")
+        assert layout["logs"].visible is True
+        assert dashboard.next_timeout() == pytest.approx(0.5)
+
+        dashboard.apply_snapshot()
+        assert dashboard.update_display(layout) is True
+        dashboard.handle_input("e")
+        assert dashboard.log_level == "error"
+        assert [line.text for line in dashboard.logs.tail(5, "error")] == [
+            "12:00:01@1/error - oops"
+        ]
+
+        dashboard.handle_input("6")
+        assert layout["logs"].visible is False
+
+    def test_action_refused_while_busy(self, dashboard):
+        """Test lifecycle actions don't run concurrently"""
+        release = threading.Event()
+        dashboard.jobs.submit(
+            "Restart I2P", lambda report: release.wait(2), "lifecycle"
+        )
+
+        dashboard.action_stop()
+        release.set()
+        dashboard.jobs.wait(timeout=2)
+
+        assert dashboard.notice == "Restart I2P is still running"
+        dashboard.i2pd.stop.assert_not_called()
+
+    def test_next_timeout_follows_stale_deadline(self, dashboard):
+        """Test the UI sleeps until the snapshot would go stale"""
+        assert dashboard.next_timeout() is None
+
+        dashboard.i2pd.get_status.return_value = {"running": False}
+        dashboard.poller.poll_once()
+        timeout = dashboard.next_timeout()
+
+        assert timeout is not None
+        assert 0 < timeout <= dashboard.poller.interval * 2 + 0.05
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="self-pipe is POSIX only")
+def test_wakeup_pipe():
+    """Test wakeups are coalesced and drained"""
+    wakeup = Wakeup()
+    try:
+        assert wakeup.drain() is False
+        wakeup.notify()
+        wakeup.notify()
+        assert select.select([wakeup], [], [], 0)[0]
+        assert wakeup.drain() is True
+        assert not select.select([wakeup], [], [], 0)[0]
+    finally:
+        wakeup.close()
+
+
+def test_sparkline():
+    """Test sparkline scaling"""
+    assert sparkline([]) == ""
+    assert sparkline([5, 5, 5]) == "▁▁▁"
+    assert sparkline([0, 7, 14]) == "▁▅█"
+    assert len(sparkline(range(100), width=10)) == 10
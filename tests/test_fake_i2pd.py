@@ -0,0 +1,147 @@
+"""Tests for the fake i2pd router"""
+
+import json
+import socket
+import time
+import pytest
+import requests
+from i2p_manager.fake_i2pd import RouterModel, parse_script
+
+
+class TestRouterModel:
+    """Test RouterModel class"""
+
+    def test_script_advances_through_states(self):
+        """Test timed phases follow each other and the last one sticks"""
+        model = RouterModel([("starting", 0.05), ("integrating", 0.05), ("crashed", 0)])
+
+        assert model.state == "starting"
+        time.sleep(0.06)
+        assert model.state == "integrating"
+        time.sleep(0.06)
+        assert model.state == "crashed"
+
+    def test_integrating_stays_below_integrated(self):
+        """Test peers ramp up during integration without reaching the threshold"""
+        model = RouterModel([("integrating", 0.05), ("integrated", None)])
+        early = model.metrics()["peers"]
+        time.sleep(0.04)
+        late = model.metrics()["peers"]
+
+        assert early <= late < 50
+        time.sleep(0.02)
+        assert model.metrics()["peers"] > 1000
+
+    def test_parse_script(self):
+        """Test parsing scripts from the command line"""
+        assert parse_script("starting:5, integrating:1.5,integrated") == [
+            ("starting", 5.0),
+            ("integrating", 1.5),
+            ("integrated", None),
+        ]
+        with pytest.raises(ValueError):
+            parse_script("exploded:5")
+
+
+class TestFakeI2pd:
+    """Test FakeI2pd endpoints"""
+
+    def test_console_pages(self, fake_i2pd):
+        """Test the console serves known pages and rejects unknown ones"""
+        base = f"http://127.0.0.1:{fake_i2pd.console_port}/"
+
+        status = requests.get(base)
+        assert status.status_code == 200
+        assert "<b>Routers:</b>" in status.text
+        assert len(status.text) > 4096
+
+        assert "Inbound tunnels" in requests.get(base + "?page=tunnels").text
+        assert "NTCP2" in requests.get(base + "?page=transports").text
+        assert requests.get(base + "?page=bogus").status_code == 400
+        assert fake_i2pd.requests["console"] == 4
+
+    def test_starting_and_crashed(self, fake_i2pd):
+        """Test a starting router answers 503 and a crashed one resets"""
+        url = f"http://127.0.0.1:{fake_i2pd.console_port}/"
+
+        fake_i2pd.set_state("starting")
+        assert requests.get(url).status_code == 503
+
+        fake_i2pd.set_state("crashed")
+        with pytest.raises(requests.ConnectionError):
+            requests.get(url)
+
+    def test_hung(self, fake_i2pd):
+        """Test a hung router never answers"""
+        fake_i2pd.set_state("hung")
+        with pytest.raises(requests.exceptions.Timeout):
+            requests.get(f"http://127.0.0.1:{fake_i2pd.console_port}/", timeout=0.2)
+
+    def test_error_rate(self, fake_i2pd):
+        """Test injected errors"""
+        fake_i2pd.error_rate = 1.0
+        response = requests.get(f"http://127.0.0.1:{fake_i2pd.console_port}/")
+        assert response.status_code == 500
+
+    def test_http_proxy(self, fake_i2pd):
+        """Test the proxy serves .i2p sites and refuses clearnet"""
+        proxies = {"http": f"http://127.0.0.1:{fake_i2pd.proxy_port}"}
+        fake_i2pd.unreachable.add("down.i2p")
+
+        site = requests.get("http://planet.i2p/index.html", proxies=proxies)
+        assert site.status_code == 200
+        assert "planet.i2p/index.html" in site.text
+        assert len(site.content) >= fake_i2pd.site_size
+
+        assert requests.get("http://down.i2p/", proxies=proxies).status_code == 504
+        assert requests.get("http://example.com/", proxies=proxies).status_code == 503
+
+    def test_connect_echo(self, fake_i2pd):
+        """Test CONNECT opens an echo tunnel"""
+        with socket.create_connection(("127.0.0.1", fake_i2pd.proxy_port)) as conn:
+            conn.sendall(b"CONNECT echo.i2p:80 HTTP/1.1\r\nHost: echo.i2p\r\n\r\n")
+            reply = b""
+            while b"\r\n\r\n" not in reply:
+                reply += conn.recv(1024)
+            assert reply.startswith(b"HTTP/1.1 200")
+
+            conn.sendall(b"ping")
+            assert conn.recv(4) == b"ping"
+
+    def test_socks_echo(self, fake_i2pd):
+        """Test SOCKS5 CONNECT to a .i2p host opens an echo tunnel"""
+        fake_i2pd.unreachable.add("down.i2p")
+
+        def connect(host):
+            conn = socket.create_connection(("127.0.0.1", fake_i2pd.socks_port))
+            conn.sendall(b"\x05\x01\x00")
+            assert conn.recv(2) == b"\x05\x00"
+            name = host.encode()
+            conn.sendall(b"\x05\x01\x00\x03" + bytes([len(name)]) + name + b"\x00P")
+            return conn, conn.recv(10)
+
+        conn, reply = connect("echo.i2p")
+        with conn:
+            assert reply[:2] == b"\x05\x00"
+            conn.sendall(b"ping")
+            assert conn.recv(4) == b"ping"
+
+        for host in ("down.i2p", "example.com"):
+            conn, reply = connect(host)
+            conn.close()
+            assert reply[:2] == b"\x05\x04"
+
+    def test_i2pcontrol(self, fake_i2pd):
+        """Test I2PControl authentication and RouterInfo"""
+        url = f"http://127.0.0.1:{fake_i2pd.i2pcontrol_port}/"
+
+        def call(method, **params):
+            body = {"id": 1, "jsonrpc": "2.0", "method": method, "params": params}
+            return requests.post(url, data=json.dumps(body)).json()
+
+        assert call("Authenticate", API=1, Password="wrong")["error"]["code"] == -32004
+        assert call("RouterInfo", Token="nope")["error"]["code"] == -32003
+
+        token = call("Authenticate", API=1, Password="itoopie")["result"]["Token"]
+        info = call("RouterInfo", Token=token, **{"i2p.router.netdb.knownpeers": None})
+        assert info["result"]["i2p.router.netdb.knownpeers"] > 1000
@@ -1,9 +1,12 @@
 """Tests for Firefox profile management"""
 
+import os
+import sqlite3
+import time
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
-from i2p_manager.firefox import FirefoxManager
+from i2p_manager.firefox import FirefoxManager, parse_prefs
 from i2p_manager.config import ConfigManager
 
 
@@ -95,3 +98,314 @@ class TestFirefoxManager:
         assert "network.proxy.type" in content
         assert "127.0.0.1" in content
         assert "4444" in content
+
+    def test_create_profile_from_template(self, firefox_manager, tmp_path):
+        """Test profile is cloned from template without spawning Firefox"""
+        firefox_manager.get_profiles_dir = lambda: tmp_path
+
+        with patch("i2p_manager.firefox.subprocess.run") as mock_run:
+            profile = firefox_manager.create_profile("test-profile")
+
+        mock_run.assert_not_called()
+
+        content = (Path(profile["path"]) / "user.js").read_text()
+        assert "network.proxy.http_port" in content
+        assert "privacy.resistFingerprinting" in content
+
+    def test_profile_template_cached(self, firefox_manager, tmp_path):
+        """Test template is reused until the config changes"""
+        firefox_manager.get_profiles_dir = lambda: tmp_path
+
+        first = firefox_manager.get_profile_template()
+        assert firefox_manager.get_profile_template() == first
+
+        cfg = firefox_manager.config.load()
+        cfg["i2pd"] = dict(cfg["i2pd"], http_port=4999)
+        firefox_manager.config._config_cache = cfg
+
+        second = firefox_manager.get_profile_template()
+        assert second != first
+        assert not first.exists()
+        assert "4999" in (second / "user.js").read_text()
+
+    def test_create_profile_keeps_existing_data(self, firefox_manager, tmp_path):
+        """Test reinitializing keeps profile data and leaves template intact"""
+        firefox_manager.get_profiles_dir = lambda: tmp_path
+
+        profile = firefox_manager.create_profile("test-profile")
+        profile_path = Path(profile["path"])
+        (profile_path / "places.sqlite").write_text("bookmarks")
+
+        firefox_manager.configure_proxy(profile["path"])
+        firefox_manager.create_profile("test-profile")
+
+        assert (profile_path / "places.sqlite").read_text() == "bookmarks"
+        template_js = firefox_manager.get_profile_template() / "user.js"
+        assert template_js.read_text() == (profile_path / "user.js").read_text()
+
+    def test_create_profile_merges_user_js(self, firefox_manager, tmp_path):
+        """Test reinitializing keeps hand-added prefs and writable files"""
+        firefox_manager.get_profiles_dir = lambda: tmp_path
+
+        profile = firefox_manager.create_profile("test-profile")
+        user_js = Path(profile["path"]) / "user.js"
+        assert user_js.stat().st_mode & 0o200
+        with open(user_js, "a") as f:
+            f.write('user_pref("custom.pref", "kept");\n')
+
+        firefox_manager.create_profile("test-profile")
+
+        assert parse_prefs(user_js.read_text())["custom.pref"] == '"kept"'
+        assert user_js.stat().st_mode & 0o200
+
+    def test_configure_proxy_idempotent(self, firefox_manager, tmp_path):
+        """Test repeated proxy configuration doesn't duplicate prefs"""
+        profile_path = tmp_path / "profile"
+        profile_path.mkdir()
+
+        assert firefox_manager.configure_proxy(str(profile_path)) is True
+        first = (profile_path / "user.js").read_text()
+
+        assert firefox_manager.configure_proxy(str(profile_path)) is False
+        content = (profile_path / "user.js").read_text()
+
+        assert content == first
+        assert content.count('"network.proxy.http_port"') == 1
+
+    def test_user_js_layer_precedence(self, firefox_manager, tmp_path):
+        """Test existing prefs are kept and overrides win over managed prefs"""
+        firefox_manager.config.get_config_dir = lambda: tmp_path
+        (tmp_path / "user-overrides.js").write_text(
+            'user_pref("webgl.disabled", false);\n'
+        )
+        profile_path = tmp_path / "profile"
+        profile_path.mkdir()
+        (profile_path / "user.js").write_text(
+            'user_pref("network.proxy.http_port", 1234);\n'
+            'user_pref("custom.pref", "kept");\n'
+        )
+
+        firefox_manager.write_user_js(str(profile_path), harden=True)
+        prefs = parse_prefs((profile_path / "user.js").read_text())
+
+        http_port = firefox_manager.config.get("i2pd.http_port")
+        assert prefs["network.proxy.http_port"] == str(http_port)
+        assert prefs["custom.pref"] == '"kept"'
+        assert prefs["webgl.disabled"] == "false"
+
+    @patch("i2p_manager.firefox.psutil.process_iter")
+    def test_profile_state_running(self, mock_iter, firefox_manager, tmp_path):
+        """Test running profile is detected from the process table"""
+        firefox_manager.get_profiles_dir = lambda: tmp_path
+        profile_path = tmp_path / "test-profile.default"
+        proc = Mock()
+        proc.info = {
+            "pid": 4321,
+            "name": "firefox",
+            "cmdline": ["firefox", "-profile", str(profile_path), "-new-instance"],
+        }
+        mock_iter.return_value = [proc]
+
+        state = firefox_manager.get_profile_state("test-profile")
+
+        assert state["running"] is True
+        assert state["pid"] == 4321
+        assert state["stale_lock"] is False
+
+    @patch("i2p_manager.firefox.psutil.process_iter")
+    def test_clear_stale_locks(self, mock_iter, firefox_manager, tmp_path):
+        """Test lock files from a crashed session are removed"""
+        mock_iter.return_value = []
+        firefox_manager.get_profiles_dir = lambda: tmp_path
+        profile_path = tmp_path / "test-profile.default"
+        profile_path.mkdir()
+        (profile_path / ".parentlock").write_text("")
+
+        assert firefox_manager.get_profile_state("test-profile")["stale_lock"]
+        assert firefox_manager.clear_stale_locks("test-profile") is True
+        assert not (profile_path / ".parentlock").exists()
+
+    @patch("i2p_manager.firefox.subprocess.Popen")
+    def test_launch_reuses_running_instance(self, mock_popen, firefox_manager):
+        """Test launch hands off to the instance already using the profile"""
+        firefox_manager.get_firefox_executable = lambda: "/usr/bin/firefox"
+        firefox_manager.get_profile_state = lambda name: {
+            "running": True,
+            "pid": 4321,
+            "stale_lock": False,
+        }
+
+        result = firefox_manager.launch("test-profile")
+
+        assert result == {"pid": 4321, "reused": True}
+        cmd = mock_popen.call_args[0][0]
+        assert "-new-instance" not in cmd and "-no-remote" not in cmd
+
+    def test_optimize_profile(self, firefox_manager, tmp_path):
+        """Test databases are vacuumed and old cache entries pruned"""
+        firefox_manager.get_profiles_dir = lambda: tmp_path
+        firefox_manager.get_profile_cache_dirs = lambda name: [
+            tmp_path / "test-profile.default" / "cache2"
+        ]
+        firefox_manager.get_profile_state = lambda name: {
+            "running": False,
+            "pid": None,
+            "stale_lock": False,
+        }
+        profile_path = tmp_path / "test-profile.default"
+        entries = profile_path / "cache2" / "entries"
+        entries.mkdir(parents=True)
+
+        conn = sqlite3.connect(str(profile_path / "places.sqlite"))
+        conn.execute("CREATE TABLE t (data BLOB)")
+        conn.executemany("INSERT INTO t VALUES (?)", [(b"x" * 4096,)] * 200)
+        conn.commit()
+        conn.execute("DELETE FROM t")
+        conn.commit()
+        conn.close()
+
+        old_entry = entries / "OLD"
+        old_entry.write_bytes(b"x" * 1000)
+        old_time = time.time() - 30 * 86400
+        os.utime(old_entry, (old_time, old_time))
+        (entries / "NEW").write_bytes(b"x" * 1000)
+
+        report = firefox_manager.optimize_profile("test-profile")
+
+        assert report["databases"][0]["after"] < report["databases"][0]["before"]
+        assert report["cache_entries_removed"] == 1
+        assert not old_entry.exists()
+        assert (entries / "NEW").exists()
+        assert report["startup_bytes_after"] < report["startup_bytes_before"]
+
+    def test_optimize_profile_running(self, firefox_manager, tmp_path):
+        """Test optimize refuses to touch a profile in use"""
+        firefox_manager.get_profiles_dir = lambda: tmp_path
+        (tmp_path / "test-profile.default").mkdir()
+        firefox_manager.get_profile_state = lambda name: {
+            "running": True,
+            "pid": 4321,
+            "stale_lock": False,
+        }
+
+        with pytest.raises(RuntimeError):
+            firefox_manager.optimize_profile("test-profile")
+
+    def test_disabled_layers_dropped(self, firefox_manager, tmp_path):
+        """Test prefs from a layer turned off leave user.js, hand-added stay"""
+        firefox_manager.get_ram_dir = lambda: tmp_path / "ram"
+        cfg = firefox_manager.config.load()
+        cfg["firefox"] = dict(cfg["firefox"], ram_cache=True, ram_profile=False)
+        firefox_manager.config._config_cache = cfg
+        profile_path = tmp_path / "profile"
+        profile_path.mkdir()
+
+        firefox_manager.write_user_js(str(profile_path), harden=True)
+        user_js = profile_path / "user.js"
+        user_js.write_text(user_js.read_text() + 'user_pref("custom.pref", "kept");\n')
+
+        cfg["firefox"] = dict(cfg["firefox"], ram_cache=False)
+        assert firefox_manager.write_user_js(str(profile_path), harden=False)
+        prefs = parse_prefs(user_js.read_text())
+
+        assert "browser.aboutConfig.showWarning" not in prefs
+        assert "browser.cache.disk.parent_directory" not in prefs
+        assert prefs["custom.pref"] == '"kept"'
+        assert "network.proxy.http_port" in prefs
+
+    def test_ram_profile_stage_and_sync(self, firefox_manager, tmp_path):
+        """Test RAM profile copies in and syncs only persistent files back"""
+        firefox_manager.get_profiles_dir = lambda: tmp_path / "profiles"
+        firefox_manager.get_ram_dir = lambda: tmp_path / "ram"
+        profile_path = tmp_path / "profiles" / "test-profile.default"
+        (profile_path / "cache2").mkdir(parents=True)
+        (profile_path / "prefs.js").write_text("old")
+        (profile_path / "user.js").write_text("user")
+
+        ram_path = firefox_manager.stage_ram_profile("test-profile")
+
+        assert (ram_path / "prefs.js").read_text() == "old"
+        assert (ram_path / "user.js").read_text() == "user"
+        assert not (ram_path / "cache2").exists()
+
+        (ram_path / "prefs.js").write_text("new")
+        (ram_path / "cookies.sqlite").write_text("session")
+
+        assert firefox_manager.sync_ram_profile("test-profile") == 1
+        assert (profile_path / "prefs.js").read_text() == "new"
+        assert not (profile_path / "cookies.sqlite").exists()
+
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+    def test_ram_dir_private(self, firefox_manager, tmp_path, monkeypatch):
+        """Test the RAM directory is ours alone, or replaced by a fresh one"""
+        cfg = firefox_manager.config.load()
+        cfg["firefox"] = dict(cfg["firefox"], ram_dir=str(tmp_path))
+        firefox_manager.config._config_cache = cfg
+
+        ram_dir = firefox_manager.get_ram_dir()
+        assert ram_dir.parent == tmp_path
+        assert ram_dir.stat().st_mode & 0o777 == 0o700
+
+        # Someone else's directory at the predictable path is not used
+        ram_dir.chmod(0o755)
+        monkeypatch.setattr(os, "getuid", lambda: ram_dir.stat().st_uid + 1)
+        other = FirefoxManager(firefox_manager.config).get_ram_dir()
+        assert other != ram_dir and other.parent == tmp_path
+        assert ram_dir.stat().st_mode & 0o777 == 0o755
+        monkeypatch.undo()
+
+        assert other.stat().st_mode & 0o777 == 0o700
+        assert FirefoxManager(firefox_manager.config).get_ram_dir() == ram_dir
+        assert ram_dir.stat().st_mode & 0o777 == 0o700
+
+    def test_ram_cache_prefs(self, firefox_manager, tmp_path):
+        """Test RAM cache mode redirects the disk cache via user.js"""
+        firefox_manager.get_ram_dir = lambda: tmp_path / "ram"
+        cfg = firefox_manager.config.load()
+        cfg["firefox"] = dict(cfg["firefox"], ram_cache=True)
+        firefox_manager.config._config_cache = cfg
+
+        prefs = firefox_manager.compile_prefs()
+
+        cache_dir = tmp_path / "ram" / "cache" / cfg["firefox"]["profile_name"]
+        assert prefs["browser.cache.disk.parent_directory"] == f'"{cache_dir}"'
+
+    def test_proxy_prefs_use_balancer(self, firefox_manager):
+        """Test every proxy pref points at the balancer when it is enabled"""
+        cfg = firefox_manager.config.load()
+        cfg["balancer"] = dict(cfg["balancer"], enabled=True, port=4440)
+        firefox_manager.config._config_cache = cfg
+
+        prefs = firefox_manager.compile_prefs()
+
+        for pref in ("http_port", "ssl_port", "socks_port"):
+            assert prefs[f"network.proxy.{pref}"] == "4440"
+
+    def test_proxy_prefs_use_cache(self, firefox_manager):
+        """Test plain HTTP goes through the cache when it is enabled"""
+        cfg = firefox_manager.config.load()
+        cfg["cache"] = dict(cfg["cache"], enabled=True, port=4450)
+        firefox_manager.config._config_cache = cfg
+
+        prefs = firefox_manager.compile_prefs()
+
+        assert prefs["network.proxy.http_port"] == "4450"
+        assert prefs["network.proxy.ssl_port"] == str(cfg["i2pd"]["https_port"])
+
+
+def test_parse_prefs():
+    """Test parsing skips comments and deduplicates prefs"""
+    text = """
+/* block comment
+user_pref("commented.block", 1);
+*/
+// user_pref("commented.line", 1);
+user_pref("a.pref", "value // not a comment");
+user_pref("b.pref", true); // trailing comment
+user_pref("a.pref", "second");
+"""
+    prefs = parse_prefs(text)
+
+    assert list(prefs) == ["a.pref", "b.pref"]
+    assert prefs["a.pref"] == '"second"'
+    assert prefs["b.pref"] == "true"
@@ -0,0 +1,182 @@
+"""Tests for running several routers on one host"""
+
+import json
+import subprocess
+import sys
+import time
+import pytest
+from pathlib import Path
+from i2p_manager import fleet, i2pd as i2pd_module
+from i2p_manager.commands import cmd_start, cmd_status, cmd_stop
+from i2p_manager.config import ConfigManager, InstanceConfig
+
+# Stand-in i2pd: serves a fake console on the port from the generated conf
+FAKE_I2PD = """#!{python}
+import re, signal, sys, time
+sys.path.insert(0, {root!r})
+from i2p_manager.fake_i2pd import FakeI2pd
+
+conf = next(a.split("=", 1)[1] for a in sys.argv if a.startswith("--conf="))
+port = int(re.search(r"\\[http\\][^[]*?port = (\\d+)", open(conf).read()).group(1))
+signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+with FakeI2pd(console_port=port):
+    while True:
+        time.sleep(1)
+"""
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """Config in a temporary directory"""
+    monkeypatch.setattr(ConfigManager, "get_config_dir", lambda self: tmp_path)
+    config = ConfigManager()
+    config.init()
+    return config
+
+
+def always_free(port):
+    return True
+
+
+class TestInstances:
+    """Test instance config and port allocation"""
+
+    def test_allocate_ports_skips_taken(self, config, monkeypatch):
+        """Test new instances get the next unused port block"""
+        monkeypatch.setattr(fleet, "port_is_free", always_free)
+        base = config.load()["i2pd"]
+
+        first = fleet.add_instance(config, "a")
+        assert first["http_port"] == base["http_port"] + 10
+        assert first["console_port"] == base["console_port"] + 10
+
+        second = fleet.add_instance(config, "b")
+        assert second["http_port"] == base["http_port"] + 20
+
+        busy = {base["sam_port"] + 30}
+        third = fleet.allocate_ports(config, is_free=lambda port: port not in busy)
+        assert third["http_port"] == base["http_port"] + 40
+
+    def test_invalid_and_duplicate_names(self, config, monkeypatch):
+        """Test instance names are validated"""
+        monkeypatch.setattr(fleet, "port_is_free", always_free)
+        fleet.add_instance(config, "a")
+
+        for name in ("a", "default", "Bad Name", "../x"):
+            with pytest.raises(ValueError):
+                fleet.add_instance(config, name)
+
+    def test_instance_config_view(self, config, tmp_path, monkeypatch):
+        """Test an instance overlays its settings on the main i2pd section"""
+        monkeypatch.setattr(fleet, "port_is_free", always_free)
+        ports = fleet.add_instance(config, "a")
+
+        view = InstanceConfig(config, "a")
+        assert view.get("i2pd.http_port") == ports["http_port"]
+        assert view.get("i2pd.host") == config.get("i2pd.host")
+        assert view.get("i2pd.backend") == "native"
+        assert view.get("i2pd.data_dir") == str(tmp_path / "instances" / "a")
+
+        view.set("i2pd.log_level", "debug")
+        assert config.get("instances.a.log_level") == "debug"
+        assert config.get("i2pd.log_level") == "warn"
+
+        fleet.remove_instance(config, "a")
+        assert fleet.instance_names(config) == ["default"]
+
+    def test_run_all_is_concurrent(self):
+        """Test fleet actions run in parallel and keep failures per router"""
+
+        def action(name, managers):
+            time.sleep(0.2)
+            if name == "bad":
+                raise RuntimeError("boom")
+            return name.upper()
+
+        started = time.perf_counter()
+        results = fleet.run_all(action, {"a": {}, "b": {}, "c": {}, "bad": {}})
+
+        assert time.perf_counter() - started < 0.6
+        assert results["a"] == (True, "A")
+        assert results["bad"][0] is False
+        assert str(results["bad"][1]) == "boom"
+
+
+@pytest.fixture
+def fake_bin(tmp_path, monkeypatch):
+    """Stand-in i2pd on PATH, returns its path"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "i2pd"
+    root = str(Path(__file__).parent.parent)
+    script.write_text(FAKE_I2PD.format(python=sys.executable, root=root))
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir), prepend=":")
+    monkeypatch.setenv("PYTHONPATH", root)
+    return script
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script")
+def test_fleet_start_status_stop(config, fake_bin, monkeypatch, capsys):
+    """Test start/status/stop --all drive every router"""
+    config.set("i2pd.backend", "native")
+    config.set("i2pd.console_port", 17070)
+    monkeypatch.setattr(fleet, "port_is_free", always_free)
+    fleet.add_instance(config, "a")
+    fleet.add_instance(config, "b")
+    managers = {"config": config}
+
+    try:
+        cmd_start.run_all(managers)
+        capsys.readouterr()
+
+        cmd_status.run_all(managers, as_json=True)
+        snapshots = json.loads(capsys.readouterr().out)
+        assert [s["instance"] for s in snapshots] == ["default", "a", "b"]
+        assert all(s["running"] for s in snapshots)
+    finally:
+        cmd_stop.run_all(managers)
+
+    cmd_status.run_all(managers, as_json=True)
+    out = capsys.readouterr().out.splitlines()[-1]
+    assert not any(s["running"] for s in json.loads(out))
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="uses a shebang script")
+def test_stop_leaves_other_routers_running(config, fake_bin, tmp_path, monkeypatch):
+    """Test the main router finds and stops only its own i2pd"""
+    monkeypatch.setattr(fleet, "port_is_free", always_free)
+    config.set("i2pd.console_port", 17070)
+    fleet.add_instance(config, "a")
+    routers = fleet.instance_managers(config)
+    main, instance = routers["default"]["i2pd"], routers["a"]["i2pd"]
+    instance_port = routers["a"]["config"].get("i2pd.console_port")
+
+    # A system service router, outside any data directory we manage
+    service_dir = tmp_path / "service"
+    service_dir.mkdir()
+    (service_dir / "i2pd.conf").write_text("[http]\nport = 17080\n")
+    service = subprocess.Popen([str(fake_bin), f"--conf={service_dir / 'i2pd.conf'}"])
+
+    def no_sudo(command, **kwargs):
+        raise subprocess.CalledProcessError(1, command)
+
+    try:
+        assert cmd_start.start_instance("a", routers["a"]) == "started"
+        monkeypatch.setattr(i2pd_module.subprocess, "run", no_sudo)
+        main.platform = "linux"
+
+        assert main._find_process().pid == service.pid
+        assert instance._find_process().pid == instance.native_pid()
+
+        main.stop()
+        assert service.wait(5) == 0
+        assert instance.is_running(instance_port)
+
+        assert main._find_process() is None
+        main.stop()
+        assert instance.is_running(instance_port)
+    finally:
+        instance.stop()
+        service.kill()
+        service.wait()
@@ -0,0 +1,269 @@
+"""Tests for the caching HTTP proxy"""
+
+import asyncio
+import time
+import zlib
+from email.utils import formatdate
+from i2p_manager.httpcache import (
+    CachingProxy,
+    DiskCache,
+    freshness_lifetime,
+    is_storable,
+    needs_revalidation,
+)
+
+NOW = 1_700_000_000.0
+
+
+def date(offset=0):
+    return formatdate(NOW + offset, usegmt=True)
+
+
+class TestCachingRules:
+    """Test freshness and storability"""
+
+    def test_freshness_lifetime(self):
+        """Test max-age beats Expires, which beats the heuristic"""
+        headers = [("Cache-Control", "public, max-age=60"), ("Expires", date(999))]
+        assert freshness_lifetime(200, headers, NOW) == 60
+
+        headers = [("Date", date()), ("Expires", date(300))]
+        assert freshness_lifetime(200, headers, NOW) == 300
+        assert freshness_lifetime(200, [("Expires", "0")], NOW) == 0
+
+        headers = [("Date", date()), ("Last-Modified", date(-1000))]
+        assert freshness_lifetime(200, headers, NOW) == 100
+        assert freshness_lifetime(302, headers, NOW) == 0
+
+    def test_storable(self):
+        """Test no-store, Vary: * and uncacheable statuses are not stored"""
+        assert is_storable(200, [], [])
+        assert not is_storable(200, [], [("Cache-Control", "no-store")])
+        assert not is_storable(200, [("Cache-Control", "no-store")], [])
+        assert not is_storable(200, [], [("Vary", "*")])
+        assert not is_storable(302, [], [])
+        assert is_storable(302, [], [("Cache-Control", "max-age=5")])
+
+    def test_needs_revalidation(self):
+        """Test stale, no-cache and client max-age force validation"""
+        entry = {
+            "headers": [("Cache-Control", "max-age=60")],
+            "request_time": NOW,
+            "response_time": NOW,
+            "lifetime": 60,
+        }
+        assert not needs_revalidation(entry, [], NOW + 30)
+        assert needs_revalidation(entry, [], NOW + 61)
+        assert needs_revalidation(entry, [("Pragma", "no-cache")], NOW + 1)
+        assert needs_revalidation(entry, [("Cache-Control", "max-age=10")], NOW + 30)
+
+        entry["headers"] = [("Cache-Control", "no-cache")]
+        assert needs_revalidation(entry, [], NOW)
+
+
+class TestDiskCache:
+    """Test storage, eviction and the index"""
+
+    def put(self, cache, url, size, headers=()):
+        return cache.put(url, [], 200, "OK", list(headers), b"x" * size, NOW, NOW)
+
+    def test_lru_eviction(self, tmp_path):
+        """Test the least recently used entries go first"""
+        cache = DiskCache(tmp_path, max_bytes=8000)
+        for name in "abcdefgh":
+            self.put(cache, f"http://{name}.i2p/", 1000)
+
+        cache.get("http://a.i2p/", [])
+        self.put(cache, "http://i.i2p/", 1000)
+
+        urls = [entry["url"] for entry in cache.entries.values()]
+        assert urls[0] == "http://c.i2p/"
+        assert urls[-2:] == ["http://a.i2p/", "http://i.i2p/"]
+        assert cache.size == 8000
+        assert cache.stats["evicted"] == 1
+        assert not self.put(cache, "http://huge.i2p/", 1001)  # over 1/8 of size
+
+    def test_index_survives_restart(self, tmp_path):
+        """Test entries and counters are reloaded from the index"""
+        cache = DiskCache(tmp_path, max_bytes=10**6)
+        self.put(cache, "http://a.i2p/", 10)
+        self.put(cache, "http://b.i2p/", 10)
+        cache.record("hits")
+        cache.flush()
+        (cache._body_path(cache.key("http://b.i2p/"))).unlink()
+
+        reopened = DiskCache(tmp_path, max_bytes=10**6)
+        assert [e["url"] for e in reopened.entries.values()] == ["http://a.i2p/"]
+        assert reopened.get("http://a.i2p/", [])[1] == b"x" * 10
+        assert reopened.stats["hits"] == 1
+
+    def test_vary(self, tmp_path):
+        """Test a stored variant only matches the same request headers"""
+        cache = DiskCache(tmp_path, max_bytes=10**6)
+        request = [("Accept-Language", "en")]
+        cache.put(
+            "http://a.i2p/",
+            request,
+            200,
+            "OK",
+            [("Vary", "Accept-Language")],
+            b"x",
+            0,
+            0,
+        )
+
+        assert cache.get("http://a.i2p/", request)
+        assert cache.get("http://a.i2p/", [("Accept-Language", "de")]) is None
+
+
+async def get(port, url, headers=""):
+    """Fetch a URL through the proxy on a fresh connection"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {url} HTTP/1.1\r\nHost: x\r\n{headers}\r\n".encode())
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+    body = await reader.readexactly(length)
+    writer.close()
+    return int(head.split()[1]), body
+
+
+def run_proxy(tmp_path, fake_i2pd, scenario):
+    """Run a scenario against a caching proxy in front of the fake router"""
+
+    async def main():
+        cache = DiskCache(tmp_path, max_bytes=10**6)
+        proxy = CachingProxy(cache, ("127.0.0.1", fake_i2pd.proxy_port), port=0)
+        await proxy.start()
+        try:
+            await scenario(proxy.port)
+        finally:
+            await proxy.stop()
+        return cache
+
+    return asyncio.run(main())
+
+
+def test_repeat_requests_served_locally(fake_i2pd, tmp_path):
+    """Test fresh responses skip the router and are counted as hits"""
+    fake_i2pd.site_max_age = 300
+    fake_i2pd.site_latency = 0.2
+
+    async def scenario(port):
+        status, first = await get(port, "http://site.i2p/logo.png")
+        started = time.perf_counter()
+        status, second = await get(port, "http://site.i2p/logo.png")
+        assert time.perf_counter() - started < 0.1
+        assert status == 200 and second == first
+
+        # A client revalidating its own copy gets a local 304
+        etag = '"%08x"' % zlib.crc32(b"site.i2p/logo.png")
+        status, _ = await get(
+            port, "http://site.i2p/logo.png", f"If-None-Match: {etag}\r\n"
+        )
+        assert status == 304
+
+    cache = run_proxy(tmp_path, fake_i2pd, scenario)
+
+    assert fake_i2pd.requests["proxy"] == 1
+    assert cache.stats["hits"] == 2
+    assert cache.hit_ratio() == 2 / 3
+    assert (tmp_path / "index.json").exists()
+
+
+def test_stale_responses_revalidated(fake_i2pd, tmp_path):
+    """Test a stale entry is checked with If-None-Match and reused on 304"""
+    fake_i2pd.site_max_age = 0
+
+    async def scenario(port):
+        _, first = await get(port, "http://site.i2p/")
+        status, second = await get(port, "http://site.i2p/")
+        assert status == 200 and second == first
+
+    cache = run_proxy(tmp_path, fake_i2pd, scenario)
+
+    assert fake_i2pd.requests["proxy"] == 2
+    assert cache.stats == dict(cache.stats, misses=1, revalidated=1, hits=0)
+
+
+def test_stale_served_when_router_fails(fake_i2pd, tmp_path):
+    """Test a stale copy stands in for a router error"""
+    fake_i2pd.site_max_age = 0
+
+    async def scenario(port):
+        _, first = await get(port, "http://site.i2p/")
+        fake_i2pd.unreachable.add("site.i2p")
+        fake_i2pd.error_rate = 1.0
+        status, second = await get(port, "http://site.i2p/")
+        assert status == 200 and second == first
+
+    run_proxy(tmp_path, fake_i2pd, scenario)
+
+
+async def get_raw(port, url, headers=""):
+    """Fetch a URL, reading until the proxy closes the connection"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"GET {url} HTTP/1.1\r\nHost: x\r\nConnection: close\r\n{headers}\r\n".encode()
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    body = await reader.read()
+    writer.close()
+    return int(head.split()[1]), body
+
+
+def test_conditional_miss_not_stored(fake_i2pd, tmp_path):
+    """Test a 304 for the browser's own copy never replaces the page"""
+    fake_i2pd.site_max_age = 300
+    etag = '"%08x"' % zlib.crc32(b"site.i2p/")
+
+    async def scenario(port):
+        status, _ = await get_raw(
+            port, "http://site.i2p/", f"If-None-Match: {etag}\r\n"
+        )
+        assert status == 304
+        status, body = await get(port, "http://site.i2p/")
+        assert status == 200 and len(body) == fake_i2pd.site_size
+
+    cache = run_proxy(tmp_path, fake_i2pd, scenario)
+    assert [e["status"] for e in cache.entries.values()] == [200]
+
+
+def test_revalidation_uses_cached_validators(fake_i2pd, tmp_path):
+    """Test the browser's validators are replaced by the cache's own"""
+    fake_i2pd.site_max_age = 0
+
+    async def scenario(port):
+        _, first = await get(port, "http://site.i2p/")
+        status, second = await get(
+            port, "http://site.i2p/", 'If-None-Match: "stale-browser-copy"\r\n'
+        )
+        assert status == 200 and second == first
+
+    cache = run_proxy(tmp_path, fake_i2pd, scenario)
+    assert cache.stats["revalidated"] == 1
+
+
+def test_large_unsized_body_relayed_intact(tmp_path):
+    """Test a body too big to cache and without Content-Length arrives whole"""
+    body = bytes(range(256)) * 4000  # 1,024,000 bytes
+
+    async def upstream(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(b"HTTP/1.1 200 OK\r\nConnection: close\r\n\r\n" + body)
+        await writer.drain()
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(upstream, "127.0.0.1", 0)
+        cache = DiskCache(tmp_path, max_bytes=2**20)
+        proxy = CachingProxy(cache, server.sockets[0].getsockname()[:2], port=0)
+        await proxy.start()
+        try:
+            return await get_raw(proxy.port, "http://big.i2p/")
+        finally:
+            await proxy.stop()
+            server.close()
+
+    status, received = asyncio.run(main())
+    assert status == 200
+    assert received == body
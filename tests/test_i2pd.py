@@ -1,5 +1,11 @@
 """Tests for I2Pd daemon control"""
 
+import os
+import sys
+import time
+from pathlib import Path
+
+import psutil
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from i2p_manager.i2pd import I2PdManager
@@ -36,25 +42,28 @@ class TestI2PdManager:
         mock_which.return_value = None
         assert i2pd_manager.is_installed() is False
 
-    @patch("i2p_manager.i2pd.requests.get")
-    def test_is_running_true(self, mock_get, i2pd_manager):
+    @patch("requests.Session")
+    def test_is_running_true(self, mock_session, i2pd_manager):
         """Test I2Pd running detection"""
+        mock_get = mock_session.return_value.get
         mock_response = Mock()
         mock_response.status_code = 200
         mock_get.return_value = mock_response
 
         assert i2pd_manager.is_running(7070) is True
 
-    @patch("i2p_manager.i2pd.requests.get")
-    def test_is_running_false(self, mock_get, i2pd_manager):
+    @patch("requests.Session")
+    def test_is_running_false(self, mock_session, i2pd_manager):
         """Test I2Pd not running detection"""
+        mock_get = mock_session.return_value.get
         mock_get.side_effect = Exception("Connection refused")
 
         assert i2pd_manager.is_running(7070) is False
 
-    @patch("i2p_manager.i2pd.requests.get")
-    def test_get_status_running(self, mock_get, i2pd_manager):
+    @patch("requests.Session")
+    def test_get_status_running(self, mock_session, i2pd_manager):
         """Test status when I2Pd is running"""
+        mock_get = mock_session.return_value.get
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.text = "Client Tunnels: 8\nKnown Routers: 156"
@@ -66,9 +75,27 @@ class TestI2PdManager:
         assert status["tunnels"] == 8
         assert status["peers"] == 156
 
-    @patch("i2p_manager.i2pd.requests.get")
-    def test_get_status_not_running(self, mock_get, i2pd_manager):
+    @patch("requests.Session")
+    def test_get_status_bandwidth(self, mock_session, i2pd_manager):
+        """Test transfer rates are parsed from the status page"""
+        mock_get = mock_session.return_value.get
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.text = (
+            "<b>Received:</b> 12.34 MiB (5.67 KiB/s)<br>"
+            "<b>Sent:</b> 8.00 MiB (1.25 KiB/s)<br>"
+        )
+        mock_get.return_value = mock_response
+
+        status = i2pd_manager.get_status(7070)
+
+        assert status["bandwidth_in"] == 5.67
+        assert status["bandwidth_out"] == 1.25
+
+    @patch("requests.Session")
+    def test_get_status_not_running(self, mock_session, i2pd_manager):
         """Test status when I2Pd is not running"""
+        mock_get = mock_session.return_value.get
         mock_get.side_effect = Exception("Connection refused")
 
         status = i2pd_manager.get_status(7070)
@@ -77,6 +104,77 @@ class TestI2PdManager:
         assert status["tunnels"] == 0
         assert status["peers"] == 0
 
+    @patch("requests.Session")
+    def test_get_status_console_metrics(self, mock_session, i2pd_manager):
+        """Test uptime, network status and tunnel stats are parsed"""
+        mock_get = mock_session.return_value.get
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.text = (
+            "<b>Uptime:</b> 1 days, 2 hours, 3 minutes, 4 seconds<br>\n"
+            "<b>Network status:</b> Firewalled<br>\n"
+            "<b>Tunnel creation success rate:</b> 42%<br>\n"
+            "<b>Client Tunnels:</b> 8 <b>Transit Tunnels:</b> 21<br>\n"
+        )
+        mock_get.return_value = mock_response
+
+        status = i2pd_manager.get_status(7070)
+
+        assert status["uptime"] == 93784
+        assert status["network_status"] == "Firewalled"
+        assert status["tunnel_success_rate"] == 42
+        assert status["transit_tunnels"] == 21
+
+    @patch("requests.Session")
+    def test_session_reused(self, mock_session, i2pd_manager):
+        """Test console requests share one pooled session per thread"""
+        mock_session.return_value.get.return_value = Mock(status_code=200, text="")
+
+        i2pd_manager.get_status(7070)
+        i2pd_manager.get_status(7070)
+        i2pd_manager.is_running(7070)
+
+        assert mock_session.call_count == 1
+        assert mock_session.return_value.get.call_count == 3
+
+    @patch("i2p_manager.i2pd.psutil.process_iter")
+    def test_get_process_info(self, mock_iter, i2pd_manager):
+        """Test the i2pd process is found once and then reused"""
+        proc = MagicMock()
+        proc.info = {"name": "i2pd", "cmdline": ["i2pd", "--daemon"]}
+        proc.pid = 4242
+        proc.cpu_percent.return_value = 1.5
+        proc.memory_info.return_value = Mock(rss=50 * 1024 * 1024)
+        proc.num_threads.return_value = 12
+        proc.create_time.return_value = 0
+        other = Mock(info={"name": "bash", "cmdline": ["bash"]})
+        mock_iter.return_value = [other, proc]
+
+        info = i2pd_manager.get_process_info()
+        i2pd_manager.get_process_info()
+
+        assert info["pid"] == 4242
+        assert info["threads"] == 12
+        assert info["memory_rss"] == 50 * 1024 * 1024
+        assert mock_iter.call_count == 1
+
+    def test_get_status_from_console(self, fake_i2pd, i2pd_manager):
+        """Test parsing a realistic console page"""
+        status = i2pd_manager.get_status(fake_i2pd.console_port)
+
+        assert status["running"] is True
+        assert status["peers"] > 1000
+        assert status["tunnels"] == 12
+        assert status["transit_tunnels"] > 100
+        assert status["network_status"] == "OK"
+        assert status["bandwidth_in"] > 0
+
+    def test_get_status_router_down(self, fake_i2pd, i2pd_manager):
+        """Test starting, crashed and hung routers are not running"""
+        for state in ("starting", "crashed", "hung"):
+            fake_i2pd.set_state(state)
+            assert i2pd_manager.get_status(fake_i2pd.console_port)["running"] is False
+
     def test_extract_stat(self, i2pd_manager):
         """Test extracting stats from HTML"""
         html = "Client Tunnels: 8\nKnown Routers: 156"
@@ -92,3 +190,88 @@ class TestI2PdManager:
         html = "Some text"
         result = i2pd_manager._extract_stat(html, r"Nonexistent[^\d]*(\d+)")
         assert result == 0
+
+    def test_stop_service_owned_by_root(self, i2pd_manager, monkeypatch):
+        """Test stopping another user's i2pd fails with a clear error"""
+        proc = Mock(pid=99)
+        proc.terminate.side_effect = psutil.AccessDenied(99)
+        monkeypatch.setattr(i2pd_manager, "_find_process", lambda: proc)
+
+        with pytest.raises(PermissionError, match="owned by another user"):
+            i2pd_manager._stop_found_process()
+
+
+FAKE_I2PD = """#!{python}
+import sys, time
+print("i2pd starting", *sys.argv[1:], flush=True)
+print("oops", file=sys.stderr, flush=True)
+time.sleep(60)
+"""
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script")
+class TestNativeBackend:
+    """Test spawning i2pd directly as the current user"""
+
+    @pytest.fixture
+    def native(self, tmp_path, monkeypatch):
+        """I2PdManager with a native backend and a stand-in i2pd on PATH"""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        script = bin_dir / "i2pd"
+        script.write_text(FAKE_I2PD.format(python=sys.executable))
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", str(bin_dir), prepend=os.pathsep)
+        monkeypatch.setenv("PYTHONPATH", str(Path(__file__).parent.parent))
+
+        monkeypatch.setattr(ConfigManager, "get_config_dir", lambda self: tmp_path)
+        config = ConfigManager()
+        config.init()
+        config.set("i2pd.backend", "native")
+        config.set("i2pd.http_port", 14444)
+
+        manager = I2PdManager(config)
+        yield manager
+        manager.stop_native(timeout=2)
+
+    def test_start_and_stop(self, native):
+        """Test start spawns i2pd with its own datadir, conf and log"""
+        data_dir = native.get_data_dir()
+        native.start()
+
+        pid = native.native_pid()
+        assert pid is not None
+        assert native.get_process_info()["pid"] == pid
+        assert "port = 14444" in (data_dir / "i2pd.conf").read_text()
+
+        # Starting again reuses the running process
+        native.start()
+        assert native.native_pid() == pid
+
+        log = data_dir / "i2pd.log"
+        deadline = time.time() + 5
+        while "oops" not in (log.read_text() if log.exists() else ""):
+            assert time.time() < deadline
+            time.sleep(0.05)
+        assert f"--datadir={data_dir}" in log.read_text()
+        assert native._get_log_path() == log
+
+        native.stop()
+        assert native.native_pid() is None
+        assert not psutil.pid_exists(pid) or psutil.Process(pid).status() == "zombie"
+        assert not (data_dir / "i2pd.pid").exists()
+
+    def test_stale_pid_file_ignored(self, native):
+        """Test a pid file from a dead process is cleaned up"""
+        data_dir = native.get_data_dir()
+        data_dir.mkdir(parents=True)
+        (data_dir / "i2pd.pid").write_text(f"{os.getpid()} 12345.0\n")
+
+        assert native.native_pid() is None
+        assert not (data_dir / "i2pd.pid").exists()
+
+    def test_missing_executable(self, native, monkeypatch):
+        """Test a clear error when i2pd is not installed"""
+        monkeypatch.setattr("i2p_manager.i2pd.shutil.which", lambda name: None)
+        with pytest.raises(FileNotFoundError):
+            native.start()
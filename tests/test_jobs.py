@@ -0,0 +1,59 @@
+"""Tests for background jobs"""
+
+import threading
+import pytest
+from i2p_manager.jobs import JobRunner
+
+
+class TestJobRunner:
+    """Test JobRunner class"""
+
+    @pytest.fixture
+    def runner(self):
+        """Create JobRunner fixture"""
+        return JobRunner()
+
+    def test_job_reports_progress_and_result(self, runner):
+        """Test a job publishes progress and its final message"""
+        messages = []
+        runner.on_change = lambda job: messages.append((job.state, job.message))
+
+        def work(report):
+            report("step one")
+            return "finished"
+
+        job = runner.submit("Work", work, group="lifecycle")
+        assert runner.wait(timeout=2)
+
+        assert ("running", "step one") in messages
+        assert job.state == "done"
+        assert job.message == "finished"
+        assert runner.latest() is job
+
+    def test_conflicting_job_refused(self, runner):
+        """Test a second job in the same group is refused while one runs"""
+        release = threading.Event()
+
+        first = runner.submit("Start", lambda report: release.wait(2), "lifecycle")
+        second = runner.submit("Stop", lambda report: None, "lifecycle")
+        other = runner.submit("Browser", lambda report: None, "browser")
+
+        release.set()
+        assert runner.wait(timeout=2)
+
+        assert first is not None
+        assert second is None
+        assert other is not None
+
+    def test_failed_job(self, runner):
+        """Test exceptions mark the job failed"""
+
+        def work(report):
+            raise RuntimeError("boom")
+
+        job = runner.submit("Fail", work, group="lifecycle")
+        assert runner.wait(timeout=2)
+
+        assert job.state == "failed"
+        assert "boom" in job.message
+        assert runner.running() == []
@@ -0,0 +1,52 @@
+"""Tests for rotating log capture"""
+
+import subprocess
+import sys
+from pathlib import Path
+from i2p_manager.logpipe import RotatingWriter
+
+
+def test_rotates_at_line_breaks(tmp_path):
+    """Test the log rotates before overflowing, keeping whole lines"""
+    log = tmp_path / "i2pd.log"
+    writer = RotatingWriter(log, max_bytes=100, backups=2)
+
+    for i in range(30):
+        writer.write(f"line {i:02d} ..........\n".encode())
+    writer.close()
+
+    files = [log, tmp_path / "i2pd.log.1", tmp_path / "i2pd.log.2"]
+    assert all(path.stat().st_size <= 100 for path in files)
+    assert not (tmp_path / "i2pd.log.3").exists()
+    assert all(
+        line.startswith("line ")
+        for path in files
+        for line in path.read_text().splitlines()
+    )
+    assert log.read_text().splitlines()[-1].startswith("line 29")
+
+
+def test_appends_to_existing_log(tmp_path):
+    """Test an existing log's size counts towards rotation"""
+    log = tmp_path / "i2pd.log"
+    log.write_bytes(b"x" * 90 + b"\n")
+
+    writer = RotatingWriter(log, max_bytes=100, backups=1)
+    writer.write(b"0123456789\n")
+    writer.close()
+
+    assert log.read_bytes() == b"0123456789\n"
+    assert (tmp_path / "i2pd.log.1").read_bytes() == b"x" * 90 + b"\n"
+
+
+def test_pipe_until_eof(tmp_path):
+    """Test running as a pipe copies stdin and exits at EOF"""
+    log = tmp_path / "out.log"
+    subprocess.run(
+        [sys.executable, "-m", "i2p_manager.logpipe", str(log)],
+        input=b"hello\nworld\n",
+        check=True,
+        timeout=10,
+        cwd=Path(__file__).parent.parent,
+    )
+    assert log.read_text() == "hello\nworld\n"
@@ -0,0 +1,95 @@
+"""Tests for incremental log tailing"""
+
+import pytest
+from i2p_manager.logtail import LogTail, parse_level
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """Create an empty log file"""
+    path = tmp_path / "i2pd.log"
+    path.write_text("")
+    return path
+
+
+def append(path, text):
+    """Append text to the log file"""
+    with open(path, "a") as f:
+        f.write(text)
+
+
+class TestLogTail:
+    """Test LogTail class"""
+
+    def test_reads_only_new_lines(self, log_file):
+        """Test each poll picks up appended lines once"""
+        tail = LogTail(log_file)
+        append(log_file, "12:00:00@1/info - first\n")
+
+        assert tail.poll() == 1
+        assert tail.poll() == 0
+
+        append(log_file, "12:00:01@1/error - second\n")
+        assert tail.poll() == 1
+        assert [line.text for line in tail.lines] == [
+            "12:00:00@1/info - first",
+            "12:00:01@1/error - second",
+        ]
+
+    def test_partial_line_held_back(self, log_file):
+        """Test a line is only emitted once it is complete"""
+        tail = LogTail(log_file)
+        append(log_file, "12:00:00@1/warn - half")
+
+        assert tail.poll() == 0
+        append(log_file, " done\n")
+        assert tail.poll() == 1
+        assert tail.lines[0].text == "12:00:00@1/warn - half done"
+        assert tail.lines[0].level == "warn"
+
+    def test_rotation(self, log_file):
+        """Test a replaced or truncated file is read from the start"""
+        tail = LogTail(log_file)
+        append(log_file, "12:00:00@1/info - old line\n")
+        tail.poll()
+
+        log_file.write_text("12:00:05@1/info - new\n")
+        assert tail.poll() == 1
+        assert tail.lines[-1].text == "12:00:05@1/info - new"
+
+    def test_skips_ahead_when_behind(self, log_file):
+        """Test a burst larger than max_read only keeps the newest lines"""
+        tail = LogTail(log_file, max_read=100)
+        tail.poll()
+        append(log_file, "".join(f"12:00:00@1/debug - line {i}\n" for i in range(50)))
+
+        tail.poll()
+
+        assert tail.lines[-1].text.endswith("line 49")
+        assert len(tail.lines) < 5
+        assert all(line.text.startswith("12:00:00@1/debug") for line in tail.lines)
+
+    def test_tail_filters_by_level(self, log_file):
+        """Test tail() only returns lines at or above a level"""
+        tail = LogTail(log_file)
+        append(
+            log_file,
+            "12:00:00@1/debug - a\n12:00:00@1/error - b\n"
+            "12:00:00@1/info - c\n12:00:00@1/warn - d\n",
+        )
+        tail.poll()
+
+        assert [line.text[-1] for line in tail.tail(10, "warn")] == ["b", "d"]
+        assert [line.text[-1] for line in tail.tail(2)] == ["c", "d"]
+
+    def test_missing_file(self, tmp_path):
+        """Test polling a log that doesn't exist yet"""
+        assert LogTail(tmp_path / "missing.log").poll() == 0
+        assert LogTail(None).poll() == 0
+
+
+def test_parse_level():
+    """Test level parsing from i2pd log lines"""
+    assert parse_level("18:20:41@432/critical - boom") == "critical"
+    assert parse_level("18:20:41@432/warn - slow") == "warn"
+    assert parse_level("plain line") == "info"
@@ -0,0 +1,189 @@
+"""Tests for background status polling"""
+
+import time
+import pytest
+from unittest.mock import Mock
+from i2p_manager.config import ConfigManager
+from i2p_manager.polling import (
+    MetricsHistory,
+    PollPolicy,
+    StatusPoller,
+    integration_phase,
+)
+
+
+class TestStatusPoller:
+    """Test StatusPoller class"""
+
+    @pytest.fixture
+    def i2pd(self):
+        """Create mocked I2PdManager"""
+        i2pd = Mock()
+        i2pd.get_status.return_value = {"running": True, "peers": 12, "tunnels": 3}
+        return i2pd
+
+    @pytest.fixture
+    def poller(self, i2pd):
+        """Create StatusPoller fixture"""
+        return StatusPoller(i2pd, ConfigManager(), interval=60)
+
+    def test_poll_once_publishes_snapshot(self, poller):
+        """Test a poll publishes an immutable snapshot"""
+        snapshot = poller.poll_once()
+
+        assert poller.snapshot is snapshot
+        assert snapshot.seq == 1
+        assert snapshot.status["peers"] == 12
+        assert snapshot.stale_since is None
+        with pytest.raises(TypeError):
+            snapshot.status["peers"] = 0
+
+    def test_failed_poll_keeps_last_status(self, poller, i2pd):
+        """Test a failed poll marks data stale without dropping it"""
+        poller.poll_once()
+        i2pd.get_status.side_effect = Exception("timeout")
+
+        snapshot = poller.poll_once()
+
+        assert snapshot.status["peers"] == 12
+        assert snapshot.stale_since is not None
+        assert snapshot.error == "timeout"
+        assert poller.is_stale() is True
+
+    def test_request_refresh_wakes_thread(self, poller):
+        """Test refresh requests trigger a poll before the interval ends"""
+        poller.start()
+        try:
+            deadline = time.time() + 2
+            while poller.snapshot.seq < 1 and time.time() < deadline:
+                time.sleep(0.01)
+
+            poller.request_refresh()
+            poller.request_refresh()
+
+            while poller.snapshot.seq < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            assert poller.snapshot.seq >= 2
+        finally:
+            poller.stop(timeout=1)
+
+
+def test_poller_follows_integration(fake_i2pd):
+    """Test polling a router through start-up and integration"""
+    from i2p_manager.i2pd import I2PdManager
+
+    fake_i2pd.run_script([("starting", 0.1), ("integrating", 0.2), ("integrated", 0)])
+    config = Mock()
+    config.get.return_value = fake_i2pd.console_port
+    poller = StatusPoller(I2PdManager(config), config, interval=60)
+
+    phases = []
+    deadline = time.time() + 2
+    while time.time() < deadline and "connected" not in phases:
+        phase = integration_phase(poller.poll_once().status)
+        if not phases or phases[-1] != phase:
+            phases.append(phase)
+        time.sleep(0.02)
+
+    assert phases[0] == "stopped"
+    assert phases[-1] == "connected"
+    assert "connecting" in phases or "integrating" in phases
+
+
+class TestPollPolicy:
+    """Test PollPolicy class"""
+
+    @pytest.fixture
+    def policy(self):
+        """Create PollPolicy fixture"""
+        return PollPolicy(base_interval=5, fast_interval=1, max_interval=40)
+
+    def test_fast_while_integrating(self, policy):
+        """Test polling stays fast below the integration threshold"""
+        status = {"running": True, "peers": 20, "tunnels": 2}
+        assert policy.next_interval(status) == 1
+        assert policy.next_interval(status) == 1
+
+    def test_backoff_when_stable(self, policy):
+        """Test stable integrated nodes back off up to the maximum"""
+        status = {"running": True, "peers": 200, "tunnels": 8}
+
+        intervals = [policy.next_interval(status) for _ in range(6)]
+
+        assert intervals == [5, 10, 20, 40, 40, 40]
+
+    def test_snap_back_on_change(self, policy):
+        """Test phase changes and pokes reset the cadence"""
+        status = {"running": True, "peers": 200, "tunnels": 8}
+        for _ in range(4):
+            policy.next_interval(status)
+
+        assert policy.next_interval({"running": True, "peers": 30}) == 1
+
+        for _ in range(4):
+            policy.next_interval(status)
+        policy.poke()
+        assert policy.interval == 1
+        assert policy.next_interval(status) == 1
+
+    def test_poke_polls_fast_then_backs_off(self, policy):
+        """Test the poll right after a poke is fast, even when stable"""
+        status = {"running": True, "peers": 200, "tunnels": 8}
+        for _ in range(4):
+            policy.next_interval(status)
+
+        policy.poke()
+        intervals = [policy.next_interval(status) for _ in range(4)]
+        assert intervals == [1, 2, 4, 8]
+
+    def test_poller_uses_policy(self):
+        """Test the poller takes its interval from the policy"""
+        i2pd = Mock()
+        i2pd.get_status.return_value = {"running": True, "peers": 200, "tunnels": 8}
+        poller = StatusPoller(i2pd, ConfigManager(), policy=PollPolicy(5, 1, 40))
+
+        poller.poll_once()
+        poller.poll_once()
+
+        assert poller.interval == 10
+
+
+def test_integration_phase():
+    """Test status classification thresholds"""
+    assert integration_phase(None) == "stopped"
+    assert integration_phase({"running": False}) == "stopped"
+    assert integration_phase({"running": True, "peers": 5}) == "connecting"
+    assert integration_phase({"running": True, "peers": 10}) == "integrating"
+    assert integration_phase({"running": True, "peers": 50}) == "connected"
+
+
+class TestMetricsHistory:
+    """Test MetricsHistory class"""
+
+    def test_eta_from_linear_growth(self):
+        """Test ETA extrapolates steady peer growth"""
+        history = MetricsHistory(trend_window=5)
+        for i in range(10):
+            history.add({"running": True, "peers": 2 * i}, 1000.0 + 10 * i)
+
+        # 2 peers per 10 s, currently 18 peers -> 32 to go = 160 s
+        assert history.peer_rate() == pytest.approx(0.2)
+        assert history.eta_to_integrated() == pytest.approx(160)
+
+    def test_eta_none_when_stuck(self):
+        """Test no ETA is given when peers aren't growing"""
+        history = MetricsHistory()
+        for i in range(5):
+            history.add({"running": True, "peers": 20}, 1000.0 + i)
+
+        assert history.peer_rate() == pytest.approx(0)
+        assert history.eta_to_integrated() is None
+
+    def test_history_bounded(self):
+        """Test samples are capped and integrated routers report zero ETA"""
+        history = MetricsHistory(size=3)
+        for i in range(5):
+            history.add({"running": True, "peers": 100 + i, "tunnels": i}, float(i))
+
+        assert list(history.samples["tunnels"]) == [2, 3, 4]
+        assert history.eta_to_integrated() == 0
@@ -0,0 +1,56 @@
+"""Tests for the eepsite probe"""
+
+import time
+from i2p_manager.probe import normalize_target, percentile, probe, summarize
+
+B32 = "ukeu3k5oycgaauneqgtnvselmt4yemvoilkln7jpvamvfx7dnkdq"
+
+
+def test_normalize_target():
+    """Test hosts and b32 addresses become proxy URLs"""
+    assert normalize_target("http://site.i2p/x") == "http://site.i2p/x"
+    assert normalize_target("site.i2p") == "http://site.i2p/"
+    assert normalize_target(f"{B32.upper()}/feed") == f"http://{B32}.b32.i2p/feed"
+
+
+def test_percentile():
+    """Test interpolated percentiles"""
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile([0, 10], 90) == 9
+
+
+def test_probe_concurrently(fake_i2pd):
+    """Test targets are fetched in parallel and failures are retried"""
+    fake_i2pd.site_latency = 0.2
+    fake_i2pd.unreachable.add("down.i2p")
+    proxy = ("127.0.0.1", fake_i2pd.proxy_port)
+    targets = ["a.i2p", "b.i2p", B32, "down.i2p"]
+
+    started = time.perf_counter()
+    results = probe(targets, proxy, concurrency=4, retries=1, retry_delay=0.01)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.8  # serial would take over 1s
+    assert [r.ok for r in results] == [True, True, True, False]
+    assert results[2].url == f"http://{B32}.b32.i2p/"
+    assert all(r.ttfb >= 0.2 and r.size == 2048 for r in results[:3])
+    assert results[3].error == "HTTP 504"
+    assert results[3].attempts == 2
+
+    summary = summarize(results)
+    assert summary["ok"] == 3
+    assert summary["ttfb"]["p50"] <= summary["total"]["p50"]
+
+
+def test_probe_deadline(fake_i2pd):
+    """Test a hung proxy is abandoned at the target's deadline"""
+    fake_i2pd.set_state("hung")
+    proxy = ("127.0.0.1", fake_i2pd.proxy_port)
+
+    started = time.perf_counter()
+    [result] = probe(["a.i2p"], proxy, deadline=0.5, retries=3)
+
+    assert time.perf_counter() - started < 1
+    assert result.error == "timeout"
+    assert not result.ok
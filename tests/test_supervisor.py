@@ -0,0 +1,215 @@
+"""Tests for the router supervisor"""
+
+import time
+import pytest
+from unittest.mock import Mock, patch
+from i2p_manager import fleet, supervisor as supervisor_module
+from i2p_manager.config import ConfigManager
+from i2p_manager.i2pd import I2PdManager
+from i2p_manager.supervisor import RestartPolicy, Supervisor, load_history
+
+UP = {"running": True, "uptime": 60, "tunnel_success_rate": 30}
+DOWN = {"running": False}
+
+
+class Clock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def i2pd():
+    """Router mock that is up with a live process"""
+    i2pd = Mock()
+    i2pd.get_status.return_value = UP
+    i2pd.get_process_info.return_value = {"pid": 42}
+    return i2pd
+
+
+def make_supervisor(i2pd, clock, **settings):
+    settings.setdefault("start_timeout", 0)
+    return Supervisor(i2pd, ConfigManager(), clock=clock, **settings)
+
+
+class TestSupervisor:
+    """Test health checks and restart decisions"""
+
+    def test_dead_router_restarted_at_once(self, i2pd, clock, tmp_path):
+        """Test a missing process is started on the first failed check"""
+        i2pd.get_status.return_value = DOWN
+        i2pd.get_process_info.return_value = None
+        history = tmp_path / "supervisor.jsonl"
+        supervisor = make_supervisor(i2pd, clock)
+        supervisor.history_path = history
+
+        supervisor.step()
+        i2pd.start.assert_called_once()
+        i2pd.stop.assert_not_called()
+
+        clock.now = 12.5
+        i2pd.get_status.return_value = UP
+        supervisor.step()
+
+        assert supervisor.incident is None
+        assert supervisor.mean_time_to_recover() == 12.5
+        [record] = load_history(history)
+        assert record["reason"] == "down"
+        assert record["restarts"] == 1
+        assert record["time_to_recover"] == 12.5
+
+    def test_hung_router_gets_a_few_chances(self, i2pd, clock):
+        """Test an unresponsive console is restarted after repeated failures"""
+        i2pd.get_status.return_value = DOWN
+        supervisor = make_supervisor(i2pd, clock)
+
+        supervisor.step()
+        supervisor.step()
+        i2pd.start.assert_not_called()
+
+        supervisor.step()
+        i2pd.stop.assert_called_once()
+        i2pd.start.assert_called_once()
+
+    def test_low_success_rate_ignored_while_integrating(self, i2pd, clock):
+        """Test tunnel success rate only counts after the grace period"""
+        supervisor = make_supervisor(i2pd, clock, integration_grace=600)
+
+        i2pd.get_status.return_value = {**UP, "tunnel_success_rate": 1}
+        assert supervisor.check().healthy
+
+        i2pd.get_status.return_value = {**UP, "uptime": 700, "tunnel_success_rate": 1}
+        assert supervisor.check().reason == "degraded"
+
+    def test_restarts_back_off(self, i2pd, clock):
+        """Test repeated restarts are spaced exponentially"""
+        i2pd.get_status.return_value = DOWN
+        i2pd.get_process_info.return_value = None
+        supervisor = make_supervisor(i2pd, clock, backoff_base=10, check_interval=1)
+
+        restarts = []
+        while clock.now < 100:
+            calls, started = i2pd.start.call_count, clock.now
+            clock.now += supervisor.step()
+            if i2pd.start.call_count > calls:
+                restarts.append(started)
+
+        assert restarts == [0, 10, 30, 70]
+
+    def test_crash_loop_reported(self, i2pd, clock):
+        """Test too many restarts in the window pause restarting"""
+        events = []
+        i2pd.get_status.return_value = DOWN
+        i2pd.get_process_info.return_value = None
+        supervisor = make_supervisor(
+            i2pd,
+            clock,
+            backoff_base=1,
+            backoff_max=300,
+            crash_loop_restarts=3,
+            check_interval=1,
+        )
+        supervisor.on_event = events.append
+
+        while clock.now < 60:
+            clock.now += supervisor.step()
+
+        assert i2pd.start.call_count == 3
+        assert any(event.startswith("Crash loop") for event in events)
+
+
+class TestRestartPolicy:
+    """Test backoff bookkeeping"""
+
+    def test_attempts_reset_once_stable(self):
+        """Test a long healthy stretch forgets earlier restarts"""
+        policy = RestartPolicy(backoff_base=10, stable_after=100)
+        policy.record_restart(0)
+        policy.record_restart(10)
+        assert policy.next_restart_at(10) == 30
+
+        policy.record_healthy(20)
+        policy.record_healthy(130)
+        assert policy.next_restart_at(130) == 130
+
+
+@patch("requests.Session")
+def test_missing_success_rate_not_degraded(mock_session, clock):
+    """Test a console without the success rate isn't judged by it"""
+    mock_session.return_value.get.return_value = Mock(
+        status_code=200,
+        text="<b>Uptime:</b> 2 hours, 3 minutes<br>\n<b>Routers:</b> 900<br>\n",
+    )
+    i2pd = I2PdManager(ConfigManager())
+
+    assert i2pd.get_status(7070)["tunnel_success_rate"] is None
+    supervisor = make_supervisor(i2pd, clock, integration_grace=600)
+    assert supervisor.check().healthy
+
+
+@patch("i2p_manager.i2pd.psutil.process_iter")
+@patch("requests.Session")
+def test_dead_router_down_while_instance_runs(
+    mock_session, mock_iter, clock, tmp_path, monkeypatch
+):
+    """Test another instance's i2pd doesn't pass for the main router"""
+    monkeypatch.setattr(ConfigManager, "get_config_dir", lambda self: tmp_path)
+    monkeypatch.setattr(fleet, "port_is_free", lambda port: True)
+    config = ConfigManager()
+    config.init()
+    fleet.add_instance(config, "a")
+
+    instance_dir = tmp_path / "instances" / "a"
+    proc = Mock(
+        info={
+            "name": "i2pd",
+            "cmdline": [
+                "i2pd",
+                f"--datadir={instance_dir}",
+                f"--conf={instance_dir / 'i2pd.conf'}",
+            ],
+        }
+    )
+    mock_iter.return_value = [proc]
+    mock_session.return_value.get.side_effect = ConnectionError("refused")
+
+    supervisor = Supervisor(I2PdManager(config), config, clock=clock)
+    assert supervisor.check().reason == "down"
+
+
+def test_recovers_hung_fake_router(fake_i2pd, monkeypatch):
+    """Test a hung router is restarted and recovers end to end"""
+    monkeypatch.setitem(supervisor_module.FAILURE_CHECKS, "unresponsive", 1)
+    config = ConfigManager()
+    monkeypatch.setattr(
+        config,
+        "get",
+        lambda key, default=None: (
+            fake_i2pd.console_port if key == "i2pd.console_port" else default
+        ),
+    )
+
+    i2pd = I2PdManager(config)
+    i2pd.stop = lambda: fake_i2pd.set_state("crashed")
+    i2pd.start = lambda: fake_i2pd.run_script([("starting", 0.2), ("integrated", None)])
+    supervisor = Supervisor(i2pd, config, check_process=False, start_timeout=5)
+
+    fake_i2pd.set_state("hung")
+    deadline = time.time() + 10
+    while not supervisor.history and time.time() < deadline:
+        supervisor.step()
+        time.sleep(0.05)
+
+    [incident] = supervisor.history
+    assert incident.reason == "unresponsive"
+    assert incident.restarts == 1
+    assert fake_i2pd.model.state == "integrated"
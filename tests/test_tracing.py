@@ -0,0 +1,94 @@
+"""Tests for timing spans"""
+
+import json
+import threading
+from collections import deque
+import pytest
+from i2p_manager import tracing
+
+
+@pytest.fixture(autouse=True)
+def clean_tracing():
+    """Start each test with tracing disabled and no spans"""
+    tracing.disable()
+    tracing.reset()
+    yield
+    tracing.disable()
+    tracing.reset()
+
+
+@tracing.traced("outer")
+def outer():
+    with tracing.span("inner"):
+        inner()
+
+
+@tracing.traced("leaf")
+def inner():
+    return 42
+
+
+def test_disabled_records_nothing():
+    """Test traced calls are plain calls while tracing is disabled"""
+    outer()
+    assert inner() == 42
+    assert tracing.roots() == []
+
+
+def test_spans_nest():
+    """Test spans form a tree per call"""
+    tracing.enable()
+    outer()
+
+    (root,) = tracing.roots()
+    assert [(depth, span.name) for depth, span in root.walk()] == [
+        (0, "outer"),
+        (1, "inner"),
+        (2, "leaf"),
+    ]
+    assert root.ms >= root.children[0].ms
+
+
+def test_errors_and_threads():
+    """Test failed spans are marked and other threads get their own roots"""
+    tracing.enable()
+
+    with pytest.raises(ValueError):
+        with tracing.span("boom"):
+            raise ValueError
+
+    worker = threading.Thread(target=outer, name="worker")
+    worker.start()
+    worker.join()
+
+    lines = tracing.format_tree(tracing.roots())
+    assert lines[0].endswith("boom (ValueError)")
+    assert lines[1].endswith("outer [worker]")
+
+
+def test_append_timings(tmp_path):
+    """Test invocations are appended as JSON lines"""
+    tracing.enable()
+    outer()
+    outer()
+
+    path = tmp_path / "timings.jsonl"
+    tracing.append_timings(path, "status", 12.5, tracing.roots())
+    tracing.append_timings(path, "start", 3.0, [])
+
+    first, second = [json.loads(line) for line in path.read_text().splitlines()]
+    assert first["command"] == "status"
+    assert first["spans"]["leaf"]["calls"] == 2
+    assert second["spans"] == {}
+
+
+def test_roots_capped(monkeypatch):
+    """Test long runs keep only the latest top-level spans"""
+    monkeypatch.setattr(tracing, "MAX_ROOTS", 3)
+    monkeypatch.setattr(tracing, "_roots", deque(maxlen=3))
+    tracing.enable()
+    for _ in range(5):
+        inner()
+
+    assert len(tracing.roots()) == 3
+    assert tracing.dropped() == 2